@@ -10,11 +10,29 @@ from flask_sqlalchemy import SQLAlchemy
 
 from config import config
 from database.models import db
+from database.engine import configure_engine, dispose_after_fork
+from database.migrations import check_schema
 from routes.animals_routes import animals_bp
 from routes.adoption_routes import adoption_bp
 from routes.address_routes import address_bp
 from routes.contact_routes import contact_bp, feedback_bp
 from routes.auth_routes import auth_bp
+from routes.jobs_routes import jobs_bp
+from routes.health_routes import health_bp
+from routes.image_routes import images_bp
+from routes.stats_routes import stats_bp
+from commands.animal_commands import animals_cli
+from commands.cep_commands import cep_cli
+from commands.db_commands import db_cli
+from commands.job_commands import jobs_cli
+from commands.serve_commands import serve_command
+from commands.stats_commands import stats_cli
+from services.jobs import init_jobs
+from services.write_behind import init_write_behind
+from utils.compression import init_compression
+from utils.json_provider import init_json_provider
+from utils.metrics import init_metrics
+from utils.rate_limit import init_rate_limiting
 
 def create_app(config_name: str = None) -> Flask:
     """
@@ -36,14 +54,21 @@ def create_app(config_name: str = None) -> Flask:
     
     # Carrega configuração
     app.config.from_object(config[config_name])
+    init_json_provider(app)
     
     # Inicializa extensões
     db.init_app(app)
     CORS(app, 
-         origins=["http://localhost:5173", "http://localhost:5174", "http://localhost:3000"],
+         origins=app.config["CORS_ORIGINS"],
          supports_credentials=True,
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
          allow_headers=["Content-Type", "Authorization"])
+    # Registrado antes da compressão: os after_request rodam em ordem inversa,
+    # então as métricas veem o tamanho já comprimido
+    init_metrics(app)
+    init_rate_limiting(app)
+    init_compression(app)
+    init_jobs(app)
     
     # Registra blueprints
     app.register_blueprint(animals_bp)
@@ -52,15 +77,28 @@ def create_app(config_name: str = None) -> Flask:
     app.register_blueprint(contact_bp)
     app.register_blueprint(feedback_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(images_bp)
+    app.register_blueprint(stats_bp)
+    app.register_blueprint(health_bp)
+    
+    # Comandos de linha de comando (flask <grupo> <comando>)
+    app.cli.add_command(animals_cli)
+    app.cli.add_command(cep_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(serve_command)
     
     # Contexto de aplicação para operações de banco de dados
     with app.app_context():
-        db.create_all()
-    
-    # Health check endpoint
-    @app.route("/health", methods=["GET"])
-    def health_check():
-        return jsonify({"status": "ok", "message": "Server is running"}), 200
+        configure_engine(db.engine, app.config)
+        dispose_after_fork(db.engine)
+        # Apenas confere a versão do schema; migrações rodam via `flask db upgrade`
+        # (ou automaticamente com AUTO_MIGRATE)
+        check_schema(app)
+    # Depois da verificação do schema: regrava journals da fila de contatos/feedback
+    init_write_behind(app)
     
     # Error handlers
     @app.errorhandler(404)
@@ -74,7 +112,7 @@ def create_app(config_name: str = None) -> Flask:
     return app
 
 if __name__ == "__main__":
-    # Executa servidor de desenvolvimento
+    # Executa servidor de desenvolvimento (em produção: `flask --app wsgi serve`)
     app = create_app()
     app.run(
         host="0.0.0.0",
@@ -0,0 +1,261 @@
+"""
+ASGI entry point
+Serve a consulta de CEP (GET /address/<cep>) sem bloquear threads, com httpx
+assíncrono, e o stream de eventos (GET /events, Server-Sent Events) com uma
+tarefa asyncio por conexão. As demais rotas vão ao app Flask (WSGI) via asgiref.
+As duas rotas atendidas aqui passam pelo mesmo limite de taxa, controle de
+admissão e métricas (com Server-Timing) que os hooks do app Flask aplicam.
+
+Uso:
+    pip install -r requirements-async.txt
+    uvicorn asgi:create_asgi_app --factory --host 0.0.0.0 --port 3001
+"""
+
+import asyncio
+import json
+import re
+import time
+from urllib.parse import parse_qs
+
+import httpx
+from asgiref.wsgi import WsgiToAsgi
+from jwt.exceptions import InvalidTokenError
+
+from app import create_app
+from services.address_service import AddressServiceError, search_address_by_cep_async
+from services.events import CATALOG_TOPIC, get_broker, ong_topic, user_topic
+from utils.jwt_utils import decode_token
+from utils.metrics import external_timings, observe_request, server_timing
+from utils.rate_limit import client_key_from, get_rate_limiter, rate_limit_headers, rejection_response
+from utils.response_builder import build_response
+
+ADDRESS_PATH = re.compile(r"^/address/([^/]+)/?$")
+EVENTS_PATH = re.compile(r"^/events/?$")
+
+
+class AsyncAddressApp:
+    """App ASGI que atende GET /address/<cep> e repassa o resto ao Flask."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.client: httpx.AsyncClient | None = None
+        self.allowed_origins = set(flask_app.config.get("CORS_ORIGINS", []))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] == "GET":
+            match = ADDRESS_PATH.match(scope["path"])
+            if match:
+                await self._serve(scope, send, "address", "/address/<cep>",
+                                  lambda send: self._get_address(scope, send, match.group(1)))
+                return
+            if EVENTS_PATH.match(scope["path"]):
+                await self._serve(scope, send, "events", "/events",
+                                  lambda send: self._stream_events(scope, receive, send))
+                return
+        await self.wsgi(scope, receive, send)
+
+    def _client_key(self, scope) -> str:
+        """Equivalente de utils.rate_limit.client_key para o scope ASGI."""
+        headers = dict(scope.get("headers", []))
+        remote_addr = scope["client"][0] if scope.get("client") else None
+        forwarded = headers.get(b"x-forwarded-for", b"").decode("latin-1")
+        if self.flask_app.config.get("RATE_LIMIT_TRUST_PROXY", False) and forwarded:
+            remote_addr = forwarded.split(",")[0].strip()
+        return client_key_from(headers.get(b"authorization", b"").decode("latin-1"), remote_addr)
+
+    async def _serve(self, scope, send, blueprint: str, endpoint: str, handler):
+        """Executa `handler(send)` com o limite de taxa e as métricas que o Flask aplicaria à rota."""
+        started = time.perf_counter()
+        timings = {}
+        context_token = external_timings.set(timings)
+        metrics_enabled = self.flask_app.config.get("METRICS_ENABLED", True)
+        response = {"status": 500, "size": 0}
+        limiter = get_rate_limiter(self.flask_app)
+        admission = None
+        if limiter is not None:
+            with self.flask_app.app_context():  # a chave do cliente decodifica o JWT
+                admission = limiter.admit(blueprint, "GET", lambda: self._client_key(scope))
+
+        async def instrumented_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                if admission is not None:
+                    headers += [(name.lower().encode(), value.encode())
+                                for name, value in rate_limit_headers(admission).items()]
+                if metrics_enabled:
+                    total = time.perf_counter() - started
+                    headers.append((b"server-timing", server_timing(total, timings).encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            if admission is not None and admission.status:
+                payload, status, headers = rejection_response(admission)
+                await self._send_json(scope, instrumented_send, status, payload,
+                                      [(name.lower().encode(), value.encode()) for name, value in headers.items()])
+            else:
+                await handler(instrumented_send)
+        finally:
+            if admission is not None:
+                limiter.release(admission)
+            external_timings.reset(context_token)
+            if metrics_enabled:
+                observe_request("GET", endpoint, response["status"], time.perf_counter() - started, response["size"])
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            pool_size = self.flask_app.config.get("VIACEP_POOL_SIZE", 10)
+            self.client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=pool_size * 10, max_keepalive_connections=pool_size),
+                headers={"Accept": "application/json"}
+            )
+        return self.client
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._get_client()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self.client is not None:
+                    await self.client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _get_address(self, scope, send, cep: str):
+        """Equivalente assíncrono de routes.address_routes.get_address."""
+        clean_cep = cep.replace("-", "").replace(" ", "").strip()
+        if len(clean_cep) != 8 or not clean_cep.isdigit():
+            await self._send_json(scope, send, 400, build_response(False, "CEP inválido. Use apenas 8 dígitos."))
+            return
+        try:
+            with self.flask_app.app_context():
+                address_data = await search_address_by_cep_async(clean_cep, self._get_client())
+        except AddressServiceError as e:
+            payload = build_response(False, "Erro ao buscar endereço", {"error": str(e)})
+            await self._send_json(scope, send, 500, payload)
+            return
+        if not address_data:
+            await self._send_json(scope, send, 404, build_response(False, "CEP não encontrado"))
+            return
+        await self._send_json(scope, send, 200, build_response(True, "Endereço encontrado com sucesso", address_data))
+
+    def _event_topics(self, scope) -> set[str]:
+        """Tópicos da conexão: o catálogo e, com token, os da ONG ou do adotante.
+
+        O EventSource do navegador não envia cabeçalhos, então o token também é
+        aceito no parâmetro `token`. `topics=catalog` ou `topics=mine` restringe o stream.
+
+        Raises:
+            InvalidTokenError: token inválido ou expirado
+        """
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        auth = dict(scope.get("headers", [])).get(b"authorization", b"").decode("latin-1")
+        token = auth[7:].strip() if auth.startswith("Bearer ") else query.get("token", [""])[0]
+        wanted = set(",".join(query.get("topics", ["catalog,mine"])).split(","))
+        topics = {CATALOG_TOPIC} if "catalog" in wanted else set()
+        if token and "mine" in wanted:
+            with self.flask_app.app_context():
+                claims = decode_token(token)
+            if claims.get("sub") is None:
+                raise InvalidTokenError("sub ausente")
+            if claims.get("role") == "ong":
+                topics.add(ong_topic(claims["sub"]))
+            else:
+                topics.add(user_topic(claims["sub"]))
+        return topics
+
+    async def _stream_events(self, scope, receive, send):
+        """GET /events - Stream SSE com heartbeats e retomada pelo Last-Event-ID."""
+        config = self.flask_app.config
+        try:
+            topics = self._event_topics(scope)
+        except InvalidTokenError:
+            await self._send_json(scope, send, 401, build_response(False, "Token inválido"))
+            return
+        if not topics:
+            await self._send_json(scope, send, 400, build_response(False, "Nenhum tópico selecionado"))
+            return
+        with self.flask_app.app_context():
+            broker = get_broker()
+        if broker.subscriber_count >= config.get("SSE_MAX_SUBSCRIBERS", 10000):
+            payload = build_response(False, "Servidor ocupado, tente novamente em instantes")
+            await self._send_json(scope, send, 503, payload, [(b"retry-after", b"5")])
+            return
+
+        last_event_id = dict(scope.get("headers", [])).get(b"last-event-id", b"").decode("latin-1")
+        subscriber, replay = broker.subscribe(
+            topics, last_event_id.strip() or None, asyncio.get_running_loop(), config.get("SSE_BUFFER_SIZE", 100)
+        )
+        watcher = asyncio.ensure_future(self._wait_disconnect(receive, subscriber))
+        try:
+            headers = [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),  # nginx: não acumular o stream
+            ] + self._cors_headers(scope)
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            first = f"retry: {config.get('SSE_RETRY_MS', 3000)}\n\n".encode()
+            if replay is None:
+                first += b"event: reset\ndata: {}\n\n"
+            else:
+                first += b"".join(evt.encode() for evt in replay)
+            await send({"type": "http.response.body", "body": first, "more_body": True})
+
+            heartbeat = config.get("SSE_HEARTBEAT_SECONDS", 15)
+            while not subscriber.closed:
+                batch = await subscriber.next_batch(heartbeat)
+                if subscriber.closed:
+                    break
+                # Comentário SSE como heartbeat: mantém proxies e o navegador com a conexão aberta
+                body = b"".join(evt.encode() for evt in batch) or b": ping\n\n"
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+                if subscriber.overflowed:
+                    break  # cliente lento: reconecta com Last-Event-ID e recebe o restante do histórico
+            if not subscriber.closed:
+                await send({"type": "http.response.body", "body": b""})
+        except OSError:
+            pass  # cliente desconectou durante o envio
+        finally:
+            broker.unsubscribe(subscriber)
+            watcher.cancel()
+
+    @staticmethod
+    async def _wait_disconnect(receive, subscriber):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                subscriber.close()
+                return
+
+    def _cors_headers(self, scope) -> list:
+        origin = dict(scope.get("headers", [])).get(b"origin", b"").decode("latin-1")
+        if origin not in self.allowed_origins:
+            return []
+        return [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    async def _send_json(self, scope, send, status: int, payload: dict, extra_headers: list | None = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ] + self._cors_headers(scope) + (extra_headers or [])
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_asgi_app(config_name: str = None) -> AsyncAddressApp:
+    """Factory usada pelo uvicorn (`--factory`)."""
+    return AsyncAddressApp(create_app(config_name))
@@ -0,0 +1,100 @@
+"""
+Benchmark: GET /address/<cep> no modo síncrono (WSGI) x assíncrono (ASGI)
+
+Sobe um ViaCEP falso com latência fixa e dispara requisições concorrentes com
+CEPs distintos (todas caem no caminho remoto, sem cache). O modo síncrono usa
+um servidor WSGI com um pool fixo de threads, como um worker gthread; o modo
+assíncrono usa o uvicorn com asgi.create_asgi_app.
+
+Uso (a partir de Back-end/):
+    python -m benchmarks.bench_address_async --requests 2000 --concurrency 200 --delay 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import httpx
+import uvicorn
+
+from app import create_app
+from asgi import AsyncAddressApp
+from benchmarks.common import (
+    PooledWSGIServer, StubViaCep, free_port, make_benchmark_config, print_table, start_server, summarize
+)
+
+
+def run_sync_server(config_name, port, threads):
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    PooledWSGIServer("127.0.0.1", port, create_app(config_name), threads).serve_forever()
+
+
+def run_async_server(config_name, port):
+    uvicorn.run(AsyncAddressApp(create_app(config_name)), host="127.0.0.1", port=port,
+                log_level="warning", backlog=2048)
+
+
+async def drive(base_url: str, total: int, concurrency: int, first_cep: int) -> dict:
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(f"{first_cep + i:08d}")
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                cep = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    response = await client.get(f"/address/{cep}")
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return summarize(latencies, elapsed, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.1, help="latência do ViaCEP falso (s)")
+    parser.add_argument("--sync-threads", type=int, default=8, help="threads do servidor WSGI")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results = {}
+    with StubViaCep(delay=args.delay) as stub:
+        config_name = make_benchmark_config(VIACEP_BASE_URL=stub.base_url, VIACEP_POOL_SIZE=args.concurrency)
+        create_app(config_name)  # cria o schema antes de subir os servidores
+        modes = [
+            ("sync", run_sync_server, (config_name, free_port(), args.sync_threads)),
+            ("async", run_async_server, (config_name, free_port())),
+        ]
+        for index, (mode, target, target_args) in enumerate(modes):
+            process = start_server(target, *target_args)
+            # Faixas de CEP distintas para que nenhum modo aproveite o cache do outro
+            first_cep = 10_000_000 + index * args.requests
+            base_url = f"http://127.0.0.1:{target_args[1]}"
+            results[mode] = asyncio.run(drive(base_url, args.requests, args.concurrency, first_cep))
+            process.terminate()
+            process.join()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"ViaCEP falso com {args.delay * 1000:.0f} ms, {args.concurrency} clientes concorrentes")
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
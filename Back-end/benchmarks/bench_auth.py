@@ -0,0 +1,122 @@
+"""
+Microbenchmark: custo da autenticação por requisição
+
+Compara, no mesmo app e em processo (test client), uma rota sem autenticação
+com rotas equivalentes protegidas por:
+- legacy: decorator antigo (decodifica o JWT e busca o User no banco a cada requisição)
+- claims: token_required atual (autoriza pela role do token, sem banco)
+- claims+user: token_required + get_current_user() com o cache de usuários
+
+O overhead é a diferença de latência média em relação à rota sem autenticação.
+
+Uso (a partir de Back-end/):
+    python -m benchmarks.bench_auth --requests 5000
+"""
+
+import argparse
+import json
+import time
+from functools import wraps
+
+from flask import g, request
+
+from app import create_app
+from benchmarks.common import make_benchmark_config, summarize
+from database.models import db, User
+from utils.jwt_utils import decode_token, generate_token, get_current_user, token_required
+from utils.response_builder import build_response
+
+
+def legacy_token_required(role=None):
+    """Cópia do token_required anterior ao fast path, para comparação."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            token = request.headers.get("Authorization", "").split(" ", 1)[1].strip()
+            payload = decode_token(token)
+            user = db.session.get(User, payload.get("sub"))
+            if not user:
+                return build_response(False, "Usuário não encontrado"), 401
+            if role and user.role != role:
+                return build_response(False, "Permissão insuficiente"), 403
+            g.current_user = user
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def build_app():
+    app = create_app(make_benchmark_config())
+
+    @app.route("/_bench/public")
+    def bench_public():
+        return build_response(True, "ok"), 200
+
+    @app.route("/_bench/legacy")
+    @legacy_token_required(role="ong")
+    def bench_legacy():
+        return build_response(True, "ok"), 200
+
+    @app.route("/_bench/claims")
+    @token_required(role="ong")
+    def bench_claims():
+        return build_response(True, "ok"), 200
+
+    @app.route("/_bench/claims-user")
+    @token_required(role="ong")
+    def bench_claims_user():
+        return build_response(True, "ok", {"name": get_current_user().name}), 200
+
+    with app.app_context():
+        user = User(name="Bench ONG", email="bench-ong@example.com", role="ong")
+        user.password_hash = "-"
+        db.session.add(user)
+        db.session.commit()
+        token = generate_token(user)
+    return app, token
+
+
+def measure(client, path, headers, total) -> dict:
+    for _ in range(50):  # aquecimento
+        client.get(path, headers=headers)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(total):
+        t0 = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - t0)
+        assert response.status_code == 200, response.get_json()
+    result = summarize(latencies, time.perf_counter() - started)
+    result["mean_us"] = round(sum(latencies) / len(latencies) * 1e6, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    app, token = build_app()
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {
+        "public": measure(client, "/_bench/public", {}, args.requests),
+        "legacy": measure(client, "/_bench/legacy", headers, args.requests),
+        "claims": measure(client, "/_bench/claims", headers, args.requests),
+        "claims+user": measure(client, "/_bench/claims-user", headers, args.requests),
+    }
+    baseline = results["public"]["mean_us"]
+    for result in results.values():
+        result["overhead_us"] = round(result["mean_us"] - baseline, 1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'':<14}{'mean_us':>10}{'overhead_us':>13}{'p99_ms':>10}")
+    for name, result in results.items():
+        print(f"{name:<14}{result['mean_us']:>10}{result['overhead_us']:>13}{result['p99_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: vazão de escrita concorrente no SQLite, antes x depois dos PRAGMAs
+
+Vários processos (como workers do gunicorn) enviam POST /contact, /feedback e
+/adoptions ao mesmo banco. A configuração "before" reproduz o padrão antigo
+(journal DELETE, synchronous FULL, sem busy_timeout); "after" usa WAL,
+synchronous NORMAL e busy_timeout. Cada configuração roda em um banco novo.
+
+Uso (a partir de Back-end/):
+    python -m benchmarks.bench_db_writes --workers 4 --writes 300
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+from app import create_app
+from benchmarks.common import make_benchmark_config, print_table, summarize
+from database.models import db, Animal
+
+PROFILES = {
+    "before": {"SQLITE_JOURNAL_MODE": "DELETE", "SQLITE_SYNCHRONOUS": "FULL", "SQLITE_BUSY_TIMEOUT_MS": 0},
+    "after": {"SQLITE_JOURNAL_MODE": "WAL", "SQLITE_SYNCHRONOUS": "NORMAL", "SQLITE_BUSY_TIMEOUT_MS": 5000},
+}
+
+ADOPTION = {
+    "animal_id": 1, "adopter_name": "Bench", "adopter_email": "bench@example.com",
+    "address_cep": "01310100", "address_street": "Av. Paulista", "address_number": "1000",
+    "address_city": "São Paulo", "address_state": "SP"
+}
+
+
+def write_worker(config_name, writes, start_event, results):
+    app = create_app(config_name)
+    client = app.test_client()
+    latencies, errors = [], 0
+    start_event.wait()
+    for i in range(writes):
+        kind = i % 3
+        started = time.perf_counter()
+        if kind == 0:
+            response = client.post("/contact", json={"name": "Bench", "email": "b@example.com", "message": "Olá"})
+        elif kind == 1:
+            response = client.post("/feedback", json={"mensagem": "Ótimo site"})
+        else:
+            response = client.post("/adoptions", json=ADOPTION)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            errors += 1
+    results.put((latencies, errors))
+
+
+def run_profile(name: str, workers: int, writes: int) -> dict:
+    config_name = make_benchmark_config(**PROFILES[name])
+    app = create_app(config_name)
+    with app.app_context():
+        db.session.add(Animal(name="Bench", species="Cachorro", age="2 anos", size="Médio",
+                              temperament="Dócil", city="São Paulo", description="-", history="-"))
+        db.session.commit()
+        db.engine.dispose()
+
+    start_event, results = multiprocessing.Event(), multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=write_worker, args=(config_name, writes, start_event, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    time.sleep(1)  # deixa todos os workers inicializarem antes de medir
+    started = time.perf_counter()
+    start_event.set()
+    latencies, errors = [], 0
+    for _ in processes:
+        worker_latencies, worker_errors = results.get()
+        latencies += worker_latencies
+        errors += worker_errors
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    return summarize(latencies, elapsed, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="processos escrevendo em paralelo")
+    parser.add_argument("--writes", type=int, default=300, help="escritas por processo")
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    results = {name: run_profile(name, args.workers, args.writes) for name in PROFILES}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.workers} processos x {args.writes} escritas (errors = respostas 4xx/5xx)")
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: serialização de 10 mil animais
+
+Compara o caminho antigo (objetos do ORM + to_dict() + json da biblioteca padrão)
+com a projeção de colunas do Core (utils.serializers) e o provedor orjson.
+Cada caminho mede consulta + montagem dos dicts + codificação em JSON.
+
+Uso (a partir de Back-end/):
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from app import create_app
+from benchmarks.common import make_benchmark_config, percentile
+from database.models import db, Animal
+from utils.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+from utils.serializers import projection
+
+
+def seed(rows: int) -> None:
+    now = datetime.utcnow()
+    db.session.execute(insert(Animal), [
+        {
+            "name": f"Animal {i}", "species": "Cachorro" if i % 2 else "Gato", "age": "2 anos",
+            "size": "Médio", "temperament": "Dócil", "city": "São Paulo", "status": "Disponível",
+            "image": f"https://example.com/{i}.jpg", "description": "Descrição " * 20,
+            "history": "História " * 20, "created_at": now - timedelta(seconds=i), "updated_at": now
+        }
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def orm_to_dict() -> list:
+    return [animal.to_dict() for animal in Animal.query.all()]
+
+
+def core_projection() -> list:
+    animal_projection = projection(Animal)
+    return animal_projection.serialize_all(db.session.execute(select(*animal_projection.columns)))
+
+
+def measure(build, provider, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat + 1):
+        db.session.expunge_all()
+        t0 = time.perf_counter()
+        items = build()
+        t1 = time.perf_counter()
+        body = provider.dumps({"items": items})
+        t2 = time.perf_counter()
+        timings.append((t1 - t0, t2 - t1, len(body)))
+    timings = timings[1:]  # descarta o aquecimento
+    return {
+        "build_ms": round(percentile([t[0] for t in timings], 50) * 1000, 1),
+        "encode_ms": round(percentile([t[1] for t in timings], 50) * 1000, 1),
+        "total_ms": round(percentile([t[0] + t[1] for t in timings], 50) * 1000, 1),
+        "bytes": timings[0][2],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    app = create_app(make_benchmark_config())
+    providers = {"stdlib": StdlibJSONProvider(app)}
+    if orjson is not None:
+        providers["orjson"] = OrjsonProvider(app)
+    results = {}
+    with app.app_context():
+        seed(args.rows)
+        for provider_name, provider in providers.items():
+            results[f"orm+{provider_name}"] = measure(orm_to_dict, provider, args.repeat)
+            results[f"core+{provider_name}"] = measure(core_projection, provider, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    columns = ["build_ms", "encode_ms", "total_ms", "bytes"]
+    print(f"{'':<16}" + "".join(f"{c:>12}" for c in columns))
+    for name, result in results.items():
+        print(f"{name:<16}" + "".join(f"{result[c]:>12}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
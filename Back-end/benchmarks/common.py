@@ -0,0 +1,159 @@
+"""
+Utilitários compartilhados pelos benchmarks
+Execute os scripts a partir de Back-end/, ex.: python -m benchmarks.bench_address_async
+"""
+
+import json
+import math
+import os
+import socket
+import multiprocessing
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn
+
+from werkzeug.serving import BaseWSGIServer
+
+from config import TestingConfig, config, engine_options
+
+
+def percentile(values: list, pct: float) -> float:
+    """Percentil por interpolação linear (valores em qualquer unidade)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(latencies: list, elapsed: float, errors: int = 0) -> dict:
+    """Resumo de uma rodada: vazão e latências em milissegundos."""
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_table(rows: dict) -> None:
+    """Imprime {nome: resumo} como tabela alinhada."""
+    columns = ["requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'':<18}" + "".join(f"{c:>12}" for c in columns))
+    for name, summary in rows.items():
+        print(f"{name:<18}" + "".join(f"{summary.get(c, ''):>12}" for c in columns))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_benchmark_config(database_uri: str = None, **overrides) -> str:
+    """Registra uma configuração 'benchmark' com banco SQLite em arquivo temporário.
+
+    Returns:
+        nome da configuração para create_app
+    """
+    if database_uri is None:
+        fd, path = tempfile.mkstemp(prefix="protegepet-bench-", suffix=".db")
+        os.close(fd)
+        database_uri = f"sqlite:///{path}"
+    attrs = {
+        "TESTING": False,
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "SQLALCHEMY_ENGINE_OPTIONS": engine_options(database_uri),
+        **overrides
+    }
+    config["benchmark"] = type("BenchmarkConfig", (TestingConfig,), attrs)
+    return "benchmark"
+
+
+class PooledWSGIServer(ThreadingMixIn, BaseWSGIServer):
+    """Servidor WSGI com número fixo de threads (como gunicorn --threads N)."""
+
+    daemon_threads = True
+
+    def __init__(self, host, port, app, threads):
+        super().__init__(host, port, app)
+        self.socket.listen(1024)
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+
+def start_server(target, *args) -> multiprocessing.Process:
+    """Sobe o servidor medido em outro processo e espera a porta abrir.
+
+    `args[1]` deve ser a porta.
+    """
+    port = args[1]
+    process = multiprocessing.Process(target=target, args=args, daemon=True)
+    process.start()
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("servidor não iniciou")
+
+
+class StubViaCep:
+    """Servidor HTTP local que imita o ViaCEP com latência configurável.
+
+    Roda em um processo próprio. CEPs iniciados por 9 respondem {"erro": true}.
+    """
+
+    def __init__(self, delay: float = 0.05):
+        delay_s = delay
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                time.sleep(delay_s)
+                parts = self.path.strip("/").split("/")
+                cep = parts[1] if len(parts) > 1 else ""
+                if cep.startswith("9"):
+                    data = {"erro": True}
+                else:
+                    data = {"cep": f"{cep[:5]}-{cep[5:]}", "logradouro": "Rua Teste", "bairro": "Centro",
+                            "localidade": "São Paulo", "uf": "SP", "regiao": "Sudeste"}
+                body = json.dumps(data).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 1024
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/ws"
+
+    def __enter__(self):
+        # Processo separado para não disputar o GIL com o servidor medido
+        self.process = multiprocessing.Process(target=self.server.serve_forever, daemon=True)
+        self.process.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+        self.server.server_close()
@@ -0,0 +1,318 @@
+"""
+Benchmark da API com cenários realistas
+
+Popula um banco SQLite temporário com o volume pedido de animais, adoções e ONGs
+e dispara uma mistura de operações (navegação no catálogo, detalhes, pedidos de
+adoção, logins de ONG, mudanças de status) com vários clientes concorrentes.
+Roda o app em processo (test_client) e/ou atrás de um servidor WSGI real
+(em outro processo). Reporta vazão, p50/p95/p99 e consultas SQL por operação
+(lidas do cabeçalho Server-Timing) e salva o resultado em JSON para comparar
+commits.
+
+Uso (a partir de Back-end/):
+    python -m benchmarks.harness --scenario mixed --mode both --requests 2000 --output antes.json
+    python -m benchmarks.harness --scenario mixed --mode both --requests 2000 --compare antes.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import re
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import insert, select
+
+from app import create_app
+from benchmarks.common import PooledWSGIServer, free_port, make_benchmark_config, percentile, start_server
+from database.models import db, Adoption, Animal, User
+from utils.jwt_utils import generate_token
+from utils.password_hashing import hash_password
+
+BENCH_PASSWORD = "bench-senha"
+SPECIES = ("Cachorro", "Gato")
+SIZES = ("Pequeno", "Médio", "Grande")
+CITIES = ("São Paulo", "Rio de Janeiro", "Belo Horizonte", "Curitiba", "Recife")
+
+# Cenário -> [(peso, operação)]
+SCENARIOS = {
+    "browse": [(55, "catalog"), (15, "catalog_filtered"), (10, "catalog_search"), (20, "detail")],
+    "adoption": [(35, "catalog"), (20, "detail"), (25, "adopt"), (10, "status"), (10, "login")],
+    "mixed": [(35, "catalog"), (10, "catalog_filtered"), (5, "catalog_search"), (25, "detail"),
+              (12, "adopt"), (8, "status"), (5, "login")],
+}
+
+_QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+# --- Dados --------------------------------------------------------------------
+
+def seed(animals: int, adoptions: int, ongs: int, rng: random.Random) -> dict:
+    """Popula o banco (requer app context) e devolve os ids usados pelas operações."""
+    now = datetime.utcnow()
+    db.session.execute(insert(Animal), [
+        {
+            "name": f"Animal {i}", "species": rng.choice(SPECIES), "age": f"{rng.randint(1, 15)} anos",
+            "size": rng.choice(SIZES), "temperament": "Dócil e brincalhão", "city": rng.choice(CITIES),
+            "status": "Disponível" if rng.random() < 0.8 else "Adotado",
+            "image": f"https://example.com/animais/{i}.jpg",
+            "description": f"Animal {i} muito carinhoso, vacinado e castrado. " * 4,
+            "history": "Resgatado das ruas e recuperado pela equipe da ONG. " * 4,
+            "created_at": now - timedelta(minutes=i), "updated_at": now,
+        }
+        for i in range(animals)
+    ])
+    animal_ids = list(db.session.scalars(select(Animal.id)))
+    db.session.execute(insert(Adoption), [
+        {
+            "animal_id": rng.choice(animal_ids), "adopter_name": f"Adotante {i}",
+            "adopter_email": f"adotante{i}@example.com", "adopter_phone": "11999999999",
+            "address_cep": "01310100", "address_street": "Avenida Paulista", "address_number": str(i),
+            "address_city": "São Paulo", "address_state": "SP", "status": "Pending",
+            "created_at": now - timedelta(minutes=i), "updated_at": now,
+        }
+        for i in range(adoptions)
+    ])
+    password_hash = hash_password(BENCH_PASSWORD)  # um hash só: o custo é o mesmo por usuário
+    db.session.execute(insert(User), [
+        {"name": f"ONG {i}", "email": f"ong{i}@bench.local", "password_hash": password_hash,
+         "role": "ong", "created_at": now}
+        for i in range(ongs)
+    ])
+    db.session.commit()
+    ong = db.session.scalars(select(User).where(User.role == "ong").limit(1)).first()
+    return {
+        "animal_ids": animal_ids,
+        "adoption_ids": list(db.session.scalars(select(Adoption.id))),
+        "ongs": ongs,
+        "token": generate_token(ong),
+    }
+
+
+# --- Operações ----------------------------------------------------------------
+
+def build_request(operation: str, data: dict, rng: random.Random) -> tuple:
+    """(método, caminho, corpo JSON, precisa de token) de uma operação."""
+    if operation == "catalog":
+        return "GET", f"/animals?page={rng.randint(1, 5)}&per_page=12", None, False
+    if operation == "catalog_filtered":
+        species, city = rng.choice(SPECIES), rng.choice(CITIES)
+        return "GET", f"/animals?species={species}&city={city}&status=Disponível&per_page=12", None, False
+    if operation == "catalog_search":
+        return "GET", "/animals?q=carinhoso&per_page=12&cursor=", None, False
+    if operation == "detail":
+        return "GET", f"/animals/{rng.choice(data['animal_ids'])}", None, False
+    if operation == "adopt":
+        body = {
+            "animal_id": rng.choice(data["animal_ids"]), "adopter_name": "Bench",
+            "adopter_email": "bench@example.com", "address_cep": "01310100",
+            "address_street": "Avenida Paulista", "address_number": "1000",
+            "address_city": "São Paulo", "address_state": "SP",
+        }
+        return "POST", "/adoptions", body, False
+    if operation == "status":
+        status = rng.choice(("Approved", "Rejected", "Pending"))
+        return "PUT", f"/adoptions/{rng.choice(data['adoption_ids'])}/status", {"status": status}, True
+    if operation == "login":
+        email = f"ong{rng.randrange(data['ongs'])}@bench.local"
+        return "POST", "/auth/login", {"email": email, "password": BENCH_PASSWORD, "role": "ong"}, False
+    raise ValueError(f"Operação desconhecida: {operation}")
+
+
+class InProcessClient:
+    """Cliente sobre app.test_client() (um por thread)."""
+
+    def __init__(self, app):
+        self._app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body, headers) -> tuple:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.headers.get("Server-Timing", "")
+
+
+class HttpClient:
+    """Cliente HTTP com uma sessão keep-alive por thread."""
+
+    def __init__(self, base_url: str):
+        self._base_url = base_url
+        self._local = threading.local()
+
+    def request(self, method, path, body, headers) -> tuple:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        response = session.request(method, self._base_url + path, json=body, headers=headers, timeout=60)
+        return response.status_code, response.headers.get("Server-Timing", "")
+
+
+def run_load(client, data: dict, mix: list, total: int, concurrency: int, seed_value: int) -> dict:
+    """Executa `total` operações sorteadas de `mix` com `concurrency` clientes."""
+    weights, operations = zip(*mix)
+    rng = random.Random(seed_value)
+    plan = [(op, build_request(op, data, rng)) for op in rng.choices(operations, weights=weights, k=total)]
+    auth = {"Authorization": f"Bearer {data['token']}"}
+    samples = defaultdict(list)  # operação -> [(latência, status, consultas)]
+    lock = threading.Lock()
+    cursor = iter(plan)
+
+    def worker():
+        while True:
+            with lock:
+                item = next(cursor, None)
+            if item is None:
+                return
+            operation, (method, path, body, needs_token) = item
+            started = time.perf_counter()
+            try:
+                status, timing = client.request(method, path, body, auth if needs_token else None)
+            except requests.RequestException:
+                status, timing = 0, ""
+            elapsed = time.perf_counter() - started
+            match = _QUERIES_RE.search(timing)
+            with lock:
+                samples[operation].append((elapsed, status, int(match.group(1)) if match else None))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - started
+
+    results = {operation: _summarize(rows, elapsed) for operation, rows in sorted(samples.items())}
+    results["total"] = _summarize([row for rows in samples.values() for row in rows], elapsed)
+    return results
+
+
+def _summarize(rows: list, elapsed: float) -> dict:
+    latencies = [row[0] for row in rows]
+    queries = [row[2] for row in rows if row[2] is not None]
+    return {
+        "requests": len(rows),
+        "errors": sum(1 for row in rows if not 200 <= row[1] < 400),
+        "rps": round(len(rows) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_avg": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+# --- Execução -----------------------------------------------------------------
+
+def run_wsgi_server(config_name, port, threads):
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    PooledWSGIServer("127.0.0.1", port, create_app(config_name), threads).serve_forever()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict) -> None:
+    columns = ["requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "queries_avg"]
+    for mode, operations in results.items():
+        print(f"\n[{mode}]")
+        print(f"{'':<18}" + "".join(f"{c:>12}" for c in columns))
+        for operation, summary in operations.items():
+            print(f"{operation:<18}" + "".join(f"{str(summary.get(c, '')):>12}" for c in columns))
+
+
+def print_comparison(results: dict, baseline: dict, threshold: float) -> bool:
+    """Compara p95 e consultas com um resultado salvo. Retorna True se houver regressão."""
+    regressed = False
+    print(f"\nComparação com {baseline['meta'].get('commit') or 'baseline'} (p95 e consultas):")
+    for mode, operations in results.items():
+        for operation, summary in operations.items():
+            old = baseline["results"].get(mode, {}).get(operation)
+            if not old or not old.get("p95_ms"):
+                continue
+            change = (summary["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100
+            flag = ""
+            if change > threshold:
+                flag, regressed = "  <- regressão", True
+            queries = ""
+            if old.get("queries_avg") is not None and summary.get("queries_avg") is not None:
+                queries = f"  consultas {old['queries_avg']} -> {summary['queries_avg']}"
+            print(f"  {mode:<10}{operation:<18} p95 {old['p95_ms']:>8} -> {summary['p95_ms']:>8} ms "
+                  f"({change:+.1f}%){queries}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--mode", choices=["inprocess", "wsgi", "both"], default="both")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--server-threads", type=int, default=8, help="threads do servidor WSGI")
+    parser.add_argument("--animals", type=int, default=5000)
+    parser.add_argument("--adoptions", type=int, default=2000)
+    parser.add_argument("--ongs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42, help="semente dos dados e da sequência de operações")
+    parser.add_argument("--output", help="salva o resultado em JSON neste arquivo")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=10.0, help="piora de p95 (%%) considerada regressão")
+    args = parser.parse_args()
+
+    # Configuração próxima da de produção (caches ligados, tarefas em segundo plano)
+    config_name = make_benchmark_config(
+        LIST_COUNT_CACHE_TTL=30, HTTP_RESPONSE_CACHE_TTL=300, JOB_WORKERS=1, SLOW_QUERY_MS=0
+    )
+    app = create_app(config_name)
+    with app.app_context():
+        data = seed(args.animals, args.adoptions, args.ongs, random.Random(args.seed))
+
+    mix = SCENARIOS[args.scenario]
+    modes = ["inprocess", "wsgi"] if args.mode == "both" else [args.mode]
+    results = {}
+    for mode in modes:
+        if mode == "inprocess":
+            results[mode] = run_load(InProcessClient(app), data, mix, args.requests, args.concurrency, args.seed)
+            continue
+        port = free_port()
+        process = start_server(run_wsgi_server, config_name, port, args.server_threads)
+        try:
+            client = HttpClient(f"http://127.0.0.1:{port}")
+            results[mode] = run_load(client, data, mix, args.requests, args.concurrency, args.seed)
+        finally:
+            process.terminate()
+            process.join()
+
+    print_results(results)
+    output = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"\nResultado salvo em {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if print_comparison(results, json.load(f), args.threshold):
+                raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import click
+from flask.cli import AppGroup
+
+from services.animal_import import (
+    AnimalImportError, DEFAULT_BATCH_SIZE, import_animals, read_animal_file
+)
+from services.cep_dataset import CepDatasetError, detect_format
+from services.change_feed import compact_changes
+from services.geocoding import geocode_animals
+
+animals_cli = AppGroup("animals", help="Gerencia o catálogo de animais.")
+
+@animals_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "json", "ndjson"]),
+              help="Formato do arquivo (padrão: pela extensão).")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Registros por transação.")
+def import_animals_command(path, file_format, batch_size):
+    """Importa ou atualiza animais a partir de CSV, JSON ou NDJSON (registros com id atualizam)."""
+    try:
+        file_format = file_format or detect_format(path)
+        report = import_animals(read_animal_file(path, file_format), batch_size=batch_size)
+    except (AnimalImportError, CepDatasetError, ValueError) as e:
+        raise click.ClickException(str(e))
+    for error in report["errors"]:
+        click.echo(f"linha {error['row']}: {'; '.join(error['errors'])}", err=True)
+    click.echo(
+        f"{report['created']} animais criados, {report['updated']} atualizados, "
+        f"{report['failed']} registros com erro."
+    )
+
+@animals_cli.command("compact-changes")
+@click.option("--older-than", default=30, show_default=True, help="Remove alterações com mais de N dias.")
+def compact_changes_command(older_than):
+    """Remove alterações antigas do feed (clientes com cursor anterior recarregam a lista)."""
+    removed = compact_changes(older_than)
+    click.echo(f"{removed} alterações removidas.")
+
+@animals_cli.command("geocode")
+def geocode_animals_command():
+    """Recalcula as coordenadas dos animais a partir do arquivo de municípios (GAZETTEER_PATH)."""
+    updated, missing = geocode_animals()
+    click.echo(f"{updated} animais atualizados; {missing} com cidade não encontrada no arquivo de municípios.")
@@ -0,0 +1,28 @@
+import click
+from flask.cli import AppGroup
+
+from database.models import db, CepAddress
+from services.cep_dataset import (
+    CepDatasetError, DEFAULT_BATCH_SIZE, detect_format, import_records, read_records
+)
+
+cep_cli = AppGroup("cep", help="Gerencia a base local de CEPs.")
+
+@cep_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "file_format", type=click.Choice(["csv", "json", "ndjson"]),
+              help="Formato do arquivo (padrão: pela extensão).")
+@click.option("--batch-size", default=DEFAULT_BATCH_SIZE, show_default=True,
+              help="Registros por transação.")
+@click.option("--replace", is_flag=True, help="Apaga a base local antes de importar.")
+def import_ceps(path, file_format, batch_size, replace):
+    """Importa um dataset de CEPs (CSV, JSON ou NDJSON) para a base local."""
+    try:
+        file_format = file_format or detect_format(path)
+        if replace:
+            with db.engine.begin() as conn:
+                conn.execute(CepAddress.__table__.delete())
+        result = import_records(read_records(path, file_format), batch_size=batch_size)
+    except (CepDatasetError, ValueError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{result['imported']} CEPs importados, {result['skipped']} registros ignorados.")
@@ -0,0 +1,33 @@
+import click
+from flask.cli import AppGroup
+
+from database.models import db
+from database.migrations import MIGRATIONS, current_version, latest_version, upgrade
+
+db_cli = AppGroup("db", help="Gerencia as migrações do schema.")
+
+@db_cli.command("upgrade")
+@click.option("--to", "target", type=int, help="Versão alvo (padrão: a última).")
+def upgrade_schema(target):
+    """Aplica as migrações pendentes."""
+    applied = upgrade(db.engine, target)
+    if applied:
+        click.echo(f"Migrações aplicadas: {', '.join(map(str, applied))}")
+    else:
+        click.echo("Schema já está atualizado.")
+
+@db_cli.command("current")
+def show_current():
+    """Mostra a versão do schema aplicada no banco."""
+    with db.engine.connect() as conn:
+        version = current_version(conn)
+    click.echo(f"Versão atual: {version} (última disponível: {latest_version()})")
+
+@db_cli.command("history")
+def show_history():
+    """Lista as migrações conhecidas."""
+    with db.engine.connect() as conn:
+        version = current_version(conn)
+    for item in MIGRATIONS:
+        mark = "x" if item.version <= version else " "
+        click.echo(f"[{mark}] {item.version:>3}  {item.description}")
@@ -0,0 +1,25 @@
+import time
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from services.jobs import WorkerPool, run_pending
+
+jobs_cli = AppGroup("jobs", help="Gerencia a fila de tarefas em segundo plano.")
+
+@jobs_cli.command("work")
+@click.option("--workers", default=2, show_default=True, help="Threads executando tarefas.")
+@click.option("--once", is_flag=True, help="Executa as tarefas prontas e sai.")
+def work(workers, once):
+    """Executa tarefas em um processo dedicado (além dos workers das requisições)."""
+    if once:
+        click.echo(f"{run_pending('cli')} tarefas executadas.")
+        return
+    pool = WorkerPool(current_app._get_current_object(), workers, current_app.config.get("JOB_POLL_INTERVAL", 1.0))
+    click.echo(f"{workers} workers aguardando tarefas (Ctrl+C para sair).")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
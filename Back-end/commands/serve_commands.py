@@ -0,0 +1,57 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from utils.wsgi_server import PreforkServer, warm_up
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # dependência opcional (requirements-server.txt)
+    BaseApplication = None
+
+
+def _run_gunicorn(app, options: dict) -> None:
+    """Roda o gunicorn com o app já carregado neste processo (equivale a --preload)."""
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    PreloadedApplication().run()
+
+
+@click.command("serve")
+@click.option("--host", default=None, help="Endereço (padrão: SERVER_HOST).")
+@click.option("--port", type=int, default=None, help="Porta (padrão: PORT ou 3001).")
+@click.option("--workers", type=int, default=None, help="Processos (padrão: WEB_CONCURRENCY ou nº de núcleos).")
+@click.option("--threads", type=int, default=None, help="Threads por processo (padrão: SERVER_THREADS).")
+@click.option("--server", type=click.Choice(["auto", "gunicorn", "builtin"]), default="auto", show_default=True,
+              help="gunicorn se instalado; senão o servidor pré-fork embutido.")
+@with_appcontext
+def serve_command(host, port, workers, threads, server):
+    """Servidor de produção: carrega o app uma vez e cria os workers por fork."""
+    config = current_app.config
+    host = host or config.get("SERVER_HOST", "0.0.0.0")
+    port = port or config.get("SERVER_PORT", 3001)
+    workers = workers or config.get("SERVER_WORKERS", 1)
+    threads = threads or config.get("SERVER_THREADS", 8)
+    if server == "gunicorn" and BaseApplication is None:
+        raise click.UsageError("gunicorn não está instalado (pip install -r requirements-server.txt)")
+
+    app = current_app._get_current_object()
+    warm_up(app)
+    if server != "builtin" and BaseApplication is not None:
+        _run_gunicorn(app, {
+            "bind": f"{host}:{port}",
+            "workers": workers,
+            "threads": threads,
+            "worker_class": "gthread" if threads > 1 else "sync",
+            "graceful_timeout": config.get("SERVER_GRACEFUL_TIMEOUT", 30),
+            "preload_app": True,
+        })
+        return
+    PreforkServer(app, host, port, workers, threads,
+                  graceful_timeout=config.get("SERVER_GRACEFUL_TIMEOUT", 30)).serve_forever()
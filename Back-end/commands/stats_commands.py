@@ -0,0 +1,14 @@
+import click
+from flask.cli import AppGroup
+
+from database.models import db
+from services.stats import rebuild_counters
+
+stats_cli = AppGroup("stats", help="Gerencia os contadores de estatísticas.")
+
+@stats_cli.command("rebuild")
+def rebuild():
+    """Recalcula os contadores de /stats a partir das tabelas de animais e adoções."""
+    with db.engine.begin() as conn:
+        rows = rebuild_counters(conn)
+    click.echo(f"{rows} contadores recalculados.")
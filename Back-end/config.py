@@ -1,13 +1,153 @@
 import os
+import tempfile
 from datetime import timedelta
 
+
+def database_url() -> str:
+    """URL do banco a partir de DATABASE_URL (padrão: SQLite local)."""
+    url = os.environ.get("DATABASE_URL", "sqlite:///protegepet.db")
+    # Provedores como Heroku/Render ainda usam o esquema antigo "postgres://"
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def engine_options(url: str) -> dict:
+    """Opções do pool de conexões lidas do ambiente (DB_POOL_*)."""
+    if url.startswith("sqlite") and ":memory:" in url:
+        # SQLite em memória usa uma única conexão; o pool não se aplica
+        return {}
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
 class Config:
     """Configuração base da aplicação"""
-    SQLALCHEMY_DATABASE_URI = "sqlite:///protegepet.db"
+    SQLALCHEMY_DATABASE_URI = database_url()
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # PRAGMAs aplicados a cada conexão SQLite (ver database/engine.py)
+    SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Aplica migrações pendentes na inicialização (em produção, use `flask db upgrade`)
+    AUTO_MIGRATE = os.environ.get("AUTO_MIGRATE", "true").lower() == "true"
     SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
     JSON_SORT_KEYS = False
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+    # Hash de senhas: algoritmo/custo no formato do werkzeug (ex.: "scrypt:32768:8:1",
+    # "pbkdf2:sha256:600000"). Hashes antigos são refeitos no próximo login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", 16))
+    # Processos dedicados ao hash (0 = na própria thread) e limite de hashes pendentes
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))
+    # Cache de usuários autenticados (token_required/get_current_user)
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 1024))
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 60))
+    CORS_ORIGINS = ["http://localhost:5173", "http://localhost:5174", "http://localhost:3000"]
+    # Segundos que a contagem total de uma listagem fica em cache (count=cached)
+    LIST_COUNT_CACHE_TTL = float(os.environ.get("LIST_COUNT_CACHE_TTL", 30))
+    # Serialização JSON das respostas: "orjson" (se instalado) ou "stdlib"
+    JSON_PROVIDER = os.environ.get("JSON_PROVIDER", "orjson")
+    # Respostas em MessagePack quando o Accept pedir (requer a lib msgpack)
+    RESPONSE_MSGPACK = os.environ.get("RESPONSE_MSGPACK", "true").lower() == "true"
+    # Compressão das respostas (Accept-Encoding): algoritmos em ordem de preferência,
+    # tamanho mínimo em bytes e níveis do gzip (1-9) e do brotli (0-11)
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_ALGORITHMS = tuple(os.environ.get("COMPRESS_ALGORITHMS", "br,gzip").split(","))
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+    COMPRESS_BR_QUALITY = int(os.environ.get("COMPRESS_BR_QUALITY", 5))
+    # Respostas em streaming: flush do compressor a cada N bytes de entrada ou N segundos
+    COMPRESS_STREAM_FLUSH_BYTES = int(os.environ.get("COMPRESS_STREAM_FLUSH_BYTES", 16384))
+    COMPRESS_STREAM_FLUSH_INTERVAL = float(os.environ.get("COMPRESS_STREAM_FLUSH_INTERVAL", 1.0))
+    # Instrumentação (/metrics, Server-Timing) e log de consultas lentas (0 = desligado)
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+    # Cache HTTP do catálogo: max-age enviado ao cliente (0 = sempre revalidar
+    # com ETag) e por quanto tempo o servidor guarda respostas prontas
+    HTTP_CACHE_MAX_AGE = int(os.environ.get("HTTP_CACHE_MAX_AGE", 0))
+    HTTP_RESPONSE_CACHE_TTL = float(os.environ.get("HTTP_RESPONSE_CACHE_TTL", 300))
+    # Fila write-behind de contato/feedback: gravação em lote por tamanho/tempo,
+    # limite de pendências (503 quando cheia) e journal opcional em arquivo
+    WRITE_BEHIND_ENABLED = os.environ.get("WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", 500))
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", 1.0))
+    WRITE_BEHIND_MAX_PENDING = int(os.environ.get("WRITE_BEHIND_MAX_PENDING", 10000))
+    WRITE_BEHIND_SUBMIT_TIMEOUT = float(os.environ.get("WRITE_BEHIND_SUBMIT_TIMEOUT", 1.0))
+    WRITE_BEHIND_JOURNAL = os.environ.get("WRITE_BEHIND_JOURNAL", "")
+    WRITE_BEHIND_JOURNAL_FSYNC = os.environ.get("WRITE_BEHIND_JOURNAL_FSYNC", "false").lower() == "true"
+    # Tarefas em segundo plano (services/jobs.py): threads por processo, intervalo de
+    # consulta, tentativas, backoff inicial e tempo até uma tarefa "running" ser retomada
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+    JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 1.0))
+    JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 5))
+    JOB_RETRY_BACKOFF = float(os.environ.get("JOB_RETRY_BACKOFF", 2.0))
+    JOB_LOCK_TIMEOUT = int(os.environ.get("JOB_LOCK_TIMEOUT", 300))
+    # Imagens dos animais (services/image_store.py): diretório (padrão: instance/images;
+    # compartilhado entre instâncias se houver mais de uma), tamanho máximo do upload e
+    # miniaturas WebP geradas em segundo plano (nome -> largura máxima; requer Pillow)
+    IMAGE_STORE_PATH = os.environ.get("IMAGE_STORE_PATH", "")
+    IMAGE_MAX_BYTES = int(os.environ.get("IMAGE_MAX_BYTES", 5 * 1024 * 1024))
+    IMAGE_VARIANTS = {"thumb": 320, "medium": 960}
+    IMAGE_WEBP_QUALITY = int(os.environ.get("IMAGE_WEBP_QUALITY", 80))
+    # Servidor de produção (`flask serve`, gunicorn.conf.py): processos (padrão: um
+    # por núcleo) e threads por processo
+    SERVER_HOST = os.environ.get("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.environ.get("PORT", 3001))
+    SERVER_WORKERS = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    SERVER_THREADS = int(os.environ.get("SERVER_THREADS", 8))
+    SERVER_GRACEFUL_TIMEOUT = float(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+    # Limite de taxa por cliente (token bucket por usuário do JWT ou IP) e de
+    # requisições simultâneas por classe de endpoint; ver utils/rate_limit.py.
+    # RATE_LIMIT_STORAGE_URL: "memory://" (por processo) ou "redis://..." (compartilhado)
+    RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_STORAGE_URL = os.environ.get("RATE_LIMIT_STORAGE_URL", "memory://")
+    # Usa o primeiro IP de X-Forwarded-For (apenas atrás de um proxy confiável)
+    RATE_LIMIT_TRUST_PROXY = os.environ.get("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+    RATE_LIMIT_POLICIES = {
+        "auth": {"methods": ("POST",), "rate": "10/minute", "concurrency": "auth"},
+        "adoptions": {"methods": ("POST",), "rate": "30/minute", "burst": 10, "concurrency": "write"},
+        "contact": {"methods": ("POST",), "rate": "5/minute", "concurrency": "write"},
+        "feedback": {"methods": ("POST",), "rate": "5/minute", "concurrency": "write"},
+        "address": {"methods": ("GET",), "rate": "60/minute", "burst": 30, "concurrency": "external"},
+        # GET /events (asgi.py): limita reconexões; as conexões abertas são limitadas por SSE_MAX_SUBSCRIBERS
+        "events": {"methods": ("GET",), "rate": "60/minute", "burst": 30},
+    }
+    CONCURRENCY_LIMITS = {
+        "auth": int(os.environ.get("CONCURRENCY_LIMIT_AUTH", 8)),
+        "write": int(os.environ.get("CONCURRENCY_LIMIT_WRITE", 16)),
+        "external": int(os.environ.get("CONCURRENCY_LIMIT_EXTERNAL", 32)),
+    }
+    # Eventos em tempo real (GET /events no asgi.py; ver services/events.py): intervalo
+    # dos heartbeats, eventos guardados por processo para retomar pelo Last-Event-ID,
+    # buffer de cada conexão, conexões simultâneas e espera sugerida para reconectar
+    SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+    SSE_REPLAY_SIZE = int(os.environ.get("SSE_REPLAY_SIZE", 1000))
+    SSE_BUFFER_SIZE = int(os.environ.get("SSE_BUFFER_SIZE", 100))
+    SSE_MAX_SUBSCRIBERS = int(os.environ.get("SSE_MAX_SUBSCRIBERS", 10000))
+    SSE_RETRY_MS = int(os.environ.get("SSE_RETRY_MS", 3000))
+    # Arquivo de municípios (nome, UF, latitude, longitude) usado para geocodificar as
+    # cidades dos animais e a busca por proximidade (services/geocoding.py)
+    GAZETTEER_PATH = os.environ.get(
+        "GAZETTEER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "municipios.csv")
+    )
+    # Consulta de CEP (ViaCEP) e seus caches em memória/banco
+    VIACEP_BASE_URL = os.environ.get("VIACEP_BASE_URL", "https://viacep.com.br/ws")
+    VIACEP_TIMEOUT = float(os.environ.get("VIACEP_TIMEOUT", 5))
+    VIACEP_POOL_SIZE = int(os.environ.get("VIACEP_POOL_SIZE", 10))
+    CEP_CACHE_MAXSIZE = int(os.environ.get("CEP_CACHE_MAXSIZE", 10000))
+    CEP_CACHE_TTL = int(os.environ.get("CEP_CACHE_TTL", 30 * 24 * 3600))
+    CEP_NEGATIVE_CACHE_TTL = int(os.environ.get("CEP_NEGATIVE_CACHE_TTL", 24 * 3600))
+    # Responde apenas com a base local de CEPs (sem consultar o ViaCEP)
+    CEP_LOCAL_ONLY = os.environ.get("CEP_LOCAL_ONLY", "false").lower() == "true"
 
 class DevelopmentConfig(Config):
     """Configuração para desenvolvimento"""
@@ -18,11 +158,20 @@ class ProductionConfig(Config):
     """Configuração para produção"""
     DEBUG = False
     TESTING = False
+    AUTO_MIGRATE = os.environ.get("AUTO_MIGRATE", "false").lower() == "true"
 
 class TestingConfig(Config):
     """Configuração para testes"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    LIST_COUNT_CACHE_TTL = 0
+    HTTP_RESPONSE_CACHE_TTL = 0
+    WRITE_BEHIND_ENABLED = False
+    JOB_WORKERS = 0
+    PASSWORD_HASH_WORKERS = 0
+    RATE_LIMIT_ENABLED = False
+    IMAGE_STORE_PATH = os.path.join(tempfile.gettempdir(), "protegepet-test-images")
 
 config = {
     "development": DevelopmentConfig,
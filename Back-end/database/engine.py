@@ -0,0 +1,63 @@
+"""
+Ajustes do engine SQLAlchemy por banco
+No SQLite, aplica WAL, busy_timeout e synchronous a cada nova conexão para que
+escritas concorrentes esperem pelo lock em vez de falhar com "database is locked".
+Após um fork (servidor com vários processos e app pré-carregado), o processo
+filho descarta as conexões herdadas do pai e abre as suas.
+"""
+
+import logging
+import os
+import weakref
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+
+
+def configure_engine(engine, app_config) -> None:
+    """Registra os ajustes de conexão do engine conforme o dialeto."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    journal_mode = app_config.get("SQLITE_JOURNAL_MODE", "WAL").upper()
+    synchronous = app_config.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+    busy_timeout = int(app_config.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    if journal_mode not in _JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE inválido: {journal_mode}")
+    if synchronous not in _SYNCHRONOUS_LEVELS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS inválido: {synchronous}")
+    # WAL não se aplica a bancos em memória
+    in_memory = engine.url.database in (None, "", ":memory:")
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {busy_timeout}")
+            if not in_memory:
+                cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            cursor.execute(f"PRAGMA synchronous = {synchronous}")
+        finally:
+            cursor.close()
+
+
+def dispose_after_fork(engine) -> None:
+    """Faz cada processo filho criado por fork abrir seu próprio pool de conexões.
+
+    `dispose(close=False)` abandona as conexões herdadas sem fechá-las, para não
+    encerrar sockets/arquivos que o processo pai continua usando.
+    """
+    if not hasattr(os, "register_at_fork"):  # Windows: não há fork
+        return
+    engine_ref = weakref.ref(engine)
+
+    def _dispose_in_child():
+        engine = engine_ref()
+        if engine is not None:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=_dispose_in_child)
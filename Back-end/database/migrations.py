@@ -0,0 +1,361 @@
+"""
+Migrações versionadas do schema
+Cada migração roda em sua própria transação e grava sua versão na tabela
+`schema_version`. Na inicialização, o app apenas compara a versão gravada com
+a última migração conhecida (ver `check_schema`).
+"""
+
+import base64
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, Text, func, inspect, literal,
+    select,
+)
+
+from database.models import db
+from database.search import init_search_index
+
+logger = logging.getLogger(__name__)
+
+_version_metadata = MetaData()
+schema_version_table = Table(
+    "schema_version", _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable
+
+
+MIGRATIONS: List[Migration] = []
+
+
+def migration(version: int, description: str):
+    """Registra uma função `upgrade(conn)` como migração `version`."""
+    def decorator(upgrade):
+        if MIGRATIONS and version != MIGRATIONS[-1].version + 1:
+            raise RuntimeError(f"Migração {version} fora de ordem")
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        return upgrade
+    return decorator
+
+
+# As migrações descrevem as tabelas como eram na sua versão, e não pelos modelos
+# atuais (database/models.py): colunas adicionadas depois (ex.: animals.ong_id, com
+# FK para users) não podem aparecer no CREATE TABLE de uma migração anterior.
+
+def _create_index(conn, table_name: str, index_name: str, *columns: str) -> None:
+    table = Table(table_name, MetaData(), autoload_with=conn)  # colunas como estão no banco
+    Index(index_name, *(table.c[c] for c in columns)).create(conn, checkfirst=True)
+
+
+@migration(1, "Tabelas iniciais")
+def _initial_tables(conn):
+    metadata = MetaData()
+    Table(
+        "animals", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(100), nullable=False),
+        Column("species", String(50), nullable=False),
+        Column("age", String(50), nullable=False),
+        Column("size", String(50), nullable=False),
+        Column("temperament", String(200), nullable=False),
+        Column("city", String(100), nullable=False),
+        Column("status", String(50)),
+        Column("image", String(500)),
+        Column("description", Text, nullable=False),
+        Column("history", Text, nullable=False),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+    )
+    Table(
+        "adoptions", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("animal_id", Integer, ForeignKey("animals.id"), nullable=False),
+        Column("adopter_name", String(100), nullable=False),
+        Column("adopter_email", String(100), nullable=False),
+        Column("adopter_phone", String(20)),
+        Column("address_cep", String(10), nullable=False),
+        Column("address_street", String(200), nullable=False),
+        Column("address_number", String(20), nullable=False),
+        Column("address_complement", String(200)),
+        Column("address_neighborhood", String(100)),
+        Column("address_city", String(100), nullable=False),
+        Column("address_state", String(2), nullable=False),
+        Column("adoption_message", Text),
+        Column("status", String(50)),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+    )
+    Table(
+        "contacts", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(100), nullable=False),
+        Column("email", String(100), nullable=False),
+        Column("subject", String(200)),
+        Column("message", Text, nullable=False),
+        Column("created_at", DateTime),
+    )
+    Table(
+        "feedback", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("mensagem", Text, nullable=False),
+        Column("created_at", DateTime),
+    )
+    Table(
+        "users", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(150), nullable=False),
+        Column("email", String(150), nullable=False, unique=True),
+        Column("password_hash", String(255), nullable=False),
+        Column("role", String(20), nullable=False),
+        Column("created_at", DateTime),
+    )
+    # create_all ordena as tabelas pelas FKs e ignora as que já existem (bancos anteriores às migrações)
+    metadata.create_all(conn)
+
+
+@migration(2, "Base local e cache de CEP")
+def _cep_tables(conn):
+    metadata = MetaData()
+    Table(
+        "cep_addresses", metadata,
+        Column("cep", String(8), primary_key=True),
+        Column("street", String(200), nullable=False),
+        Column("neighborhood", String(100), nullable=False),
+        Column("city", String(100), nullable=False),
+        Column("state", String(2), nullable=False),
+        Column("region", String(20), nullable=False),
+    )
+    Table(
+        "cep_cache", metadata,
+        Column("cep", String(8), primary_key=True),
+        Column("found", Boolean, nullable=False),
+        Column("payload", Text),
+        Column("expires_at", DateTime, nullable=False, index=True),
+    )
+    metadata.create_all(conn)
+
+
+@migration(3, "Índices de paginação por cursor e busca textual de animais")
+def _keyset_and_search_indexes(conn):
+    _create_index(conn, "animals", "ix_animals_created_at_id", "created_at", "id")
+    _create_index(conn, "animals", "ix_animals_status_created_at_id", "status", "created_at", "id")
+    _create_index(conn, "animals", "ix_animals_species_created_at_id", "species", "created_at", "id")
+    _create_index(conn, "adoptions", "ix_adoptions_created_at_id", "created_at", "id")
+    _create_index(conn, "adoptions", "ix_adoptions_status_created_at_id", "status", "created_at", "id")
+    _create_index(conn, "adoptions", "ix_adoptions_animal_id_created_at_id", "animal_id", "created_at", "id")
+    init_search_index(conn)
+
+
+@migration(4, "Índices das consultas de catálogo e login")
+def _hot_query_indexes(conn):
+    # animals(created_at), adoptions(animal_id) e adoptions(status, created_at) já são
+    # prefixos dos índices compostos da migração 3
+    _create_index(conn, "animals", "ix_animals_status_species_size_city", "status", "species", "size", "city")
+    _create_index(conn, "users", "ix_users_email_role", "email", "role")
+
+
+@migration(5, "Versões de recursos para cache HTTP")
+def _resource_versions(conn):
+    metadata = MetaData()
+    Table(
+        "resource_versions", metadata,
+        Column("name", String(50), primary_key=True),
+        Column("version", Integer, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    metadata.create_all(conn)
+
+
+@migration(6, "Fila de tarefas em segundo plano")
+def _jobs(conn):
+    metadata = MetaData()
+    Table(
+        "jobs", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(100), nullable=False),
+        Column("payload", Text, nullable=False),
+        Column("status", String(20), nullable=False),
+        Column("attempts", Integer, nullable=False),
+        Column("max_attempts", Integer, nullable=False),
+        Column("run_at", DateTime, nullable=False),
+        Column("locked_by", String(100)),
+        Column("locked_at", DateTime),
+        Column("last_error", Text),
+        Column("created_at", DateTime, nullable=False),
+        Column("started_at", DateTime),
+        Column("finished_at", DateTime),
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+    metadata.create_all(conn)
+
+
+@migration(7, "Imagens inline dos animais movidas para o armazenamento de arquivos")
+def _extract_inline_images(conn):
+    # Importado aqui: o armazenamento depende da fila de tarefas e do app configurado
+    from services.image_store import ImageError, image_url, save_stream
+
+    animals = db.metadata.tables["animals"]
+    jobs = db.metadata.tables["jobs"]
+    rows = conn.execute(
+        select(animals.c.id, animals.c.image).where(animals.c.image.like("data:%"))
+    ).all()
+    created_hashes = set()
+    for animal_id, value in rows:
+        try:
+            data = base64.b64decode(value.split(",", 1)[1])
+            digest, created = save_stream(io.BytesIO(data))
+        except (ImageError, ValueError, IndexError) as e:
+            logger.warning(f"Imagem inline do animal {animal_id} descartada: {e}")
+            url = None
+        else:
+            url = image_url(digest)
+            if created:
+                created_hashes.add(digest)
+        conn.execute(animals.update().where(animals.c.id == animal_id).values(image=url))
+    now = datetime.utcnow()
+    for digest in created_hashes:
+        conn.execute(jobs.insert().values(
+            name="images.variants", payload=json.dumps({"hash": digest}), status="queued",
+            attempts=0, max_attempts=5, run_at=now, created_at=now,
+        ))
+    if rows:
+        # Invalida ETags e respostas em cache que ainda embutem as imagens
+        versions = db.metadata.tables["resource_versions"]
+        conn.execute(versions.update().where(versions.c.name == "animals")
+                     .values(version=versions.c.version + 1, updated_at=now))
+        logger.info(f"{len(rows)} imagens inline extraídas ({len(created_hashes)} arquivos novos)")
+
+
+@migration(8, "ONG dona de cada animal e contadores de estatísticas")
+def _stat_counters(conn):
+    from services.stats import rebuild_counters
+
+    conn.exec_driver_sql("ALTER TABLE animals ADD COLUMN ong_id INTEGER REFERENCES users(id)")
+    _create_index(conn, "animals", "ix_animals_ong_id", "ong_id")
+    metadata = MetaData()
+    Table(
+        "stat_counters", metadata,
+        Column("scope", String(50), primary_key=True),
+        Column("metric", String(50), primary_key=True),
+        Column("key", String(100), primary_key=True),
+        Column("count", Integer, nullable=False),
+    )
+    metadata.create_all(conn)
+    rebuild_counters(conn)
+
+
+@migration(9, "Registro de alterações do catálogo (sincronização incremental)")
+def _animal_changes(conn):
+    metadata = MetaData()
+    Table(
+        "animal_changes", metadata,
+        Column("seq", Integer, primary_key=True, autoincrement=True),
+        Column("animal_id", Integer, nullable=False),
+        Column("op", String(10), nullable=False),
+        Column("changed_at", DateTime, nullable=False, index=True),
+        Index("ix_animal_changes_animal_id_seq", "animal_id", "seq"),
+        sqlite_autoincrement=True,
+    )
+    metadata.create_all(conn)
+    # Um "upsert" por animal já existente: sincronizar desde o início equivale à carga completa
+    animals = db.metadata.tables["animals"]
+    changes = db.metadata.tables["animal_changes"]
+    conn.execute(changes.insert().from_select(
+        ["animal_id", "op", "changed_at"],
+        select(animals.c.id, literal("upsert"), literal(datetime.utcnow())).order_by(animals.c.id),
+    ))
+
+
+@migration(10, "Coordenadas dos animais e índice geohash (busca por proximidade)")
+def _animal_coordinates(conn):
+    from services.geocoding import geo_values
+
+    for name, sql_type in (("latitude", "FLOAT"), ("longitude", "FLOAT"), ("geohash", "VARCHAR(12)")):
+        conn.exec_driver_sql(f"ALTER TABLE animals ADD COLUMN {name} {sql_type}")
+    _create_index(conn, "animals", "ix_animals_geohash", "geohash", "latitude", "longitude")
+
+    animals = db.metadata.tables["animals"]
+    ids_by_city = {}
+    for animal_id, city in conn.execute(select(animals.c.id, animals.c.city)):
+        ids_by_city.setdefault(city, []).append(animal_id)
+    updated = []
+    for city, ids in ids_by_city.items():
+        values = geo_values(city)
+        if values["geohash"] is not None:
+            conn.execute(animals.update().where(animals.c.city == city).values(**values))
+            updated += ids
+    if updated:
+        # Os animais mudaram: invalida o cache HTTP e registra no feed de alterações
+        now = datetime.utcnow()
+        versions = db.metadata.tables["resource_versions"]
+        conn.execute(versions.update().where(versions.c.name == "animals")
+                     .values(version=versions.c.version + 1, updated_at=now))
+        conn.execute(db.metadata.tables["animal_changes"].insert(), [
+            {"animal_id": animal_id, "op": "upsert", "changed_at": now} for animal_id in sorted(updated)
+        ])
+    logger.info(f"{len(updated)} animais geocodificados")
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1].version if MIGRATIONS else 0
+
+
+def current_version(conn) -> int:
+    """Versão aplicada no banco (0 se o banco nunca foi migrado)."""
+    if not inspect(conn).has_table(schema_version_table.name):
+        return 0
+    return conn.execute(select(func.max(schema_version_table.c.version))).scalar() or 0
+
+
+def upgrade(engine, target: int | None = None) -> List[int]:
+    """Aplica as migrações pendentes até `target` (padrão: a última).
+
+    Returns:
+        versões aplicadas
+    """
+    target = latest_version() if target is None else target
+    with engine.begin() as conn:
+        _version_metadata.create_all(conn)
+        version = current_version(conn)
+    applied = []
+    for item in MIGRATIONS:
+        if item.version <= version or item.version > target:
+            continue
+        with engine.begin() as conn:
+            logger.info(f"Aplicando migração {item.version}: {item.description}")
+            item.upgrade(conn)
+            conn.execute(schema_version_table.insert().values(
+                version=item.version, description=item.description, applied_at=datetime.utcnow()
+            ))
+        applied.append(item.version)
+    return applied
+
+
+def check_schema(app) -> int:
+    """Verifica a versão do schema na inicialização.
+
+    Com AUTO_MIGRATE, aplica as migrações pendentes; caso contrário apenas
+    registra um aviso para que `flask db upgrade` seja executado no deploy.
+    """
+    with db.engine.connect() as conn:
+        version = current_version(conn)
+    latest = latest_version()
+    if version >= latest:
+        return version
+    if app.config.get("AUTO_MIGRATE"):
+        upgrade(db.engine)
+        return latest
+    logger.warning(f"Schema do banco na versão {version}, esperado {latest}. Execute `flask db upgrade`.")
+    return version
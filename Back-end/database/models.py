@@ -1,11 +1,25 @@
+import json
+
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 
+from utils.password_hashing import hash_password, needs_rehash, verify_password
+
 db = SQLAlchemy()
 
 class Animal(db.Model):
     """Modelo para animais disponíveis para adoção"""
     __tablename__ = "animals"
+    __table_args__ = (
+        # Paginação por cursor (keyset) em (created_at, id), com e sem filtros comuns
+        db.Index("ix_animals_created_at_id", "created_at", "id"),
+        db.Index("ix_animals_status_created_at_id", "status", "created_at", "id"),
+        db.Index("ix_animals_species_created_at_id", "species", "created_at", "id"),
+        # Filtros combinados do catálogo
+        db.Index("ix_animals_status_species_size_city", "status", "species", "size", "city"),
+        # Busca por proximidade: intervalos de geohash, com as coordenadas para o filtro exato
+        db.Index("ix_animals_geohash", "geohash", "latitude", "longitude"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -18,32 +32,41 @@ class Animal(db.Model):
     image = db.Column(db.String(500), nullable=True)
     description = db.Column(db.Text, nullable=False)
     history = db.Column(db.Text, nullable=False)
+    # ONG que cadastrou o animal (estatísticas por ONG); nulo em registros antigos/importados
+    ong_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+    # Coordenadas da cidade (arquivo de municípios, services/geocoding.py); nulas se não encontrada
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     adoptions = db.relationship("Adoption", back_populates="animal", cascade="all, delete-orphan")
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "species": self.species,
-            "age": self.age,
-            "size": self.size,
-            "temperament": self.temperament,
-            "city": self.city,
-            "status": self.status,
-            "image": self.image,
-            "description": self.description,
-            "history": self.history,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    # Campos serializados por to_dict, na ordem da resposta
+    SERIALIZED_FIELDS = (
+        "id", "name", "species", "age", "size", "temperament", "city", "latitude", "longitude",
+        "status", "image", "description", "history", "created_at", "updated_at"
+    )
+    
+    def to_dict(self, fields=None):
+        """Serializa o animal. `fields` restringe aos campos pedidos (projeção)."""
+        data = {}
+        for field in fields or self.SERIALIZED_FIELDS:
+            value = getattr(self, field)
+            data[field] = value.isoformat() if isinstance(value, datetime) else value
+        return data
 
 
 class Adoption(db.Model):
     """Modelo para registros de adoção"""
     __tablename__ = "adoptions"
+    __table_args__ = (
+        # Listagens do painel da ONG: filtro por status/animal + ordenação por (created_at, id)
+        db.Index("ix_adoptions_created_at_id", "created_at", "id"),
+        db.Index("ix_adoptions_status_created_at_id", "status", "created_at", "id"),
+        db.Index("ix_adoptions_animal_id_created_at_id", "animal_id", "created_at", "id"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     animal_id = db.Column(db.Integer, db.ForeignKey("animals.id"), nullable=False)
@@ -64,26 +87,21 @@ class Adoption(db.Model):
     
     animal = db.relationship("Animal", back_populates="adoptions")
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "animal_id": self.animal_id,
-            "animal": self.animal.to_dict() if self.animal else None,
-            "adopter_name": self.adopter_name,
-            "adopter_email": self.adopter_email,
-            "adopter_phone": self.adopter_phone,
-            "address_cep": self.address_cep,
-            "address_street": self.address_street,
-            "address_number": self.address_number,
-            "address_complement": self.address_complement,
-            "address_neighborhood": self.address_neighborhood,
-            "address_city": self.address_city,
-            "address_state": self.address_state,
-            "adoption_message": self.adoption_message,
-            "status": self.status,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    # Campos serializados por to_dict, na ordem da resposta (sem o animal embutido)
+    SERIALIZED_FIELDS = (
+        "id", "animal_id", "adopter_name", "adopter_email", "adopter_phone", "address_cep",
+        "address_street", "address_number", "address_complement", "address_neighborhood",
+        "address_city", "address_state", "adoption_message", "status", "created_at", "updated_at"
+    )
+    
+    def to_dict(self, include_animal=True, animal_fields=None):
+        data = {}
+        for field in self.SERIALIZED_FIELDS:
+            value = getattr(self, field)
+            data[field] = value.isoformat() if isinstance(value, datetime) else value
+        if include_animal:
+            data["animal"] = self.animal.to_dict(animal_fields) if self.animal else None
+        return data
 
 
 class Contact(db.Model):
@@ -124,9 +142,122 @@ class Feedback(db.Model):
         }
 
 
+class CepAddress(db.Model):
+    """Base local de CEPs importada de um dataset (ver `flask cep import`)"""
+    __tablename__ = "cep_addresses"
+
+    cep = db.Column(db.String(8), primary_key=True)
+    street = db.Column(db.String(200), nullable=False, default="")
+    neighborhood = db.Column(db.String(100), nullable=False, default="")
+    city = db.Column(db.String(100), nullable=False)
+    state = db.Column(db.String(2), nullable=False)
+    region = db.Column(db.String(20), nullable=False, default="")
+
+    def to_dict(self):
+        return {
+            "cep": f"{self.cep[:5]}-{self.cep[5:]}",
+            "street": self.street,
+            "neighborhood": self.neighborhood,
+            "city": self.city,
+            "state": self.state,
+            "region": self.region
+        }
+
+
+class CepCacheEntry(db.Model):
+    """Cache compartilhado (entre processos) das consultas de CEP ao ViaCEP"""
+    __tablename__ = "cep_cache"
+
+    cep = db.Column(db.String(8), primary_key=True)
+    found = db.Column(db.Boolean, nullable=False)  # False = cache negativo ("erro" do ViaCEP)
+    payload = db.Column(db.Text, nullable=True)  # JSON do endereço formatado
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class ResourceVersion(db.Model):
+    """Versão de um recurso (ex.: catálogo de animais), incrementada a cada escrita.
+
+    Usada para ETag/Last-Modified e para validar o cache de respostas entre processos.
+    """
+    __tablename__ = "resource_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class AnimalChange(db.Model):
+    """Registro de alterações do catálogo para sincronização incremental (GET /animals/changes).
+
+    `seq` cresce a cada escrita; exclusões ficam como tombstones (op "delete"),
+    já que o animal não existe mais.
+    """
+    __tablename__ = "animal_changes"
+    __table_args__ = (
+        db.Index("ix_animal_changes_animal_id_seq", "animal_id", "seq"),
+        # Sem AUTOINCREMENT o SQLite reutiliza o maior rowid após uma compactação total
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    animal_id = db.Column(db.Integer, nullable=False)  # sem FK: o tombstone sobrevive ao animal
+    op = db.Column(db.String(10), nullable=False)  # upsert, delete
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class StatCounter(db.Model):
+    """Contador agregado mantido a cada escrita (ver services/stats.py).
+
+    `scope` é "all" ou "ong:<id>"; `metric` identifica a contagem (ex.:
+    "animals.status") e `key` o valor agrupado (ex.: "Disponível" ou uma data).
+    """
+    __tablename__ = "stat_counters"
+
+    scope = db.Column(db.String(50), primary_key=True)
+    metric = db.Column(db.String(50), primary_key=True)
+    key = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Job(db.Model):
+    """Tarefa em segundo plano persistida (ver services/jobs.py)"""
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Busca da próxima tarefa pronta: WHERE status = ? AND run_at <= ? ORDER BY run_at
+        db.Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default="{}")  # JSON
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        data = {}
+        for field in ("id", "name", "status", "attempts", "max_attempts", "run_at", "last_error",
+                      "created_at", "started_at", "finished_at"):
+            value = getattr(self, field)
+            data[field] = value.isoformat() if isinstance(value, datetime) else value
+        data["payload"] = json.loads(self.payload)
+        return data
+
+
 class User(db.Model):
     """Modelo para usuários (ONG ou adotante)."""
     __tablename__ = "users"
+    __table_args__ = (
+        # Login busca por (email, role)
+        db.Index("ix_users_email_role", "email", "role"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(150), nullable=False)
@@ -136,12 +267,13 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password: str):
-        from werkzeug.security import generate_password_hash
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        from werkzeug.security import check_password_hash
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return needs_rehash(self.password_hash)
 
     def to_dict(self):
         return {
@@ -0,0 +1,83 @@
+"""
+Busca textual de animais
+Índice FTS5 (SQLite) sobre nome/descrição, mantido em sincronia com a tabela
+`animals` por triggers. Em outros bancos a busca cai para ILIKE.
+"""
+
+import re
+
+from sqlalchemy import and_, or_, text
+
+from database.models import Animal
+
+FTS_TABLE = "animals_fts"
+
+# Colunas de Animal indexadas para busca textual
+SEARCH_COLUMNS = ("name", "description")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _fts_ddl() -> list:
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{cols}, content='animals', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON animals BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON animals BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {cols} ON animals BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def init_search_index(conn) -> None:
+    """Cria o índice FTS e os triggers de sincronização (idempotente).
+
+    Quando a tabela virtual acaba de ser criada, reconstrói o índice a partir
+    das linhas já existentes em `animals`.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE}
+    ).first()
+    for statement in _fts_ddl():
+        conn.execute(text(statement))
+    if not exists:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _fts_match_expression(query_text: str) -> str | None:
+    """Converte o texto livre em uma expressão MATCH segura (prefixo por termo)."""
+    tokens = _TOKEN_RE.findall(query_text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def text_search_filter(query_text: str, dialect_name: str):
+    """Retorna a cláusula WHERE para a busca textual ou None se não houver termos."""
+    if dialect_name == "sqlite":
+        match = _fts_match_expression(query_text)
+        if match is None:
+            return None
+        return Animal.id.in_(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_query")
+            .bindparams(fts_query=match)
+        )
+
+    tokens = _TOKEN_RE.findall(query_text or "")
+    if not tokens:
+        return None
+    clauses = []
+    for token in tokens:
+        pattern = f"%{token}%"
+        clauses.append(or_(*(getattr(Animal, c).ilike(pattern) for c in SEARCH_COLUMNS)))
+    return and_(*clauses)
@@ -0,0 +1,48 @@
+"""
+Upsert portável
+INSERT ... ON CONFLICT DO UPDATE em SQLite/PostgreSQL; UPDATE + INSERT nos demais bancos.
+"""
+
+from typing import Iterable, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def upsert(conn, table, rows: Sequence[dict], key_columns: Iterable[str]) -> None:
+    """Insere `rows` em `table`, sobrescrevendo as linhas com a mesma chave.
+
+    Todas as linhas devem ter as mesmas colunas. Executa um único executemany
+    nos bancos com suporte a ON CONFLICT.
+    """
+    if not rows:
+        return
+    key_columns = tuple(key_columns)
+    update_columns = [c for c in rows[0] if c not in key_columns]
+    insert = _DIALECT_INSERTS.get(conn.dialect.name)
+    if insert is not None:
+        statement = insert(table)
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={c: statement.excluded[c] for c in update_columns}
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=list(key_columns))
+        conn.execute(statement, list(rows))
+        return
+
+    for row in rows:
+        where = [table.c[k] == row[k] for k in key_columns]
+        if update_columns:
+            values = {c: row[c] for c in update_columns}
+            if conn.execute(table.update().where(*where).values(values)).rowcount:
+                continue
+        elif conn.execute(select(table.c[key_columns[0]]).where(*where)).first():
+            continue
+        conn.execute(table.insert().values(row))
@@ -0,0 +1,15 @@
+"""
+Configuração do gunicorn: gunicorn -c gunicorn.conf.py wsgi:app
+Os valores vêm do ambiente, com os mesmos nomes usados pelo `flask serve`.
+"""
+
+import os
+
+bind = f"{os.environ.get('SERVER_HOST', '0.0.0.0')}:{os.environ.get('PORT', 3001)}"
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+threads = int(os.environ.get("SERVER_THREADS", 8))
+worker_class = "gthread" if threads > 1 else "sync"
+graceful_timeout = float(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+# Carrega o app (imports, schema, projeções) no processo mestre, antes do fork.
+# As conexões herdadas são descartadas em cada worker por database/engine.py.
+preload_app = True
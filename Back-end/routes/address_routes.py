@@ -1,5 +1,5 @@
 from flask import Blueprint, request
-from services.address_service import search_address_by_cep
+from services.address_service import get_cache_metrics, search_address_by_cep
 from utils.response_builder import build_response
 from utils.error_handlers import handle_error
 
@@ -35,3 +35,12 @@ def get_address(cep):
         ), 200
     except Exception as e:
         return handle_error(e, "Erro ao buscar endereço")
+
+@address_bp.route("/cache/metrics", methods=["GET"])
+def get_address_cache_metrics():
+    """GET /address/cache/metrics - Contadores de acerto/falha do cache de CEP"""
+    return build_response(
+        success=True,
+        message="Métricas do cache de CEP",
+        data=get_cache_metrics()
+    ), 200
@@ -1,24 +1,158 @@
-from flask import Blueprint, request
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+
+from flask import Blueprint, Response, request, stream_with_context
+from sqlalchemy import select
 from database.models import db, Adoption, Animal
 from utils.response_builder import build_response
 from utils.error_handlers import handle_error
 from utils.jwt_utils import token_required
+from services.catalog_events import record_adoption_write, record_animal_write
+from services.jobs import enqueue
+from utils.pagination import COUNT_MODES, keyset_page, offset_page, parse_per_page
+from utils.projection import parse_fields, parse_include
+from utils.serializers import projection
+
+logger = logging.getLogger(__name__)
 
 adoption_bp = Blueprint("adoptions", __name__, url_prefix="/adoptions")
 
+# Colunas exportadas em /adoptions/export, na ordem do CSV
+EXPORT_FIELDS = (
+    "id", "animal_id", "adopter_name", "adopter_email", "adopter_phone",
+    "address_cep", "address_street", "address_number", "address_complement",
+    "address_neighborhood", "address_city", "address_state", "adoption_message",
+    "status", "created_at", "updated_at"
+)
+EXPORT_CHUNK_SIZE = 1000
+
+def _parse_datetime_arg(name: str):
+    value = request.args.get(name)
+    return datetime.fromisoformat(value) if value else None
+
+def _adoption_filters() -> list:
+    """Cláusulas WHERE a partir de status, animal_id, created_from e created_to.
+
+    Raises:
+        ValueError: se algum parâmetro for inválido
+    """
+    clauses = []
+    status = request.args.get("status")
+    if status:
+        clauses.append(Adoption.status == status)
+    animal_id = request.args.get("animal_id")
+    if animal_id:
+        clauses.append(Adoption.animal_id == int(animal_id))
+    created_from = _parse_datetime_arg("created_from")
+    if created_from:
+        clauses.append(Adoption.created_at >= created_from)
+    created_to = _parse_datetime_arg("created_to")
+    if created_to:
+        clauses.append(Adoption.created_at < created_to)
+    return clauses
+
 @adoption_bp.route("", methods=["GET"])
 def get_all_adoptions():
-    """GET /adoptions - Lista todas as adoções"""
+    """GET /adoptions - Lista paginada de adoções
+
+    Filtros: status, animal_id, created_from/created_to (ISO 8601, intervalo semiaberto).
+    Paginação por offset (page, per_page) ou por cursor (cursor, per_page), como em /animals.
+    `include=animal` embute o animal de cada adoção (carregado no mesmo SELECT);
+    `fields=a,b` restringe as colunas do animal embutido.
+    """
     try:
-        adoptions = Adoption.query.all()
+        try:
+            per_page = parse_per_page(request.args.get("per_page"))
+            page = max(1, int(request.args.get("page", 1)))
+            clauses = _adoption_filters()
+            include = parse_include(request.args.get("include"), ("animal",))
+            animal_fields = parse_fields(request.args.get("fields"), Animal.SERIALIZED_FIELDS)
+        except ValueError as e:
+            return build_response(False, f"Parâmetros inválidos: {e}"), 400
+        count_mode = request.args.get("count", "cached")
+        if count_mode not in COUNT_MODES:
+            return build_response(False, "Parâmetro count inválido"), 400
+
+        # Adoções (e o animal, via JOIN) lidas direto do SELECT, sem objetos do ORM
+        embed = ("animal", Animal, animal_fields) if "animal" in include else None
+        adoption_projection = projection(Adoption, None, embed)
+        query = Adoption.query.filter(*clauses)
+        if embed is not None:
+            query = query.outerjoin(Animal, Adoption.animal_id == Animal.id)
+        query = query.with_entities(*adoption_projection.columns)
+
+        if "cursor" in request.args:
+            try:
+                rows, meta = keyset_page(query, Adoption, request.args.get("cursor"), per_page)
+            except ValueError:
+                return build_response(False, "Cursor inválido"), 400
+        else:
+            filter_keys = ("status", "animal_id", "created_from", "created_to")
+            cache_key = tuple(sorted((k, v) for k, v in request.args.items() if k in filter_keys))
+            rows, meta = offset_page(query, Adoption, page, per_page, "adoptions", cache_key, count_mode)
+        items = adoption_projection.serialize_all(rows)
         return build_response(
             success=True,
             message="Adoções recuperadas com sucesso",
-            data=[adoption.to_dict() for adoption in adoptions]
+            data={"items": items, "meta": meta}
         ), 200
     except Exception as e:
         return handle_error(e, "Erro ao recuperar adoções")
 
+def _export_rows(clauses):
+    """Itera as adoções em lotes de EXPORT_CHUNK_SIZE sem materializar a tabela."""
+    statement = (
+        select(Adoption).where(*clauses)
+        .order_by(Adoption.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+    for adoption in db.session.execute(statement).scalars():
+        yield adoption.to_dict(include_animal=False)
+
+def _ndjson_stream(rows):
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+def _csv_stream(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+@adoption_bp.route("/export", methods=["GET"])
+@token_required(role="ong")
+def export_adoptions():
+    """GET /adoptions/export?format=ndjson|csv - Exporta adoções filtradas em streaming"""
+    try:
+        try:
+            clauses = _adoption_filters()
+        except ValueError as e:
+            return build_response(False, f"Parâmetros inválidos: {e}"), 400
+        export_format = request.args.get("format", "ndjson")
+        if export_format == "ndjson":
+            body, mimetype = _ndjson_stream(_export_rows(clauses)), "application/x-ndjson"
+        elif export_format == "csv":
+            body, mimetype = _csv_stream(_export_rows(clauses)), "text/csv"
+        else:
+            return build_response(False, "Formato inválido. Use ndjson ou csv."), 400
+        filename = f"adocoes.{export_format}"
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    except Exception as e:
+        return handle_error(e, "Erro ao exportar adoções")
+
 @adoption_bp.route("", methods=["POST"])
 def create_adoption():
     """POST /adoptions - Registra uma nova adoção"""
@@ -26,7 +160,7 @@ def create_adoption():
         data = request.get_json() or {}
 
         # Log simples para depuração de erro 500
-        print("[DEBUG] create_adoption payload:", data)
+        logger.debug("create_adoption payload: %s", data)
 
         # Validação básica
         required_fields = [
@@ -64,6 +198,8 @@ def create_adoption():
         )
 
         db.session.add(adoption)
+        db.session.flush()
+        record_adoption_write("create", [adoption.id])
         db.session.commit()
 
         return build_response(
@@ -81,7 +217,7 @@ def update_adoption_status(adoption_id: int):
     """PUT /adoptions/<id>/status - Atualiza status da adoção e marca animal como Adotado se Approved."""
     try:
         data = request.get_json() or {}
-        print(f"[DEBUG] update_adoption_status {adoption_id} payload:", data)
+        logger.debug("update_adoption_status %s payload: %s", adoption_id, data)
         adoption = Adoption.query.get(adoption_id)
         if not adoption:
             return build_response(False, "Adoção não encontrada"), 404
@@ -91,6 +227,12 @@ def update_adoption_status(adoption_id: int):
         adoption.status = new_status
         if new_status == "Approved" and adoption.animal:
             adoption.animal.status = "Adotado"
+            record_animal_write("update", [adoption.animal.id])
+        record_adoption_write("update", [adoption.id])
+        # Efeitos colaterais (ex.: recusar pedidos concorrentes) rodam em segundo plano
+        enqueue("adoptions.status_changed", {
+            "adoption_id": adoption.id, "animal_id": adoption.animal_id, "status": new_status
+        })
         db.session.commit()
         return build_response(True, "Status atualizado", adoption.to_dict()), 200
     except Exception as e:
@@ -109,6 +251,7 @@ def delete_adoption(adoption_id):
             ), 404
 
         db.session.delete(adoption)
+        record_adoption_write("delete", [adoption_id])
         db.session.commit()
 
         return build_response(
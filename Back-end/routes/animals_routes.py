@@ -1,35 +1,129 @@
-from flask import Blueprint, request
+from flask import Blueprint, g, request
+from sqlalchemy import select
 from database.models import db, Animal
+from database.search import text_search_filter
 from utils.response_builder import build_response
 from utils.error_handlers import handle_error
 from utils.jwt_utils import token_required
+from services.animal_import import import_animals, iter_ndjson
+from services.catalog_events import record_animal_write
+from services.change_feed import (
+    DEFAULT_LIMIT as CHANGES_DEFAULT_LIMIT, MAX_LIMIT as CHANGES_MAX_LIMIT, parse_cursor, read_changes
+)
+from services.geocoding import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, geo_values, nearby, resolve_near
+from services.image_store import ImageError, store_data_url
+from utils.http_cache import cached_response
+from utils.pagination import COUNT_MODES, keyset_page, offset_page, parse_per_page
+from utils.projection import parse_fields
+from utils.serializers import projection
 
 animals_bp = Blueprint("animals", __name__, url_prefix="/animals")
 
+# Filtros de igualdade aceitos na listagem (parâmetro de query -> coluna)
+FILTER_FIELDS = {
+    "species": Animal.species,
+    "size": Animal.size,
+    "status": Animal.status,
+    "city": Animal.city,
+}
+
+def _filtered_animals_query():
+    """Monta a query de animais aplicando os filtros da query string."""
+    query = Animal.query
+    for param, column in FILTER_FIELDS.items():
+        value = request.args.get(param)
+        if value:
+            query = query.filter(column == value)
+    search = request.args.get("q", "").strip()
+    if search:
+        clause = text_search_filter(search, db.engine.dialect.name)
+        if clause is not None:
+            query = query.filter(clause)
+    return query
+
 @animals_bp.route("", methods=["GET"])
+@cached_response("animals")
 def get_all_animals():
-    """GET /animals - Lista paginada de animais (page, per_page)"""
+    """GET /animals - Lista de animais com filtros (species, size, status, city, q).
+
+    Paginação por offset (page, per_page) ou por cursor (cursor, per_page).
+    O modo cursor é ativado pela presença do parâmetro `cursor` (vazio na primeira página).
+    `fields=a,b` restringe as colunas retornadas; `count=cached|exact|none` controla o total
+    informado no modo offset. `near=<cep ou cidade>&radius_km=` busca por proximidade,
+    ordenando do mais próximo ao mais distante (paginação por offset).
+    """
     try:
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 10))
-        pagination = Animal.query.order_by(Animal.created_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
-        items = [animal.to_dict() for animal in pagination.items]
-        meta = {
-            "page": page,
-            "per_page": per_page,
-            "total": pagination.total,
-            "pages": pagination.pages
-        }
+        try:
+            per_page = parse_per_page(request.args.get("per_page"))
+            page = max(1, int(request.args.get("page", 1)))
+            fields = parse_fields(request.args.get("fields"), Animal.SERIALIZED_FIELDS)
+            radius_km = float(request.args.get("radius_km", DEFAULT_RADIUS_KM))
+            if not 0 < radius_km <= MAX_RADIUS_KM:
+                raise ValueError(f"radius_km deve estar entre 0 e {MAX_RADIUS_KM:g}")
+        except ValueError as e:
+            return build_response(False, f"Parâmetros inválidos: {e}"), 400
+        near = request.args.get("near", "").strip()
+        if near:
+            if "cursor" in request.args:
+                return build_response(False, "A busca por proximidade não aceita cursor; use page"), 400
+            return _nearby_animals(near, radius_km, page, per_page, fields)
+        count_mode = request.args.get("count", "cached")
+        if count_mode not in COUNT_MODES:
+            return build_response(False, "Parâmetro count inválido"), 400
+
+        # Lê só as colunas pedidas direto do SELECT, sem hidratar objetos Animal
+        animal_projection = projection(Animal, fields)
+        query = _filtered_animals_query().with_entities(*animal_projection.columns)
+
+        if "cursor" in request.args:
+            try:
+                rows, meta = keyset_page(query, Animal, request.args.get("cursor"), per_page)
+            except ValueError:
+                return build_response(False, "Cursor inválido"), 400
+        else:
+            cache_key = tuple(sorted((k, v) for k, v in request.args.items() if k in FILTER_FIELDS or k == "q"))
+            rows, meta = offset_page(query, Animal, page, per_page, "animals", cache_key, count_mode)
+        items = animal_projection.serialize_all(rows)
         return build_response(True, "Animais recuperados com sucesso", {"items": items, "meta": meta}), 200
     except Exception as e:
         return handle_error(e, "Erro ao recuperar animais")
 
+def _nearby_animals(near: str, radius_km: float, page: int, per_page: int, fields):
+    """Página da busca por proximidade, com `distance_km` em cada animal."""
+    center = resolve_near(near)
+    if center is None:
+        return build_response(False, "Localização não encontrada na base local de CEPs/municípios"), 404
+    matches = nearby(_filtered_animals_query(), center, radius_km)
+    page_matches = matches[(page - 1) * per_page:page * per_page]
+    animal_projection = projection(Animal, fields)
+    rows = db.session.execute(
+        select(*animal_projection.columns).where(Animal.id.in_([animal_id for animal_id, _ in page_matches]))
+    )
+    by_id = {row.id: animal_projection.serialize(row) for row in rows}
+    items = [
+        {**by_id[animal_id], "distance_km": distance}
+        for animal_id, distance in page_matches if animal_id in by_id
+    ]
+    meta = {
+        "page": page,
+        "per_page": per_page,
+        "total": len(matches),
+        "pages": -(-len(matches) // per_page),
+        "near": center._asdict(),
+        "radius_km": radius_km,
+    }
+    return build_response(True, "Animais recuperados com sucesso", {"items": items, "meta": meta}), 200
+
 @animals_bp.route("/<int:animal_id>", methods=["GET"])
+@cached_response("animals")
 def get_animal(animal_id):
     """GET /animals/<id> - Retorna um animal específico"""
     try:
-        animal = Animal.query.get(animal_id)
-        if not animal:
+        animal_projection = projection(Animal)
+        row = db.session.execute(
+            select(*animal_projection.columns).where(Animal.id == animal_id)
+        ).first()
+        if not row:
             return build_response(
                 success=False,
                 message="Animal não encontrado"
@@ -37,11 +131,33 @@ def get_animal(animal_id):
         return build_response(
             success=True,
             message="Animal recuperado com sucesso",
-            data=animal.to_dict()
+            data=animal_projection.serialize(row)
         ), 200
     except Exception as e:
         return handle_error(e, "Erro ao recuperar animal")
 
+@animals_bp.route("/changes", methods=["GET"])
+@cached_response("animals")
+def get_animal_changes():
+    """GET /animals/changes?since=<cursor> - Animais criados/alterados/excluídos desde o cursor
+
+    Retorna uma entrada por animal (a mais recente): `upsert` com o animal completo
+    (ou só os campos de `fields=`) ou `delete` (tombstone). Use `cursor` como `since`
+    na próxima chamada enquanto `has_more` for verdadeiro. Com `reset: true` o cursor
+    é antigo demais e a lista deve ser recarregada por completo.
+    """
+    try:
+        try:
+            since = parse_cursor(request.args.get("since"))
+            limit = max(1, min(int(request.args.get("limit", CHANGES_DEFAULT_LIMIT)), CHANGES_MAX_LIMIT))
+            fields = parse_fields(request.args.get("fields"), Animal.SERIALIZED_FIELDS)
+        except ValueError as e:
+            return build_response(False, f"Parâmetros inválidos: {e}"), 400
+        feed = read_changes(since, limit, projection(Animal, fields))
+        return build_response(True, "Alterações recuperadas com sucesso", feed), 200
+    except Exception as e:
+        return handle_error(e, "Erro ao recuperar alterações")
+
 @animals_bp.route("", methods=["POST"])
 @token_required(role="ong")
 def create_animal():
@@ -64,13 +180,18 @@ def create_animal():
             size=data.get("size"),
             temperament=data.get("temperament"),
             city=data.get("city"),
+            **geo_values(data.get("city")),
             status=data.get("status", "Disponível"),
-            image=data.get("image"),
+            # Imagens enviadas inline (data URL) vão para o armazenamento de arquivos
+            image=store_data_url(data.get("image")),
             description=data.get("description"),
-            history=data.get("history")
+            history=data.get("history"),
+            ong_id=g.jwt_claims.get("sub")
         )
         
         db.session.add(animal)
+        db.session.flush()
+        record_animal_write("create", [animal.id])
         db.session.commit()
         
         return build_response(
@@ -78,10 +199,36 @@ def create_animal():
             message="Animal criado com sucesso",
             data=animal.to_dict()
         ), 201
+    except ImageError as e:
+        db.session.rollback()
+        return build_response(False, str(e)), 400
     except Exception as e:
         db.session.rollback()
         return handle_error(e, "Erro ao criar animal")
 
+@animals_bp.route("/bulk", methods=["POST"])
+@token_required(role="ong")
+def bulk_import_animals():
+    """POST /animals/bulk - Cria/atualiza animais em lote
+
+    Corpo: lista JSON de animais ou NDJSON (Content-Type: application/x-ndjson),
+    lido em streaming. Registros com `id` atualizam o animal existente. Responde
+    com as contagens e os erros por linha.
+    """
+    try:
+        if request.mimetype == "application/x-ndjson":
+            records = iter_ndjson(request.stream)
+        else:
+            records = request.get_json(silent=True)
+            if not isinstance(records, list):
+                return build_response(False, "Envie uma lista JSON ou NDJSON de animais"), 400
+        report = import_animals(records, ong_id=g.jwt_claims.get("sub"))
+        message = "Importação concluída" if not report["failed"] else "Importação concluída com erros"
+        return build_response(True, message, report), 200
+    except Exception as e:
+        db.session.rollback()
+        return handle_error(e, "Erro ao importar animais")
+
 @animals_bp.route("/<int:animal_id>", methods=["PUT"])
 @token_required(role="ong")
 def update_animal(animal_id):
@@ -109,15 +256,18 @@ def update_animal(animal_id):
             animal.temperament = data["temperament"]
         if "city" in data:
             animal.city = data["city"]
+            for column, value in geo_values(animal.city).items():
+                setattr(animal, column, value)
         if "status" in data:
             animal.status = data["status"]
         if "image" in data:
-            animal.image = data["image"]
+            animal.image = store_data_url(data["image"])
         if "description" in data:
             animal.description = data["description"]
         if "history" in data:
             animal.history = data["history"]
         
+        record_animal_write("update", [animal.id])
         db.session.commit()
         
         return build_response(
@@ -125,6 +275,9 @@ def update_animal(animal_id):
             message="Animal atualizado com sucesso",
             data=animal.to_dict()
         ), 200
+    except ImageError as e:
+        db.session.rollback()
+        return build_response(False, str(e)), 400
     except Exception as e:
         db.session.rollback()
         return handle_error(e, "Erro ao atualizar animal")
@@ -142,6 +295,7 @@ def delete_animal(animal_id):
             ), 404
         
         db.session.delete(animal)
+        record_animal_write("delete", [animal_id])
         db.session.commit()
         
         return build_response(
@@ -1,8 +1,13 @@
-from flask import Blueprint, request, g
+from flask import Blueprint, request
 from database.models import db, User
 from utils.response_builder import build_response
 from utils.error_handlers import handle_error
-from utils.jwt_utils import generate_token, token_required
+from utils.jwt_utils import generate_token, get_current_user, token_required
+from utils.password_hashing import HashingBusyError
+
+def _busy_response():
+    """503 com Retry-After quando a fila de hash de senha está cheia."""
+    return build_response(False, "Servidor ocupado, tente novamente em instantes"), 503, {"Retry-After": "1"}
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -34,6 +39,9 @@ def register():
         token = generate_token(user)
         user_data = user.to_dict() | {"token": token}
         return build_response(True, "Usuário registrado com sucesso", user_data), 201
+    except HashingBusyError:
+        db.session.rollback()
+        return _busy_response()
     except Exception as e:
         db.session.rollback()
         return handle_error(e, "Erro ao registrar usuário")
@@ -54,9 +62,17 @@ def login():
         if not user or not user.check_password(password):
             return build_response(False, "Credenciais inválidas"), 401
 
+        # Atualiza hashes gerados com algoritmo/custo antigos
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
         token = generate_token(user)
         user_data = user.to_dict() | {"token": token}
         return build_response(True, "Login realizado com sucesso", user_data), 200
+    except HashingBusyError:
+        db.session.rollback()
+        return _busy_response()
     except Exception as e:
         return handle_error(e, "Erro ao realizar login")
 
@@ -64,7 +80,7 @@ def login():
 @token_required()
 def me():
     """GET /auth/me - Retorna dados do usuário autenticado."""
-    user = getattr(g, "current_user", None)
+    user = get_current_user()
     if not user:
         return build_response(False, "Usuário não autenticado"), 401
     return build_response(True, "Usuário autenticado", user.to_dict()), 200
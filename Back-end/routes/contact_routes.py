@@ -1,8 +1,13 @@
 from flask import Blueprint, request
 from database.models import db, Contact, Feedback
+from services.write_behind import QueueFullError, queue_stats, submit
 from utils.response_builder import build_response
 from utils.error_handlers import handle_error
 
+def _busy_response():
+    """503 com Retry-After quando a fila write-behind está cheia."""
+    return build_response(False, "Servidor ocupado, tente novamente em instantes"), 503, {"Retry-After": "1"}
+
 contact_bp = Blueprint("contact", __name__, url_prefix="/contact")
 
 @contact_bp.route("", methods=["POST"])
@@ -18,25 +23,34 @@ def create_contact():
                 message="Campos obrigatórios faltando"
             ), 400
         
-        contact = Contact(
-            name=data.get("name"),
-            email=data.get("email"),
-            subject=data.get("subject"),
-            message=data.get("message")
-        )
-        
-        db.session.add(contact)
-        db.session.commit()
+        # Gravado em lote pela fila write-behind (202) ou direto, se desativada (201)
+        contact, queued = submit(Contact, {
+            "name": data.get("name"),
+            "email": data.get("email"),
+            "subject": data.get("subject"),
+            "message": data.get("message")
+        })
         
         return build_response(
             success=True,
             message="Mensagem de contato recebida com sucesso",
-            data=contact.to_dict()
-        ), 201
+            data=contact
+        ), 202 if queued else 201
+    except QueueFullError:
+        return _busy_response()
     except Exception as e:
         db.session.rollback()
         return handle_error(e, "Erro ao receber mensagem de contato")
 
+@contact_bp.route("/queue/metrics", methods=["GET"])
+def get_write_queue_metrics():
+    """GET /contact/queue/metrics - Métricas da fila write-behind de contato/feedback"""
+    return build_response(
+        success=True,
+        message="Métricas da fila de gravação",
+        data=queue_stats()
+    ), 200
+
 feedback_bp = Blueprint("feedback", __name__, url_prefix="/feedback")
 
 @feedback_bp.route("", methods=["POST"])
@@ -51,18 +65,15 @@ def create_feedback():
                 message="Mensagem não pode estar vazia"
             ), 400
         
-        feedback = Feedback(
-            mensagem=data.get("mensagem")
-        )
-        
-        db.session.add(feedback)
-        db.session.commit()
+        feedback, queued = submit(Feedback, {"mensagem": data.get("mensagem")})
         
         return build_response(
             success=True,
             message="Feedback recebido com sucesso",
-            data=feedback.to_dict()
-        ), 201
+            data=feedback
+        ), 202 if queued else 201
+    except QueueFullError:
+        return _busy_response()
     except Exception as e:
         db.session.rollback()
         return handle_error(e, "Erro ao receber feedback")
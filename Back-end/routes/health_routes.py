@@ -0,0 +1,30 @@
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+from database.models import db
+from database.migrations import current_version, latest_version
+
+health_bp = Blueprint("health", __name__)
+
+@health_bp.route("/health", methods=["GET"])
+def health_check():
+    """GET /health - Liveness: o processo está respondendo (não consulta o banco)"""
+    return jsonify({"status": "ok", "message": "Server is running"}), 200
+
+@health_bp.route("/ready", methods=["GET"])
+def readiness_check():
+    """GET /ready - Readiness: banco acessível e schema na última versão (503 caso contrário)"""
+    checks = {}
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            version = current_version(conn)
+        checks["database"] = "ok"
+        latest = latest_version()
+        checks["schema"] = "ok" if version >= latest else f"versão {version}, esperado {latest}"
+    except Exception as e:
+        checks["database"] = f"erro: {e.__class__.__name__}"
+    ready = all(value == "ok" for value in checks.values()) and "schema" in checks
+    body = jsonify({"status": "ready" if ready else "unavailable", "checks": checks})
+    if ready:
+        return body, 200
+    return body, 503, {"Retry-After": "5"}
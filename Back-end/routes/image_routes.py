@@ -0,0 +1,54 @@
+from flask import Blueprint, current_app, request, send_file
+from database.models import db
+from services.image_store import ImageError, find_image, store_image
+from utils.response_builder import build_response
+from utils.error_handlers import handle_error
+from utils.jwt_utils import token_required
+
+images_bp = Blueprint("images", __name__, url_prefix="/images")
+
+# O conteúdo de um hash nunca muda: o navegador/CDN pode guardar por um ano sem revalidar
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# Variante ainda não gerada (serve o original): cache curto para buscar a miniatura depois
+FALLBACK_MAX_AGE = 60
+
+@images_bp.route("", methods=["POST"])
+@token_required(role="ong")
+def upload_image():
+    """POST /images - Envia uma imagem (multipart, campo `file`) e retorna a URL curta"""
+    try:
+        upload = request.files.get("file")
+        if upload is None:
+            return build_response(False, "Envie a imagem no campo 'file' (multipart/form-data)"), 400
+        url = store_image(upload.stream)
+        db.session.commit()  # grava a tarefa das miniaturas agendada por store_image
+        variants = {name: f"{url}/{name}" for name in current_app.config.get("IMAGE_VARIANTS", {})}
+        return build_response(True, "Imagem enviada com sucesso", {"url": url, "variants": variants}), 201
+    except ImageError as e:
+        db.session.rollback()
+        return build_response(False, str(e)), 400
+    except Exception as e:
+        db.session.rollback()
+        return handle_error(e, "Erro ao enviar imagem")
+
+@images_bp.route("/<digest>", methods=["GET"])
+@images_bp.route("/<digest>/<variant>", methods=["GET"])
+def get_image(digest, variant=None):
+    """GET /images/<hash>[/<variante>] - Serve a imagem (ou miniatura WebP) em streaming"""
+    if variant is not None and variant not in current_app.config.get("IMAGE_VARIANTS", {}):
+        return build_response(False, "Variante de imagem desconhecida"), 404
+    found = find_image(digest, variant)
+    if found is None:
+        return build_response(False, "Imagem não encontrada"), 404
+    path, mimetype, exact = found
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        conditional=True,
+        etag=f"{digest}.{variant}" if variant and exact else digest,
+        max_age=IMMUTABLE_MAX_AGE if exact else FALLBACK_MAX_AGE,
+    )
+    response.cache_control.public = True
+    if exact:
+        response.cache_control.immutable = True
+    return response
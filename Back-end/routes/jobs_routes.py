@@ -0,0 +1,34 @@
+from flask import Blueprint, request
+from database.models import Job
+from services.jobs import JOB_STATUSES, queue_stats
+from utils.response_builder import build_response
+from utils.error_handlers import handle_error
+from utils.jwt_utils import token_required
+from utils.pagination import parse_per_page
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+@jobs_bp.route("/stats", methods=["GET"])
+@token_required(role="ong")
+def get_job_stats():
+    """GET /jobs/stats - Profundidade da fila e latência das tarefas em segundo plano"""
+    try:
+        return build_response(True, "Métricas da fila de tarefas", queue_stats()), 200
+    except Exception as e:
+        return handle_error(e, "Erro ao recuperar métricas da fila")
+
+@jobs_bp.route("", methods=["GET"])
+@token_required(role="ong")
+def get_jobs():
+    """GET /jobs?status=failed - Tarefas mais recentes, opcionalmente filtradas por status"""
+    try:
+        status = request.args.get("status")
+        if status and status not in JOB_STATUSES:
+            return build_response(False, "Status inválido"), 400
+        query = Job.query
+        if status:
+            query = query.filter(Job.status == status)
+        jobs = query.order_by(Job.id.desc()).limit(parse_per_page(request.args.get("per_page"))).all()
+        return build_response(True, "Tarefas recuperadas com sucesso", [job.to_dict() for job in jobs]), 200
+    except Exception as e:
+        return handle_error(e, "Erro ao recuperar tarefas")
@@ -0,0 +1,36 @@
+from flask import Blueprint, g, request
+from services.stats import GLOBAL_SCOPE, ong_scope, read_stats
+from utils.response_builder import build_response
+from utils.error_handlers import handle_error
+from utils.jwt_utils import token_required
+
+stats_bp = Blueprint("stats", __name__, url_prefix="/stats")
+
+MAX_DAYS = 365
+MAX_CITIES = 100
+
+def _stats_response(scope: str):
+    try:
+        days = int(request.args.get("days", 30))
+        cities = int(request.args.get("cities", 20))
+    except ValueError:
+        return build_response(False, "Parâmetros days/cities devem ser inteiros"), 400
+    if not 1 <= days <= MAX_DAYS:
+        return build_response(False, f"days deve estar entre 1 e {MAX_DAYS}"), 400
+    if not 1 <= cities <= MAX_CITIES:
+        return build_response(False, f"cities deve estar entre 1 e {MAX_CITIES}"), 400
+    try:
+        return build_response(True, "Estatísticas recuperadas", read_stats(scope, days, cities)), 200
+    except Exception as e:
+        return handle_error(e, "Erro ao recuperar estatísticas")
+
+@stats_bp.route("", methods=["GET"])
+def get_stats():
+    """GET /stats?days=30&cities=20 - Animais por status/espécie/porte/cidade e funil de adoções"""
+    return _stats_response(GLOBAL_SCOPE)
+
+@stats_bp.route("/mine", methods=["GET"])
+@token_required(role="ong")
+def get_my_stats():
+    """GET /stats/mine - As mesmas estatísticas, só dos animais cadastrados pela ONG do token"""
+    return _stats_response(ong_scope(g.jwt_claims["sub"]))
@@ -1,16 +1,254 @@
-import requests
+import asyncio
+import json
 import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # dependência opcional do modo ASGI (requirements-async.txt)
+    httpx = None
+
+from database.models import db, CepAddress, CepCacheEntry
+from database.upsert import upsert
+from utils.cache import TTLCache
+from utils.metrics import record_external_call, register_collector
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_VIACEP_BASE_URL = "https://viacep.com.br/ws"
+
 class AddressServiceError(Exception):
     """Exceção para erros no serviço de endereço"""
     pass
 
+# Cache em memória (1º nível): cep -> endereço formatado, ou None para CEP inexistente
+_memory_cache: TTLCache | None = None
+_memory_cache_lock = threading.Lock()
+_MISS = object()
+
+# Sessão HTTP com pool de conexões keep-alive, recriada após fork
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+# Consultas remotas em andamento, para coalescer misses concorrentes do mesmo CEP
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "memory_hits": 0,
+    "local_hits": 0,
+    "db_hits": 0,
+    "negative_hits": 0,
+    "remote_fetches": 0,
+    "coalesced": 0,
+    "remote_errors": 0,
+}
+
+
+def _count(metric: str) -> None:
+    with _metrics_lock:
+        _metrics[metric] += 1
+
+
+def get_cache_metrics() -> dict:
+    """Retorna contadores de acerto/falha dos caches de CEP."""
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics["memory_size"] = len(_memory_cache) if _memory_cache is not None else 0
+    return metrics
+
+
+@register_collector(counters={f"cep_cache_{name}" for name in _metrics})
+def _cache_metrics_for_prometheus() -> dict:
+    return {f"cep_cache_{name}": value for name, value in get_cache_metrics().items()}
+
+
+def _get_memory_cache() -> TTLCache:
+    global _memory_cache
+    if _memory_cache is None:
+        with _memory_cache_lock:
+            if _memory_cache is None:
+                _memory_cache = TTLCache(
+                    maxsize=current_app.config.get("CEP_CACHE_MAXSIZE", 10000),
+                    ttl=current_app.config.get("CEP_CACHE_TTL", 30 * 24 * 3600)
+                )
+    return _memory_cache
+
+
+def _get_session() -> requests.Session:
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                pool_size = current_app.config.get("VIACEP_POOL_SIZE", 10)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["Accept"] = "application/json"
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def _format_address(data: dict) -> dict:
+    return {
+        "cep": data.get("cep", ""),
+        "street": data.get("logradouro", ""),
+        "neighborhood": data.get("bairro", ""),
+        "city": data.get("localidade", ""),
+        "state": data.get("uf", ""),
+        "region": data.get("regiao", "")
+    }
+
+
+def _fetch_remote(cep: str) -> dict | None:
+    """Consulta o ViaCEP. Retorna None se o CEP não existir."""
+    base_url = current_app.config.get("VIACEP_BASE_URL", DEFAULT_VIACEP_BASE_URL).rstrip("/")
+    timeout = current_app.config.get("VIACEP_TIMEOUT", 5)
+    _count("remote_fetches")
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = _get_session().get(f"{base_url}/{cep}/json/", timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        outcome = "not_found" if data.get("erro") else "ok"
+    finally:
+        record_external_call("viacep", time.perf_counter() - started, outcome)
+    if data.get("erro"):
+        return None
+    return _format_address(data)
+
+
+def _read_local_index(cep: str) -> dict | None:
+    """Consulta a base local importada de um dataset (`flask cep import`)."""
+    table = CepAddress.__table__
+    with db.engine.connect() as conn:
+        row = conn.execute(table.select().where(table.c.cep == cep)).first()
+    return CepAddress(**row._mapping).to_dict() if row is not None else None
+
+
+def _read_shared_cache(cep: str):
+    """Lê o cache persistente (2º nível). Retorna _MISS se ausente ou expirado."""
+    table = CepCacheEntry.__table__
+    with db.engine.connect() as conn:
+        row = conn.execute(
+            table.select().where(table.c.cep == cep, table.c.expires_at > datetime.utcnow())
+        ).first()
+    if row is None:
+        return _MISS
+    return json.loads(row.payload) if row.found else None
+
+
+def _write_shared_cache(cep: str, address: dict | None, ttl: float) -> None:
+    row = {
+        "cep": cep,
+        "found": address is not None,
+        "payload": json.dumps(address) if address is not None else None,
+        "expires_at": datetime.utcnow() + timedelta(seconds=ttl),
+    }
+    with db.engine.begin() as conn:
+        upsert(conn, CepCacheEntry.__table__, [row], ["cep"])
+
+
+def _ttl_for(address: dict | None) -> float:
+    if address is None:
+        return current_app.config.get("CEP_NEGATIVE_CACHE_TTL", 24 * 3600)
+    return current_app.config.get("CEP_CACHE_TTL", 30 * 24 * 3600)
+
+
+def _load_stored(cep: str):
+    """Consulta os níveis em banco: base local e cache persistente.
+
+    Retorna o endereço, None (CEP inexistente) ou _MISS se for preciso consultar o ViaCEP.
+    """
+    memory_cache = _get_memory_cache()
+    address = _read_local_index(cep)
+    if address is not None:
+        _count("local_hits")
+        memory_cache.set(cep, address)
+        return address
+    if current_app.config.get("CEP_LOCAL_ONLY"):
+        return None
+
+    address = _read_shared_cache(cep)
+    if address is not _MISS:
+        _count("db_hits")
+        memory_cache.set(cep, address, ttl=_ttl_for(address))
+    return address
+
+
+def _remember(cep: str, address: dict | None) -> None:
+    """Grava o resultado de uma consulta remota nos caches em memória e persistente."""
+    ttl = _ttl_for(address)
+    _get_memory_cache().set(cep, address, ttl=ttl)
+    try:
+        _write_shared_cache(cep, address, ttl)
+    except Exception as e:
+        # O cache persistente é uma otimização; falhar nele não invalida a resposta
+        logger.warning(f"Falha ao gravar CEP {cep} no cache persistente: {str(e)}")
+
+
+def _load_address(cep: str) -> dict | None:
+    """Resolve um miss do cache em memória: base local, cache persistente e, por fim, ViaCEP."""
+    address = _load_stored(cep)
+    if address is _MISS:
+        address = _fetch_remote(cep)
+        _remember(cep, address)
+    return address
+
+
+class _InflightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Exception | None = None
+
+
+def _load_coalesced(cep: str) -> dict | None:
+    """Garante uma única consulta por CEP mesmo com várias requisições simultâneas."""
+    with _inflight_lock:
+        call = _inflight.get(cep)
+        leader = call is None
+        if leader:
+            call = _inflight[cep] = _InflightCall()
+
+    if not leader:
+        _count("coalesced")
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _load_address(cep)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(cep, None)
+        call.done.set()
+
+
 def search_address_by_cep(cep: str) -> dict:
     """
     Busca endereço usando a API ViaCEP
     
+    Consulta, em ordem: cache em memória (LRU com TTL), base local de CEPs,
+    cache persistente no banco e a API ViaCEP. CEPs inexistentes também são
+    cacheados (cache negativo). Com CEP_LOCAL_ONLY a API externa não é usada.
+    
     Args:
         cep: CEP em formato de string (sem caracteres especiais)
     
@@ -25,32 +263,111 @@ def search_address_by_cep(cep: str) -> dict:
         if not isinstance(cep, str) or len(cep) != 8 or not cep.isdigit():
             raise AddressServiceError("CEP inválido")
         
-        # Monta URL da API ViaCEP
-        url = f"https://viacep.com.br/ws/{cep}/json/"
-        
-        # Faz requisição com timeout
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Verifica se CEP foi encontrado
-        if data.get("erro"):
-            return None
+        address = _get_memory_cache().get(cep, _MISS)
+        if address is not _MISS:
+            _count("memory_hits" if address is not None else "negative_hits")
+            return address
         
-        # Retorna dados formatados
-        return {
-            "cep": data.get("cep", ""),
-            "street": data.get("logradouro", ""),
-            "neighborhood": data.get("bairro", ""),
-            "city": data.get("localidade", ""),
-            "state": data.get("uf", ""),
-            "region": data.get("regiao", "")
-        }
+        return _load_coalesced(cep)
     
+    except AddressServiceError:
+        raise
     except requests.exceptions.RequestException as e:
+        _count("remote_errors")
         logger.error(f"Erro ao buscar CEP {cep}: {str(e)}")
         raise AddressServiceError(f"Erro ao conectar com API de CEP: {str(e)}")
     except Exception as e:
         logger.error(f"Erro desconhecido ao buscar CEP {cep}: {str(e)}")
         raise AddressServiceError(f"Erro ao processar CEP: {str(e)}")
+
+
+def find_stored_address(cep: str) -> dict | None:
+    """Endereço do CEP sem consultar o ViaCEP: cache em memória, base local e cache persistente."""
+    address = _get_memory_cache().get(cep, _MISS)
+    if address is not _MISS:
+        return address
+    address = _read_local_index(cep)
+    if address is None:
+        address = _read_shared_cache(cep)
+    return None if address is _MISS else address
+
+
+# Consultas remotas em andamento no caminho assíncrono (um event loop por processo)
+_async_inflight: dict = {}
+
+
+async def _fetch_remote_async(cep: str, client) -> dict | None:
+    base_url = current_app.config.get("VIACEP_BASE_URL", DEFAULT_VIACEP_BASE_URL).rstrip("/")
+    timeout = current_app.config.get("VIACEP_TIMEOUT", 5)
+    _count("remote_fetches")
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await client.get(f"{base_url}/{cep}/json/", timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        outcome = "not_found" if data.get("erro") else "ok"
+    finally:
+        record_external_call("viacep", time.perf_counter() - started, outcome)
+    if data.get("erro"):
+        return None
+    return _format_address(data)
+
+
+async def _load_address_async(cep: str, client) -> dict | None:
+    address = await asyncio.to_thread(_load_stored, cep)
+    if address is _MISS:
+        address = await _fetch_remote_async(cep, client)
+        await asyncio.to_thread(_remember, cep, address)
+    return address
+
+
+async def search_address_by_cep_async(cep: str, client) -> dict:
+    """
+    Versão não bloqueante de `search_address_by_cep` para o modo ASGI
+    
+    Usa os mesmos caches; os níveis em banco rodam em uma thread auxiliar e a
+    consulta ao ViaCEP usa o `httpx.AsyncClient` recebido. Deve ser chamada
+    dentro de um app context.
+    
+    Raises:
+        AddressServiceError: Se houver erro na requisição
+    """
+    if not isinstance(cep, str) or len(cep) != 8 or not cep.isdigit():
+        raise AddressServiceError("CEP inválido")
+
+    address = _get_memory_cache().get(cep, _MISS)
+    if address is not _MISS:
+        _count("memory_hits" if address is not None else "negative_hits")
+        return address
+
+    future = _async_inflight.get(cep)
+    if future is not None:
+        _count("coalesced")
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _async_inflight[cep] = future
+    try:
+        address = await _load_address_async(cep, client)
+        future.set_result(address)
+        return address
+    except httpx.HTTPError as e:
+        _count("remote_errors")
+        logger.error(f"Erro ao buscar CEP {cep}: {str(e)}")
+        error = AddressServiceError(f"Erro ao conectar com API de CEP: {str(e)}")
+        future.set_exception(error)
+        raise error
+    except Exception as e:
+        logger.error(f"Erro desconhecido ao buscar CEP {cep}: {str(e)}")
+        error = AddressServiceError(f"Erro ao processar CEP: {str(e)}")
+        future.set_exception(error)
+        raise error
+    finally:
+        _async_inflight.pop(cep, None)
+        if not future.done():
+            # Requisição líder cancelada (cliente desconectou): libera quem aguardava
+            future.cancel()
+        # Evita o aviso "exception was never retrieved" quando ninguém aguardava
+        if future.done() and not future.cancelled():
+            future.exception()
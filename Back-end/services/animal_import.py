@@ -0,0 +1,197 @@
+"""
+Importação em lote de animais (POST /animals/bulk e `flask animals import`)
+Valida os registros em lotes e grava cada lote em uma transação, com um
+INSERT/UPDATE executemany em vez de um commit por animal. Registros inválidos
+não interrompem a importação: são devolvidos com o número da linha e os erros.
+"""
+
+import csv
+import json
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from database.models import db, Animal
+from services.catalog_events import record_animal_write
+from services.geocoding import geo_values
+from services.image_store import DATA_URL_PATTERN, ImageError, store_data_url
+from services.stats import animal_counted_values, record_animals_created, record_animals_updated
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+# Quantos erros por linha são devolvidos no relatório (o total é sempre contado)
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_FIELDS = ("name", "species", "age", "size", "temperament", "city", "description", "history")
+OPTIONAL_FIELDS = ("status", "image")
+STATUSES = ("Disponível", "Adotado")
+
+
+class AnimalImportError(Exception):
+    """Exceção para arquivos/corpos de importação inválidos"""
+    pass
+
+
+def iter_ndjson(lines: Iterable) -> Iterator:
+    """Itera um NDJSON; linhas inválidas viram a exceção de parse (reportada por linha)."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield e
+
+
+def read_animal_file(path: str, file_format: str) -> Iterator:
+    """Itera os registros de um arquivo CSV, JSON (lista) ou NDJSON."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            for row in csv.DictReader(f):
+                # Células vazias do CSV equivalem a campos ausentes
+                yield {key: value for key, value in row.items() if value not in (None, "")}
+        elif file_format == "ndjson":
+            yield from iter_ndjson(f)
+        elif file_format == "json":
+            data = json.load(f)
+            if not isinstance(data, list):
+                raise AnimalImportError("O JSON deve conter uma lista de animais")
+            yield from data
+        else:
+            raise AnimalImportError(f"Formato não suportado: {file_format}")
+
+
+def _max_length(field: str) -> int | None:
+    return getattr(Animal.__table__.c[field].type, "length", None)
+
+
+def validate_record(record) -> tuple[dict | None, list[str]]:
+    """Valida um registro e devolve (valores para o banco, erros).
+
+    Registros com `id` atualizam o animal existente e só precisam dos campos alterados.
+    """
+    if isinstance(record, json.JSONDecodeError):
+        return None, [f"JSON inválido: {record.msg}"]
+    if not isinstance(record, dict):
+        return None, ["O registro deve ser um objeto"]
+
+    errors = []
+    values = {}
+    animal_id = record.get("id")
+    if animal_id is not None:
+        if isinstance(animal_id, bool) or not str(animal_id).isdigit():
+            return None, ["id inválido"]
+        values["id"] = int(animal_id)
+    else:
+        missing = [f for f in REQUIRED_FIELDS if record.get(f) in (None, "")]
+        if missing:
+            errors.append(f"Campos obrigatórios faltando: {', '.join(missing)}")
+
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        if field not in record or record[field] is None:
+            continue
+        value = record[field]
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            errors.append(f"{field}: valor inválido")
+            continue
+        value = str(value).strip()
+        max_length = _max_length(field)
+        # Imagem inline: o limite vale para a URL gravada, verificada abaixo
+        inline_image = field == "image" and DATA_URL_PATTERN.match(value)
+        if max_length and len(value) > max_length and not inline_image:
+            errors.append(f"{field}: máximo de {max_length} caracteres")
+        values[field] = value
+    if values.get("status") is not None and values["status"] not in STATUSES:
+        errors.append(f"status deve ser um de: {', '.join(STATUSES)}")
+    if errors:
+        return None, errors
+    if values.get("image"):
+        # Só depois das demais validações: um registro rejeitado não grava arquivo nem tarefa
+        try:
+            values["image"] = store_data_url(values["image"])
+        except ImageError as e:
+            return None, [f"image: {e}"]
+        max_length = _max_length("image")
+        if max_length and len(values["image"]) > max_length:
+            return None, [f"image: máximo de {max_length} caracteres"]
+    if "city" in values:
+        values.update(geo_values(values["city"]))
+    if "id" not in values:
+        values.setdefault("status", "Disponível")
+    return values, []
+
+
+def _existing_ids(ids: list) -> set:
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(Animal.id).where(Animal.id.in_(ids))))
+
+
+def import_animals(records: Iterable, batch_size: int = DEFAULT_BATCH_SIZE, ong_id: int | None = None) -> dict:
+    """Valida e grava os registros em lotes (um executemany + commit por lote).
+
+    Animais criados ficam associados à ONG `ong_id` (quem importou), se informada.
+
+    Returns:
+        dict com `created`, `updated`, `failed` e `errors` ([{row, errors}], linhas a partir de 1)
+    """
+    report = {"created": 0, "updated": 0, "failed": 0, "errors": []}
+
+    def fail(row_number: int, messages: list) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "errors": messages})
+
+    records = iter(records)
+    row_number = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        inserts, updates = [], []
+        for record in batch:
+            row_number += 1
+            values, errors = validate_record(record)
+            if errors:
+                fail(row_number, errors)
+            elif "id" in values:
+                updates.append((row_number, values))
+            else:
+                inserts.append((row_number, values))
+
+        existing = _existing_ids([values["id"] for _, values in updates])
+        for number, values in [u for u in updates if u[1]["id"] not in existing]:
+            fail(number, ["Animal não encontrado"])
+        updates = [u for u in updates if u[1]["id"] in existing]
+
+        try:
+            now = datetime.utcnow()
+            if inserts:
+                rows = [dict(values, ong_id=ong_id, created_at=now, updated_at=now) for _, values in inserts]
+                created_ids = db.session.scalars(insert(Animal).returning(Animal.id), rows).all()
+                record_animals_created(rows)
+                record_animal_write("create", created_ids)
+            if updates:
+                before = animal_counted_values([values["id"] for _, values in updates])
+                old_rows = [before[values["id"]] for _, values in updates]
+                db.session.execute(update(Animal), [dict(values, updated_at=now) for _, values in updates])
+                record_animals_updated(old_rows, [{**old, **values} for old, (_, values) in zip(old_rows, updates)])
+                record_animal_write("update", [values["id"] for _, values in updates])
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.exception("Falha ao gravar lote de animais")
+            for number, _ in inserts + updates:
+                fail(number, [f"Erro ao gravar o lote: {e.__class__.__name__}"])
+            continue
+        report["created"] += len(inserts)
+        report["updated"] += len(updates)
+        logger.info(f"{report['created']} animais criados, {report['updated']} atualizados")
+    return report
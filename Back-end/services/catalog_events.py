@@ -0,0 +1,90 @@
+"""
+Efeitos colaterais das escritas no catálogo
+As rotas de escrita chamam `record_*_write` antes do commit: o que precisa ser
+transacional (versão do recurso) é gravado na mesma transação, e o que é local
+ao processo (caches) é invalidado só depois que o commit acontece.
+"""
+
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from database.models import db, Adoption, Animal, ResourceVersion, User
+from services.change_feed import append_changes
+from services.events import CATALOG_TOPIC, ong_topic, queue_event, user_topic
+from utils.http_cache import invalidate_responses
+from utils.pagination import invalidate_counts
+
+_PENDING_KEY = "catalog_pending_invalidations"
+# Acima disso o evento SSE de animais leva só a contagem (o cliente sincroniza pelo /animals/changes)
+MAX_EVENT_IDS = 100
+
+
+def bump_resource_version(session, name: str) -> None:
+    """Incrementa a versão do recurso na transação da sessão."""
+    now = datetime.utcnow()
+    result = session.execute(
+        update(ResourceVersion)
+        .where(ResourceVersion.name == name)
+        .values(version=ResourceVersion.version + 1, updated_at=now)
+    )
+    if not result.rowcount:
+        session.add(ResourceVersion(name=name, version=1, updated_at=now))
+        session.flush()
+
+
+def _invalidate_after_commit(*namespaces: str) -> None:
+    db.session.info.setdefault(_PENDING_KEY, set()).update(namespaces)
+
+
+def record_animal_write(op: str, animal_ids: Iterable[int]) -> None:
+    """Registra uma escrita em animais (op: create, update ou delete)."""
+    animal_ids = list(animal_ids)
+    bump_resource_version(db.session, "animals")
+    # Depois do incremento acima: a ordem dos seq acompanha a dos commits (ver change_feed)
+    append_changes(db.session, op, animal_ids)
+    namespaces = ("animals", "adoptions") if op == "delete" else ("animals",)
+    _invalidate_after_commit(*namespaces)
+    ids = animal_ids if len(animal_ids) <= MAX_EVENT_IDS else None
+    queue_event(db.session, (CATALOG_TOPIC,), "animals", {"op": op, "ids": ids, "count": len(animal_ids)})
+
+
+def record_adoption_write(op: str, adoption_ids: Iterable[int]) -> None:
+    """Registra uma escrita em adoções (op: create, update ou delete)."""
+    _invalidate_after_commit("adoptions")
+    adoption_ids = list(adoption_ids)
+    if not adoption_ids:
+        return
+    # Destinatários: a ONG dona do animal e o usuário adotante com o e-mail do pedido
+    query = (
+        select(Adoption.id, Adoption.animal_id, Adoption.status, Animal.ong_id, User.id)
+        .join(Animal, Adoption.animal_id == Animal.id)
+        .outerjoin(User, (User.email == Adoption.adopter_email) & (User.role == "adotante"))
+        .where(Adoption.id.in_(adoption_ids))
+    )
+    if op == "delete":
+        # Lê a adoção antes que o flush da exclusão pendente a remova
+        with db.session.no_autoflush:
+            rows = db.session.execute(query).all()
+    else:
+        rows = db.session.execute(query).all()
+    for adoption_id, animal_id, status, ong_id, user_id in rows:
+        topics = [ong_topic(ong_id)] if ong_id is not None else []
+        if user_id is not None:
+            topics.append(user_topic(user_id))
+        data = {"op": op, "id": adoption_id, "animal_id": animal_id, "status": status}
+        queue_event(db.session, topics, "adoption", data)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending_invalidations(session):
+    for namespace in session.info.pop(_PENDING_KEY, ()):
+        invalidate_counts(namespace)
+        invalidate_responses(namespace)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
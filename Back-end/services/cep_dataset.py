@@ -0,0 +1,104 @@
+"""
+Importação de datasets de CEP para a base local (`cep_addresses`)
+Aceita CSV, JSON (lista de objetos) ou NDJSON, com colunas no formato do
+ViaCEP (logradouro, bairro, localidade, uf, regiao) ou em inglês.
+"""
+
+import csv
+import json
+import logging
+from itertools import islice
+from typing import Iterable, Iterator
+
+from database.models import db, CepAddress
+from database.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Nome da coluna no dataset -> coluna em cep_addresses
+COLUMN_ALIASES = {
+    "cep": "cep",
+    "logradouro": "street", "street": "street",
+    "bairro": "neighborhood", "neighborhood": "neighborhood",
+    "localidade": "city", "cidade": "city", "city": "city",
+    "uf": "state", "estado": "state", "state": "state",
+    "regiao": "region", "region": "region",
+}
+
+
+class CepDatasetError(Exception):
+    """Exceção para arquivos de dataset de CEP inválidos"""
+    pass
+
+
+def detect_format(path: str) -> str:
+    lowered = path.lower()
+    for extension in ("csv", "ndjson", "jsonl", "json"):
+        if lowered.endswith(f".{extension}"):
+            return "ndjson" if extension == "jsonl" else extension
+    raise CepDatasetError("Não foi possível detectar o formato; use --format")
+
+
+def read_records(path: str, file_format: str) -> Iterator[dict]:
+    """Itera os registros brutos do arquivo sem carregá-lo inteiro (exceto JSON em lista)."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        elif file_format == "ndjson":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif file_format == "json":
+            data = json.load(f)
+            if not isinstance(data, list):
+                raise CepDatasetError("O JSON deve conter uma lista de endereços")
+            yield from data
+        else:
+            raise CepDatasetError(f"Formato não suportado: {file_format}")
+
+
+def normalize_record(record: dict) -> dict | None:
+    """Converte um registro do dataset em linha de `cep_addresses` (None se inválido)."""
+    row = {"street": "", "neighborhood": "", "region": ""}
+    for key, value in record.items():
+        column = COLUMN_ALIASES.get((key or "").strip().lower())
+        if column == "cep" and isinstance(value, int):
+            row[column] = f"{value:08d}"  # CEP numérico em JSON perde os zeros à esquerda
+        elif column:
+            # Colunas NOT NULL: ausente vira "", números viram texto
+            row[column] = "" if value is None else str(value).strip()
+    cep = "".join(ch for ch in row.get("cep", "") if ch.isdigit())
+    if len(cep) != 8 or not row.get("city") or not row.get("state"):
+        return None
+    row["cep"] = cep
+    row["state"] = row["state"].upper()[:2]
+    return row
+
+
+def import_records(records: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Grava os registros em lotes (um executemany + commit por lote).
+
+    Returns:
+        dict com `imported` e `skipped`
+    """
+    table = CepAddress.__table__
+    imported = skipped = 0
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        rows = {}
+        for record in batch:
+            row = normalize_record(record)
+            if row is None:
+                skipped += 1
+                continue
+            rows[row["cep"]] = row  # último registro de um CEP repetido vence
+        with db.engine.begin() as conn:
+            upsert(conn, table, list(rows.values()), ["cep"])
+        imported += len(rows)
+        logger.info(f"{imported} CEPs importados")
+    return {"imported": imported, "skipped": skipped}
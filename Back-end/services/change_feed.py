@@ -0,0 +1,131 @@
+"""
+Feed de alterações do catálogo de animais (sincronização incremental)
+Toda escrita em animais passa por `record_animal_write`, que anexa uma linha a
+`animal_changes` com um `seq` crescente. O cliente guarda o último cursor e pede
+só o que mudou depois dele: animais criados/alterados voltam completos e os
+excluídos como tombstones.
+
+A linha é inserida depois do incremento de `resource_versions` na mesma
+transação; em bancos com locks por linha (PostgreSQL) esse UPDATE serializa as
+escritas no catálogo, então os `seq` ficam visíveis na ordem em que são gerados
+e um cursor nunca pula uma alteração que ainda ia ser commitada.
+
+Alterações antigas podem ser removidas (`flask animals compact-changes`); quem
+pedir um cursor anterior ao horizonte removido recebe `reset: true` e deve
+recarregar a lista completa.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, func, select
+
+from database.models import db, Animal, AnimalChange, ResourceVersion
+
+# Linha de resource_versions que guarda o maior seq já removido pela compactação
+HORIZON_KEY = "animal_changes_horizon"
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def append_changes(session, op: str, animal_ids: Iterable[int]) -> None:
+    """Anexa uma alteração por animal (op: create, update ou delete) à transação da sessão."""
+    now = datetime.utcnow()
+    kind = "delete" if op == "delete" else "upsert"
+    rows = [{"animal_id": animal_id, "op": kind, "changed_at": now} for animal_id in animal_ids]
+    if rows:
+        session.execute(AnimalChange.__table__.insert(), rows)
+
+
+def parse_cursor(value: str | None) -> int:
+    """Cursor do feed: o último `seq` recebido (vazio = desde o início).
+
+    Raises:
+        ValueError: se o cursor não for um inteiro não negativo
+    """
+    if value in (None, ""):
+        return 0
+    if not value.isdigit():
+        raise ValueError("Cursor inválido")
+    return int(value)
+
+
+def current_cursor() -> int:
+    return db.session.scalar(select(func.max(AnimalChange.seq))) or 0
+
+
+def _horizon() -> int:
+    return db.session.scalar(select(ResourceVersion.version).where(ResourceVersion.name == HORIZON_KEY)) or 0
+
+
+def read_changes(since: int, limit: int, serialize) -> dict:
+    """Alterações com seq > `since`, uma por animal (a mais recente), em ordem de seq.
+
+    Args:
+        serialize: projeção usada para os animais (ver utils/serializers.py)
+
+    Returns:
+        dict com `changes`, `cursor` (para a próxima chamada), `has_more` e `reset`
+    """
+    if since < _horizon():
+        return {"changes": [], "cursor": str(current_cursor()), "has_more": False, "reset": True}
+
+    latest = (
+        select(func.max(AnimalChange.seq).label("seq"))
+        .where(AnimalChange.seq > since)
+        .group_by(AnimalChange.animal_id)
+        .order_by(func.max(AnimalChange.seq))
+        .limit(limit + 1)
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(AnimalChange.seq, AnimalChange.animal_id, AnimalChange.op)
+        .join(latest, AnimalChange.seq == latest.c.seq)
+        .order_by(AnimalChange.seq)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    upsert_ids = [animal_id for _, animal_id, op in rows if op == "upsert"]
+    animals = {}
+    if upsert_ids:
+        for row in db.session.execute(select(*serialize.columns).where(Animal.id.in_(upsert_ids))):
+            animals[row.id] = serialize.serialize(row)  # id sempre selecionado (ver serializers)
+    changes = []
+    for seq, animal_id, op in rows:
+        animal = animals.get(animal_id)
+        if op == "upsert" and animal is not None:
+            changes.append({"seq": seq, "op": "upsert", "id": animal_id, "animal": animal})
+        else:
+            # Excluído (ou excluído depois desta alteração, em uma escrita ainda não lida)
+            changes.append({"seq": seq, "op": "delete", "id": animal_id})
+    cursor = rows[-1][0] if rows else since
+    return {"changes": changes, "cursor": str(cursor), "has_more": has_more, "reset": False}
+
+
+def compact_changes(older_than_days: int) -> int:
+    """Remove alterações mais antigas que `older_than_days` dias e avança o horizonte.
+
+    A alteração mais recente nunca é removida: ela mantém o `seq` máximo no banco,
+    então novos `seq` continuam acima do horizonte (bancos SQLite criados antes de
+    `sqlite_autoincrement` reutilizariam os valores de uma tabela vazia).
+
+    Returns:
+        número de linhas removidas
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    max_removed = db.session.scalar(select(func.max(AnimalChange.seq)).where(AnimalChange.changed_at < cutoff))
+    if max_removed is None:
+        return 0
+    max_removed = min(max_removed, current_cursor() - 1)
+    if max_removed <= _horizon():
+        return 0
+    removed = db.session.execute(delete(AnimalChange).where(AnimalChange.seq <= max_removed)).rowcount
+    horizon = db.session.get(ResourceVersion, HORIZON_KEY)
+    if horizon is None:
+        db.session.add(ResourceVersion(name=HORIZON_KEY, version=max_removed, updated_at=datetime.utcnow()))
+    else:
+        horizon.version = max(horizon.version, max_removed)
+        horizon.updated_at = datetime.utcnow()
+    db.session.commit()
+    return removed
@@ -0,0 +1,201 @@
+"""
+Eventos em tempo real (Server-Sent Events) com um broker pub/sub em memória
+As escritas em animais e adoções (services/catalog_events.py) enfileiram eventos
+na sessão com `queue_event`; eles só são publicados depois do commit, então um
+cliente nunca recebe algo que foi desfeito por um rollback.
+
+Tópicos:
+- "catalog": animais criados/alterados/excluídos (público)
+- "ong:<id>": pedidos de adoção dos animais da ONG
+- "user:<id>": andamento das adoções pedidas com o e-mail do adotante
+
+O broker é por processo e pode ser chamado de qualquer thread (rotas, workers de
+tarefas); os assinantes são tarefas asyncio do `asgi.py`, sem uma thread por
+conexão. Cada assinante tem um buffer limitado: se o cliente não acompanha, a
+conexão é encerrada e o navegador reconecta com `Last-Event-ID`, recebendo os
+eventos perdidos do histórico recente (SSE_REPLAY_SIZE). Se o id não está mais
+no histórico (ou veio de outro processo), o cliente recebe um evento `reset` e
+deve recarregar os dados (ex.: pelo /animals/changes).
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import threading
+from collections import deque
+from typing import Iterable, NamedTuple
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from utils.metrics import register_collector
+
+CATALOG_TOPIC = "catalog"
+
+_PENDING_KEY = "pending_events"
+
+
+def ong_topic(ong_id: int) -> str:
+    return f"ong:{ong_id}"
+
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+class Event(NamedTuple):
+    id: str
+    seq: int
+    topic: str
+    name: str
+    data: str  # JSON
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.name}\ndata: {self.data}\n\n".encode("utf-8")
+
+
+class Subscriber:
+    """Conexão SSE: recebe eventos dos seus tópicos no event loop em que foi criada."""
+
+    def __init__(self, topics: Iterable[str], loop: asyncio.AbstractEventLoop, buffer_size: int):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.buffer_size = buffer_size
+        self.buffer: deque[Event] = deque()
+        self.overflowed = False
+        self.closed = False
+        self._wakeup = asyncio.Event()
+
+    def deliver(self, evt: Event) -> None:
+        """Chamado no event loop do assinante (via call_soon_threadsafe)."""
+        if len(self.buffer) >= self.buffer_size:
+            self.overflowed = True
+        else:
+            self.buffer.append(evt)
+        self._wakeup.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> list[Event]:
+        """Eventos pendentes, esperando até `timeout` segundos (lista vazia = heartbeat)."""
+        if not self.buffer and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._wakeup.clear()
+        batch = list(self.buffer)
+        self.buffer.clear()
+        return batch
+
+
+class EventBroker:
+    """Pub/sub em memória com histórico recente para retomar pelo Last-Event-ID."""
+
+    def __init__(self, replay_size: int = 1000):
+        # Identifica esta instância do broker nos ids: ids de outro processo (ou de
+        # antes de um reinício) não podem ser retomados
+        self.instance = secrets.token_hex(4)
+        self._history: deque[Event] = deque(maxlen=replay_size)
+        self._subscribers: set[Subscriber] = set()
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self.published = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, events: Iterable[tuple[str, str, dict]]) -> None:
+        """Publica eventos (tópico, nome, dados) para os assinantes dos tópicos."""
+        with self._lock:
+            for topic, name, data in events:
+                evt = Event(f"{self.instance}-{self._next_seq}", self._next_seq, topic, name,
+                            json.dumps(data, ensure_ascii=False, default=str))
+                self._next_seq += 1
+                self._history.append(evt)
+                self.published += 1
+                for subscriber in list(self._subscribers):
+                    if topic in subscriber.topics:
+                        self._send(subscriber, evt)
+
+    def _send(self, subscriber: Subscriber, evt: Event) -> None:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber.deliver, evt)
+        except RuntimeError:  # event loop já encerrado
+            self._subscribers.discard(subscriber)
+
+    def subscribe(self, topics: Iterable[str], last_event_id: str | None, loop: asyncio.AbstractEventLoop,
+                  buffer_size: int) -> tuple[Subscriber, list[Event] | None]:
+        """Registra um assinante e devolve os eventos a reenviar desde `last_event_id`.
+
+        Returns:
+            (assinante, eventos perdidos) - None no lugar dos eventos quando o id não
+            pode ser retomado e o cliente deve recarregar os dados
+        """
+        subscriber = Subscriber(topics, loop, buffer_size)
+        with self._lock:
+            replay: list[Event] | None = []
+            if last_event_id:
+                replay = self._replay_since(last_event_id, subscriber.topics)
+            self._subscribers.add(subscriber)
+        return subscriber, replay
+
+    def _replay_since(self, last_event_id: str, topics: frozenset) -> list[Event] | None:
+        instance, _, seq = last_event_id.partition("-")
+        if instance != self.instance or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._history[0].seq if self._history else self._next_seq
+        if seq + 1 < oldest:
+            return None
+        return [evt for evt in self._history if evt.seq > seq and evt.topic in topics]
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+
+_broker: EventBroker | None = None
+_broker_pid: int | None = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> EventBroker:
+    """Broker do processo atual (recriado após fork: os assinantes são do processo)."""
+    global _broker, _broker_pid
+    if _broker is None or _broker_pid != os.getpid():
+        with _broker_lock:
+            if _broker is None or _broker_pid != os.getpid():
+                _broker = EventBroker(current_app.config.get("SSE_REPLAY_SIZE", 1000))
+                _broker_pid = os.getpid()
+    return _broker
+
+
+def queue_event(session, topics: Iterable[str], name: str, data: dict) -> None:
+    """Agenda um evento para os `topics`, publicado quando a transação da sessão for commitada."""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    pending.extend((topic, name, data) for topic in topics)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_events(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        get_broker().publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@register_collector
+def _event_metrics_for_prometheus() -> dict:
+    if _broker is None or _broker_pid != os.getpid():
+        return {}
+    return {"sse_subscribers": _broker.subscriber_count, "sse_events_published_total": _broker.published}
@@ -0,0 +1,212 @@
+"""
+Geocodificação local de cidades e CEPs (sem consultas externas)
+As coordenadas vêm de um arquivo de municípios (GAZETTEER_PATH, CSV com nome,
+UF, latitude e longitude; aceita o formato da lista do IBGE, com `codigo_uf`).
+O repositório traz as capitais e as maiores cidades; para cobrir todo o país,
+aponte GAZETTEER_PATH para a lista completa e rode `flask animals geocode`.
+
+Cada animal guarda latitude/longitude da sua cidade e o geohash do ponto
+(utils/geohash.py), usado pela busca `GET /animals?near=<cep>&radius_km=`.
+Um CEP é resolvido para a cidade pela base local de CEPs (`flask cep import`)
+ou pelo cache persistente do ViaCEP, nunca pela rede.
+"""
+
+import csv
+import logging
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import and_, or_, select, update
+
+from database.models import db, Animal
+from services.address_service import find_stored_address
+from services.catalog_events import record_animal_write
+from utils.geohash import covering_ranges, distance_km, encode
+
+logger = logging.getLogger(__name__)
+
+# Precisão do geohash gravado nos animais (células de ~1,2 x 0,6 km). Alterar exige
+# recalcular os animais (`flask animals geocode`).
+GEOHASH_PRECISION = 6
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 500.0
+
+# Nome da coluna no arquivo -> campo do município
+COLUMN_ALIASES = {
+    "nome": "name", "cidade": "name", "municipio": "name", "city": "name",
+    "uf": "state", "estado": "state", "state": "state",
+    "codigo_uf": "state_code",
+    "latitude": "latitude", "lat": "latitude",
+    "longitude": "longitude", "lon": "longitude", "lng": "longitude",
+    "capital": "capital",
+}
+
+# Código IBGE da UF -> sigla (arquivos do IBGE trazem só o código)
+IBGE_STATE_CODES = {
+    "11": "RO", "12": "AC", "13": "AM", "14": "RR", "15": "PA", "16": "AP", "17": "TO",
+    "21": "MA", "22": "PI", "23": "CE", "24": "RN", "25": "PB", "26": "PE", "27": "AL",
+    "28": "SE", "29": "BA", "31": "MG", "32": "ES", "33": "RJ", "35": "SP", "41": "PR",
+    "42": "SC", "43": "RS", "50": "MS", "51": "MT", "52": "GO", "53": "DF",
+}
+
+# "Campinas - SP", "Campinas/SP", "Campinas, SP"
+_STATE_SUFFIX = re.compile(r"^(.*?)\s*[-,/]\s*([A-Za-z]{2})\s*$")
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    latitude: float
+    longitude: float
+
+
+def normalize_name(name: str) -> str:
+    """Nome comparável: sem acentos, minúsculo e com espaços simples."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().replace("'", " ").split())
+
+
+def split_city(value: str) -> tuple[str, str | None]:
+    """Separa a UF informada junto à cidade ("Campinas - SP" -> ("Campinas", "SP"))."""
+    match = _STATE_SUFFIX.match(value.strip())
+    if match:
+        return match.group(1), match.group(2).upper()
+    return value.strip(), None
+
+
+class Gazetteer:
+    """Municípios indexados por (nome normalizado, UF) e por nome."""
+
+    def __init__(self, places: list[tuple[Place, bool]]):
+        self.by_state: dict[tuple[str, str], Place] = {}
+        by_name: dict[str, list[tuple[Place, bool]]] = {}
+        for place, capital in places:
+            key = normalize_name(place.name)
+            self.by_state[(key, place.state)] = place
+            by_name.setdefault(key, []).append((place, capital))
+        # Sem UF, um nome só é resolvido se for único ou se um dos homônimos for capital
+        self.by_name: dict[str, Place] = {}
+        for key, candidates in by_name.items():
+            capitals = [place for place, capital in candidates if capital]
+            if len(candidates) == 1:
+                self.by_name[key] = candidates[0][0]
+            elif len(capitals) == 1:
+                self.by_name[key] = capitals[0]
+
+    def __len__(self) -> int:
+        return len(self.by_state)
+
+    def find(self, city: str, state: str | None = None) -> Place | None:
+        name, suffix_state = split_city(city)
+        state = (state or suffix_state or "").upper() or None
+        key = normalize_name(name)
+        if state:
+            return self.by_state.get((key, state))
+        return self.by_name.get(key)
+
+
+def _read_places(path: str) -> list[tuple[Place, bool]]:
+    places = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            values = {COLUMN_ALIASES[k.strip().lower()]: (v or "").strip()
+                      for k, v in row.items() if k and k.strip().lower() in COLUMN_ALIASES}
+            state = values.get("state") or IBGE_STATE_CODES.get(values.get("state_code", ""), "")
+            try:
+                place = Place(values["name"], state.upper(), float(values["latitude"]), float(values["longitude"]))
+            except (KeyError, ValueError):
+                logger.warning(f"{path}:{line_number}: município inválido ignorado")
+                continue
+            places.append((place, values.get("capital", "") in ("1", "true", "True")))
+    return places
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path: str) -> Gazetteer:
+    if not os.path.exists(path):
+        logger.warning(f"Arquivo de municípios não encontrado: {path}; animais ficarão sem coordenadas")
+        return Gazetteer([])
+    gazetteer = Gazetteer(_read_places(path))
+    logger.info(f"{len(gazetteer)} municípios carregados de {path}")
+    return gazetteer
+
+
+def get_gazetteer() -> Gazetteer:
+    """Municípios do arquivo configurado (lido uma vez por processo)."""
+    return _load_gazetteer(current_app.config["GAZETTEER_PATH"])
+
+
+def geo_values(city: str | None) -> dict:
+    """Colunas de localização de um animal a partir da cidade (nulas se não encontrada)."""
+    place = get_gazetteer().find(city) if city else None
+    if place is None:
+        return {"latitude": None, "longitude": None, "geohash": None}
+    return {
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "geohash": encode(place.latitude, place.longitude, GEOHASH_PRECISION),
+    }
+
+
+def geocode_animals() -> tuple[int, int]:
+    """Recalcula as coordenadas de todos os animais (ex.: após trocar o arquivo de municípios).
+
+    Returns:
+        (animais atualizados, animais cuja cidade não foi encontrada)
+    """
+    rows = db.session.execute(
+        select(Animal.id, Animal.city, Animal.latitude, Animal.longitude, Animal.geohash)
+    ).all()
+    by_city: dict[str, list] = {}
+    for row in rows:
+        by_city.setdefault(row.city, []).append(row)
+    changed, missing = [], 0
+    for city, animals in by_city.items():
+        values = geo_values(city)
+        if values["geohash"] is None:
+            missing += len(animals)
+        current = (values["latitude"], values["longitude"], values["geohash"])
+        stale = [row.id for row in animals if (row.latitude, row.longitude, row.geohash) != current]
+        if stale:
+            db.session.execute(update(Animal).where(Animal.city == city).values(**values))
+            changed += stale
+    if changed:
+        record_animal_write("update", changed)
+    db.session.commit()
+    return len(changed), missing
+
+
+def resolve_near(value: str) -> Place | None:
+    """Centro de uma busca por proximidade: CEP (8 dígitos) ou nome da cidade (com UF opcional)."""
+    digits = value.replace("-", "").replace(" ", "")
+    if digits.isdigit():
+        if len(digits) != 8:
+            return None
+        address = find_stored_address(digits)
+        if not address or not address.get("city"):
+            return None
+        return get_gazetteer().find(address["city"], address.get("state"))
+    return get_gazetteer().find(value)
+
+
+def nearby(query, center: Place, radius_km: float) -> list[tuple[int, float]]:
+    """(id, distância em km) dos animais da `query` a até `radius_km` do centro, do mais próximo.
+
+    O banco só lê as células de geohash em volta do centro (índice ix_animals_geohash);
+    a distância exata é calculada apenas para esses candidatos.
+    """
+    ranges = covering_ranges(center.latitude, center.longitude, radius_km, GEOHASH_PRECISION)
+    cells = or_(*(and_(Animal.geohash >= start, Animal.geohash < end) for start, end in ranges))
+    candidates = query.filter(cells).with_entities(Animal.id, Animal.latitude, Animal.longitude)
+    matches = []
+    for animal_id, latitude, longitude in candidates:
+        distance = distance_km(center.latitude, center.longitude, latitude, longitude)
+        if distance <= radius_km:
+            matches.append((distance, animal_id))
+    matches.sort()
+    return [(animal_id, round(distance, 1)) for distance, animal_id in matches]
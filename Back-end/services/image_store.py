@@ -0,0 +1,193 @@
+"""
+Armazenamento de imagens dos animais por conteúdo (content-addressed)
+Os bytes de cada imagem ficam em arquivo, com o SHA-256 do conteúdo como nome
+(IMAGE_STORE_PATH/ab/abcd...), e o animal guarda apenas a URL curta
+`/images/<hash>`. Imagens iguais são gravadas uma vez, e como o conteúdo de um
+hash nunca muda as respostas podem ser cacheadas como imutáveis.
+
+Miniaturas em WebP (IMAGE_VARIANTS) são geradas por uma tarefa em segundo plano
+(services/jobs.py) e exigem a biblioteca Pillow; sem ela, ou enquanto a tarefa
+não roda, `/images/<hash>/<variante>` serve o original.
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+from typing import BinaryIO
+
+from flask import current_app
+
+from services.jobs import enqueue, job_handler
+
+try:
+    from PIL import Image as PILImage
+except ImportError:  # dependência opcional
+    PILImage = None
+
+logger = logging.getLogger(__name__)
+
+URL_PREFIX = "/images/"
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+DATA_URL_PATTERN = re.compile(r"^data:(image/[\w.+-]+)?(;[\w=-]+)*;base64,", re.IGNORECASE)
+VARIANT_MIMETYPE = "image/webp"
+_CHUNK_SIZE = 64 * 1024
+
+# Assinaturas dos formatos aceitos (o Content-Type enviado pelo cliente é ignorado)
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class ImageError(Exception):
+    """Exceção para imagens inválidas (formato não suportado, tamanho, data URL malformada)"""
+    pass
+
+
+def sniff_mimetype(head: bytes) -> str | None:
+    """Tipo da imagem pelos primeiros bytes (None se não for um formato aceito)."""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, mimetype in _SIGNATURES:
+        if head.startswith(signature):
+            return mimetype
+    return None
+
+
+def store_root() -> str:
+    return current_app.config.get("IMAGE_STORE_PATH") or os.path.join(current_app.instance_path, "images")
+
+
+def original_path(digest: str, root: str | None = None) -> str:
+    return os.path.join(root or store_root(), digest[:2], digest)
+
+
+def variant_path(digest: str, variant: str, root: str | None = None) -> str:
+    return os.path.join(root or store_root(), digest[:2], f"{digest}.{variant}.webp")
+
+
+def image_url(digest: str) -> str:
+    return f"{URL_PREFIX}{digest}"
+
+
+def save_stream(stream: BinaryIO, max_bytes: int | None = None) -> tuple[str, bool]:
+    """Grava uma imagem lida em blocos, calculando o hash durante a cópia.
+
+    Returns:
+        (hash, criada) - `criada` é False quando a imagem já existia no armazenamento
+
+    Raises:
+        ImageError: formato não suportado ou imagem maior que `max_bytes`
+    """
+    max_bytes = max_bytes or current_app.config.get("IMAGE_MAX_BYTES", 5 * 1024 * 1024)
+    root = store_root()
+    os.makedirs(root, exist_ok=True)
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=root)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            first = True
+            while chunk := stream.read(_CHUNK_SIZE):
+                if first and sniff_mimetype(chunk[:16]) is None:
+                    raise ImageError("Formato de imagem não suportado (use JPEG, PNG, GIF ou WebP)")
+                first = False
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageError(f"Imagem maior que o limite de {max_bytes // 1024} KB")
+                sha.update(chunk)
+                tmp.write(chunk)
+        if size == 0:
+            raise ImageError("Imagem vazia")
+        digest = sha.hexdigest()
+        final_path = original_path(digest, root)
+        if os.path.exists(final_path):
+            return digest, False
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)  # atômico: leitores nunca veem um arquivo parcial
+        return digest, True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def store_image(stream: BinaryIO, max_bytes: int | None = None) -> str:
+    """Grava a imagem, agenda as miniaturas (se for nova) e devolve a URL curta."""
+    digest, created = save_stream(stream, max_bytes)
+    if created:
+        enqueue_variants(digest)
+    return image_url(digest)
+
+
+def store_data_url(value: str | None) -> str | None:
+    """Converte uma imagem inline (data:image/...;base64,...) na URL do armazenamento.
+
+    Outros valores (URLs, None) são devolvidos sem alteração.
+    """
+    if not value or not DATA_URL_PATTERN.match(value):
+        return value
+    try:
+        data = base64.b64decode(value.split(",", 1)[1], validate=False)
+    except (binascii.Error, ValueError) as e:
+        raise ImageError("Imagem em base64 inválida") from e
+    return store_image(io.BytesIO(data))
+
+
+def enqueue_variants(digest: str) -> None:
+    if current_app.config.get("IMAGE_VARIANTS"):
+        enqueue("images.variants", {"hash": digest})
+
+
+def find_image(digest: str, variant: str | None = None) -> tuple[str, str, bool] | None:
+    """Arquivo a servir para `/images/<hash>[/<variante>]`.
+
+    Returns:
+        (caminho, mimetype, exato) ou None se a imagem não existe. `exato` é False
+        quando a variante pedida ainda não existe e o original é servido no lugar.
+    """
+    if not HASH_PATTERN.match(digest):
+        return None
+    if variant is not None:
+        path = variant_path(digest, variant)
+        if os.path.exists(path):
+            return path, VARIANT_MIMETYPE, True
+    path = original_path(digest)
+    try:
+        with open(path, "rb") as f:
+            mimetype = sniff_mimetype(f.read(16)) or "application/octet-stream"
+    except FileNotFoundError:
+        return None
+    return path, mimetype, variant is None
+
+
+@job_handler("images.variants")
+def _generate_variants(payload: dict) -> None:
+    """Gera as miniaturas WebP de uma imagem (largura máxima por variante)."""
+    if PILImage is None:
+        logger.info("Pillow não instalado; miniaturas não geradas")
+        return
+    digest = payload["hash"]
+    source = original_path(digest)
+    for variant, max_width in current_app.config.get("IMAGE_VARIANTS", {}).items():
+        target = variant_path(digest, variant)
+        if os.path.exists(target):
+            continue
+        with PILImage.open(source) as image:
+            image.thumbnail((max_width, max_width * 4))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            fd, tmp_path = tempfile.mkstemp(prefix=".variant-", dir=os.path.dirname(target))
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    image.save(tmp, "WEBP", quality=current_app.config.get("IMAGE_WEBP_QUALITY", 80))
+                os.replace(tmp_path, target)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
@@ -0,0 +1,288 @@
+"""
+Fila de tarefas em segundo plano persistida no banco (tabela `jobs`)
+As rotas enfileiram efeitos colaterais com `enqueue` na mesma transação da
+escrita principal e respondem em seguida; um pool de threads por processo
+executa as tarefas depois do commit, com novas tentativas e backoff
+exponencial. Tarefas presas em "running" por um processo que caiu voltam a ser
+executadas após JOB_LOCK_TIMEOUT segundos.
+
+Com JOB_WORKERS = 0 (testes) as tarefas rodam logo após o commit, na mesma thread.
+"""
+
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable
+
+from flask import Flask, current_app
+from sqlalchemy import event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from database.models import db, Adoption, Job
+from services.catalog_events import record_adoption_write
+from services.stats import record_adoption_transition
+from utils.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+# Nome da tarefa -> função(payload: dict). Registrado com @job_handler.
+HANDLERS: dict[str, Callable[[dict], None]] = {}
+
+_WAKE_KEY = "jobs_enqueued"
+
+
+def job_handler(name: str):
+    """Registra a função que executa as tarefas `name`."""
+    def decorator(fn):
+        HANDLERS[name] = fn
+        return fn
+    return decorator
+
+
+def enqueue(name: str, payload: dict | None = None, delay: float = 0, max_attempts: int | None = None) -> Job:
+    """Adiciona uma tarefa à sessão atual; ela só é visível aos workers após o commit."""
+    if name not in HANDLERS:
+        raise ValueError(f"Tarefa desconhecida: {name}")
+    job = Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+        max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+    )
+    db.session.add(job)
+    db.session.info[_WAKE_KEY] = True
+    return job
+
+
+# --- Execução ---------------------------------------------------------------
+
+def _claim_next(worker_id: str) -> int | None:
+    """Marca a próxima tarefa pronta como "running" para este worker.
+
+    A troca de status é condicional (UPDATE ... WHERE status = o lido), então
+    dois workers nunca executam a mesma tarefa.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=current_app.config.get("JOB_LOCK_TIMEOUT", 300))
+    candidates = db.session.execute(
+        select(Job.id, Job.status)
+        .where(or_(
+            (Job.status == "queued") & (Job.run_at <= now),
+            (Job.status == "running") & (Job.locked_at < stale_before),
+        ))
+        .order_by(Job.run_at, Job.id)
+        .limit(5)
+    ).all()
+    for job_id, status in candidates:
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == status)
+            .values(status="running", locked_by=worker_id, locked_at=now,
+                    started_at=now, attempts=Job.attempts + 1)
+        )
+        db.session.commit()
+        if result.rowcount:
+            return job_id
+    return None
+
+
+def _execute(job_id: int) -> None:
+    job = db.session.get(Job, job_id)
+    handler = HANDLERS.get(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f"Nenhum handler registrado para {job.name}")
+        handler(json.loads(job.payload))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        job = db.session.get(Job, job_id)
+        job.last_error = traceback.format_exc(limit=5)
+        if job.attempts < job.max_attempts and handler is not None:
+            backoff = current_app.config.get("JOB_RETRY_BACKOFF", 2.0) * 2 ** (job.attempts - 1)
+            job.status = "queued"
+            job.run_at = datetime.utcnow() + timedelta(seconds=backoff)
+            _metrics["retried"] += 1
+        else:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+            _metrics["failed"] += 1
+        logger.warning(f"Tarefa {job.id} ({job.name}) falhou na tentativa {job.attempts}")
+    else:
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        job.last_error = None
+        _metrics["done"] += 1
+    job.locked_by = None
+    job.locked_at = None
+    db.session.commit()
+
+
+def run_pending(worker_id: str = "inline", limit: int | None = None) -> int:
+    """Executa tarefas prontas até esvaziar a fila (ou `limit`). Requer app context."""
+    executed = 0
+    while limit is None or executed < limit:
+        job_id = _claim_next(worker_id)
+        if job_id is None:
+            break
+        _execute(job_id)
+        executed += 1
+    return executed
+
+
+class WorkerPool:
+    """Threads que consultam a fila a cada JOB_POLL_INTERVAL ou quando acordadas."""
+
+    def __init__(self, app: Flask, workers: int, poll_interval: float):
+        self.app = app
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"{socket.gethostname()}:{os.getpid()}:{i}",),
+                             name=f"job-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    while not self._stop.is_set() and run_pending(worker_id, limit=1):
+                        pass
+            except Exception:
+                logger.exception("Erro no worker de tarefas")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+_metrics = {"done": 0, "retried": 0, "failed": 0}
+_pool: WorkerPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def ensure_workers() -> WorkerPool | None:
+    """Pool do processo atual, iniciado no primeiro uso (e recriado após fork)."""
+    global _pool, _pool_pid
+    workers = current_app.config.get("JOB_WORKERS", 0)
+    if not workers:
+        return None
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = WorkerPool(current_app._get_current_object(), workers,
+                                   current_app.config.get("JOB_POLL_INTERVAL", 1.0))
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def init_jobs(app: Flask) -> None:
+    """Inicia os workers na primeira requisição de cada processo."""
+    @app.before_request
+    def _start_job_workers():
+        ensure_workers()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if not session.info.pop(_WAKE_KEY, False):
+        return
+    pool = ensure_workers()
+    if pool is not None:
+        pool.wake()
+    else:
+        # Modo síncrono: contexto próprio para não reutilizar a sessão que está commitando
+        with current_app.app_context():
+            run_pending()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_wake(session):
+    session.info.pop(_WAKE_KEY, None)
+
+
+@register_collector
+def _job_metrics_for_prometheus() -> dict:
+    return {f"jobs_{name}_total": value for name, value in _metrics.items()}
+
+
+@atexit.register
+def _stop_workers() -> None:
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.stop()
+
+
+# --- Métricas ---------------------------------------------------------------
+
+def queue_stats(window: int = 500) -> dict:
+    """Profundidade da fila e latências das últimas `window` tarefas concluídas."""
+    now = datetime.utcnow()
+    counts = dict(db.session.execute(select(Job.status, func.count()).group_by(Job.status)).all())
+    ready, oldest = db.session.execute(
+        select(func.count(), func.min(Job.run_at)).where(Job.status == "queued", Job.run_at <= now)
+    ).one()
+    recent = db.session.execute(
+        select(Job.created_at, Job.started_at, Job.finished_at)
+        .where(Job.status == "done")
+        .order_by(Job.finished_at.desc())
+        .limit(window)
+    ).all()
+    wait = sorted((started - created).total_seconds() for created, started, _ in recent)
+    run = sorted((finished - started).total_seconds() for _, started, finished in recent)
+
+    def pct(values, p):
+        return round(values[min(len(values) - 1, int(len(values) * p))] * 1000, 2) if values else None
+
+    return {
+        "counts": {status: counts.get(status, 0) for status in JOB_STATUSES},
+        "ready": ready,
+        "oldest_ready_age_s": round((now - oldest).total_seconds(), 3) if oldest else 0,
+        "latency_ms": {
+            "wait_p50": pct(wait, 0.5), "wait_p95": pct(wait, 0.95),
+            "run_p50": pct(run, 0.5), "run_p95": pct(run, 0.95),
+            "sample": len(recent),
+        },
+        "workers": current_app.config.get("JOB_WORKERS", 0),
+        "process": dict(_metrics),
+    }
+
+
+# --- Tarefas ----------------------------------------------------------------
+
+@job_handler("adoptions.status_changed")
+def _adoption_status_changed(payload: dict) -> None:
+    """Efeitos de uma mudança de status: ao aprovar, recusa os outros pedidos pendentes do animal."""
+    if payload.get("status") != "Approved":
+        return
+    competing = db.session.scalars(
+        select(Adoption.id).where(
+            Adoption.animal_id == payload["animal_id"],
+            Adoption.id != payload["adoption_id"],
+            Adoption.status == "Pending",
+        )
+    ).all()
+    if competing:
+        db.session.execute(
+            update(Adoption).where(Adoption.id.in_(competing)).values(status="Rejected", updated_at=datetime.utcnow())
+        )
+        record_adoption_transition(payload["animal_id"], "Pending", "Rejected", len(competing))
+        record_adoption_write("update", competing)
@@ -0,0 +1,269 @@
+"""
+Estatísticas do catálogo mantidas incrementalmente (tabela `stat_counters`)
+Cada escrita em animais/adoções soma ou subtrai 1 nos contadores afetados, na
+mesma transação da escrita, para o escopo global ("all") e o da ONG dona do
+animal ("ong:<id>"). O /stats lê algumas dezenas de linhas em vez de agregar as
+tabelas inteiras.
+
+- Escritas pelo ORM (rotas) são contadas automaticamente no after_flush.
+- Escritas em lote (UPDATE/INSERT executemany) chamam `record_*` explicitamente.
+- `rebuild_counters` recalcula tudo a partir das tabelas (`flask stats rebuild`).
+
+Contadores diários ("*_daily") contam eventos: adoções criadas e decididas
+(aprovadas/recusadas) por dia, e não diminuem quando o registro é apagado.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, attributes
+
+from database.models import db, Adoption, Animal, StatCounter
+
+GLOBAL_SCOPE = "all"
+ANIMAL_DIMENSIONS = ("status", "species", "size", "city")
+ADOPTION_STATUSES = ("Pending", "Approved", "Rejected")
+# Status de adoção -> contador diário do evento
+DAILY_METRICS = {"created": "adoptions.created_daily", "Approved": "adoptions.approved_daily",
+                 "Rejected": "adoptions.rejected_daily"}
+
+_Delta = Counter  # (scope, metric, key) -> variação
+
+
+def ong_scope(ong_id: int) -> str:
+    return f"ong:{ong_id}"
+
+
+def _scopes(ong_id: int | None) -> tuple:
+    return (GLOBAL_SCOPE,) if ong_id is None else (GLOBAL_SCOPE, ong_scope(ong_id))
+
+
+def _today() -> str:
+    return datetime.utcnow().date().isoformat()
+
+
+def _add_animal(delta: _Delta, values: dict, sign: int) -> None:
+    for scope in _scopes(values.get("ong_id")):
+        delta[(scope, "animals.total", "")] += sign
+        for dimension in ANIMAL_DIMENSIONS:
+            delta[(scope, f"animals.{dimension}", values.get(dimension) or "")] += sign
+
+
+def _add_adoption(delta: _Delta, ong_id: int | None, status: str, sign: int) -> None:
+    for scope in _scopes(ong_id):
+        delta[(scope, "adoptions.total", "")] += sign
+        delta[(scope, "adoptions.status", status or "")] += sign
+
+
+def _add_event(delta: _Delta, ong_id: int | None, event_name: str, day: str, count: int = 1) -> None:
+    metric = DAILY_METRICS.get(event_name)
+    if metric is not None:
+        for scope in _scopes(ong_id):
+            delta[(scope, metric, day)] += count
+
+
+def apply_delta(connection, delta: _Delta) -> None:
+    """Soma as variações nos contadores (upsert), na transação de `connection`."""
+    rows = [
+        {"scope": scope, "metric": metric, "key": key, "count": change}
+        for (scope, metric, key), change in sorted(delta.items()) if change
+    ]
+    if not rows:
+        return
+    dialect = connection.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(StatCounter)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["scope", "metric", "key"],
+            set_={"count": StatCounter.count + stmt.excluded["count"]},
+        )
+        connection.execute(stmt, rows)
+        return
+    for row in rows:  # outros bancos: UPDATE e, se não havia a linha, INSERT
+        result = connection.execute(
+            update(StatCounter)
+            .where(StatCounter.scope == row["scope"], StatCounter.metric == row["metric"],
+                   StatCounter.key == row["key"])
+            .values(count=StatCounter.count + row["count"])
+        )
+        if not result.rowcount:
+            connection.execute(insert(StatCounter).values(**row))
+
+
+# --- Escritas em lote --------------------------------------------------------
+
+def record_animals_created(rows: Iterable[dict]) -> None:
+    """Conta animais inseridos em lote (valores como gravados)."""
+    delta = _Delta()
+    for values in rows:
+        _add_animal(delta, values, 1)
+    apply_delta(db.session.connection(), delta)
+
+
+def record_animals_updated(before: Iterable[dict], after: Iterable[dict]) -> None:
+    """Conta atualizações em lote: `before`/`after` com os campos contados de cada animal."""
+    delta = _Delta()
+    for old, new in zip(before, after):
+        _add_animal(delta, old, -1)
+        _add_animal(delta, new, 1)
+    apply_delta(db.session.connection(), delta)
+
+
+def animal_counted_values(animal_ids: list) -> dict:
+    """{id: campos contados} lidos do banco (para montar o `before` de um UPDATE em lote)."""
+    if not animal_ids:
+        return {}
+    columns = [Animal.id, Animal.ong_id] + [getattr(Animal, d) for d in ANIMAL_DIMENSIONS]
+    rows = db.session.execute(select(*columns).where(Animal.id.in_(animal_ids))).mappings()
+    return {row["id"]: dict(row) for row in rows}
+
+
+def record_adoption_transition(animal_id: int, old_status: str, new_status: str, count: int = 1) -> None:
+    """Conta `count` adoções de um animal que passaram de `old_status` para `new_status` em lote."""
+    ong_id = db.session.scalar(select(Animal.ong_id).where(Animal.id == animal_id))
+    delta = _Delta()
+    _add_adoption(delta, ong_id, old_status, -count)
+    _add_adoption(delta, ong_id, new_status, count)
+    _add_event(delta, ong_id, new_status, _today(), count)
+    apply_delta(db.session.connection(), delta)
+
+
+# --- Escritas pelo ORM -------------------------------------------------------
+
+def _old_value(obj, name: str):
+    """Valor do atributo antes das alterações pendentes (o gravado no banco)."""
+    history = attributes.get_history(obj, name)
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(obj, name)
+
+
+def _animal_values(obj: Animal, old: bool = False) -> dict:
+    names = ("ong_id",) + ANIMAL_DIMENSIONS
+    return {name: _old_value(obj, name) if old else getattr(obj, name) for name in names}
+
+
+def _adoption_ong(session, obj: Adoption, deleted_animals: dict):
+    animal_id = _old_value(obj, "animal_id")
+    if animal_id in deleted_animals:  # exclusão em cascata: o animal já saiu do banco
+        return deleted_animals[animal_id]
+    return session.connection().scalar(select(Animal.ong_id).where(Animal.id == animal_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _count_flushed_changes(session, flush_context):
+    """Converte as inserções/alterações/exclusões do flush em variações dos contadores.
+
+    No after_flush as listas new/dirty/deleted e o histórico dos atributos ainda
+    refletem o estado anterior ao flush, e os SQLs rodam na mesma transação.
+    """
+    delta = _Delta()
+    today = _today()
+    deleted_animals = {
+        _old_value(obj, "id"): _old_value(obj, "ong_id") for obj in session.deleted if isinstance(obj, Animal)
+    }
+    for obj in session.new:
+        if isinstance(obj, Animal):
+            _add_animal(delta, _animal_values(obj), 1)
+        elif isinstance(obj, Adoption):
+            ong_id = _adoption_ong(session, obj, deleted_animals)
+            _add_adoption(delta, ong_id, obj.status, 1)
+            day = (obj.created_at or datetime.utcnow()).date().isoformat()
+            _add_event(delta, ong_id, "created", day)
+    for obj in session.deleted:
+        if isinstance(obj, Animal):
+            _add_animal(delta, _animal_values(obj, old=True), -1)
+        elif isinstance(obj, Adoption):
+            _add_adoption(delta, _adoption_ong(session, obj, deleted_animals), _old_value(obj, "status"), -1)
+    for obj in session.dirty:
+        if obj in session.deleted:
+            continue
+        if isinstance(obj, Animal):
+            old, new = _animal_values(obj, old=True), _animal_values(obj)
+            if old != new:
+                _add_animal(delta, old, -1)
+                _add_animal(delta, new, 1)
+        elif isinstance(obj, Adoption):
+            old_status = _old_value(obj, "status")
+            if old_status != obj.status:
+                ong_id = _adoption_ong(session, obj, deleted_animals)
+                _add_adoption(delta, ong_id, old_status, -1)
+                _add_adoption(delta, ong_id, obj.status, 1)
+                _add_event(delta, ong_id, obj.status, today)
+    if delta:
+        apply_delta(session.connection(), delta)
+
+
+# --- Leitura e reconstrução -------------------------------------------------
+
+def read_stats(scope: str = GLOBAL_SCOPE, days: int = 30, top_cities: int = 20) -> dict:
+    """Estatísticas de um escopo: contagens por dimensão e funil de adoções dos últimos `days` dias."""
+    since = (datetime.utcnow().date() - timedelta(days=days - 1)).isoformat()
+    daily_metrics = tuple(DAILY_METRICS.values())
+    rows = db.session.execute(
+        select(StatCounter.metric, StatCounter.key, StatCounter.count)
+        .where(StatCounter.scope == scope, StatCounter.count != 0)
+        .where(StatCounter.metric.not_in(daily_metrics) | (StatCounter.key >= since))
+    ).all()
+    animals = {"total": 0, **{dimension: {} for dimension in ANIMAL_DIMENSIONS}}
+    adoptions = {"total": 0, "status": {status: 0 for status in ADOPTION_STATUSES}}
+    daily = {}
+    for metric, key, count in rows:
+        group, _, name = metric.partition(".")
+        if metric in daily_metrics:
+            event_name = name[:-len("_daily")]
+            daily.setdefault(key, {"date": key, "created": 0, "approved": 0, "rejected": 0})[event_name] = count
+        elif name == "total":
+            (animals if group == "animals" else adoptions)["total"] = count
+        elif group == "animals":
+            animals[name][key] = count
+        else:
+            adoptions[name][key] = count
+    animals["city"] = dict(sorted(animals["city"].items(), key=lambda item: -item[1])[:top_cities])
+    adoptions["daily"] = [daily[day] for day in sorted(daily)]
+    return {"scope": scope, "animals": animals, "adoptions": adoptions}
+
+
+def rebuild_counters(connection) -> int:
+    """Recalcula todos os contadores a partir das tabelas, em uma transação.
+
+    Returns:
+        número de linhas de contadores gravadas
+    """
+    delta = _Delta()
+    dimensions = [getattr(Animal, d) for d in ANIMAL_DIMENSIONS]
+    for ong_id, *values, count in connection.execute(
+        select(Animal.ong_id, *dimensions, func.count()).group_by(Animal.ong_id, *dimensions)
+    ):
+        values = dict(zip(ANIMAL_DIMENSIONS, values), ong_id=ong_id)
+        _add_animal(delta, values, count)
+
+    joined = select(Animal.ong_id).select_from(Adoption).join(Animal, Adoption.animal_id == Animal.id)
+    for ong_id, status, count in connection.execute(
+        joined.add_columns(Adoption.status, func.count()).group_by(Animal.ong_id, Adoption.status)
+    ):
+        _add_adoption(delta, ong_id, status, count)
+    created_day = func.date(Adoption.created_at)
+    for ong_id, day, count in connection.execute(
+        joined.add_columns(created_day, func.count()).group_by(Animal.ong_id, created_day)
+    ):
+        if day is not None:
+            _add_event(delta, ong_id, "created", str(day), count)
+    # A data da decisão não é gravada: usa a última atualização das adoções decididas
+    decided_day = func.date(Adoption.updated_at)
+    for ong_id, status, day, count in connection.execute(
+        joined.add_columns(Adoption.status, decided_day, func.count())
+        .where(Adoption.status.in_(("Approved", "Rejected")))
+        .group_by(Animal.ong_id, Adoption.status, decided_day)
+    ):
+        if day is not None:
+            _add_event(delta, ong_id, status, str(day), count)
+
+    connection.execute(delete(StatCounter))
+    apply_delta(connection, delta)
+    return sum(1 for change in delta.values() if change)
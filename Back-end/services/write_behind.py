@@ -0,0 +1,373 @@
+"""
+Fila write-behind para registros de baixa prioridade (contato e feedback)
+As rotas apenas enfileiram o registro; uma thread por processo grava a fila
+em transações agrupadas, quando junta WRITE_BEHIND_BATCH_SIZE registros ou a
+cada WRITE_BEHIND_FLUSH_INTERVAL segundos. Assim uma campanha de feedback
+não disputa um commit (fsync + lock de escrita do SQLite) por requisição com
+as escritas de adoção.
+
+- Memória limitada: com WRITE_BEHIND_MAX_PENDING registros pendentes (na fila ou
+  sendo gravados), `submit` espera até WRITE_BEHIND_SUBMIT_TIMEOUT segundos e
+  então lança `QueueFullError`.
+- Durabilidade opcional: com WRITE_BEHIND_JOURNAL, cada registro aceito é anexado
+  a um arquivo (um por processo) antes da resposta; as linhas saem do journal
+  quando o lote delas é commitado. Na criação do app (`init_write_behind`), os
+  journals de processos encerrados são regravados, cada um em uma transação
+  (entrega "pelo menos uma vez"); journals de workers que morrerem depois são
+  assumidos pela fila do próximo processo que a criar. Um rename atômico garante
+  que cada journal seja regravado por um único processo.
+- Ao encerrar o processo (atexit) a fila é drenada.
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import Flask, current_app
+
+from database.models import db, Contact, Feedback
+from utils.metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+# Tabelas aceitas pela fila (nome no journal -> modelo)
+MODELS = {
+    Contact.__tablename__: Contact,
+    Feedback.__tablename__: Feedback,
+}
+
+
+class QueueFullError(Exception):
+    """Fila write-behind cheia; o cliente deve tentar novamente"""
+    pass
+
+
+def _encode(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode_row(row: dict) -> dict:
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class WriteBehindQueue:
+    """Buffer em memória + thread de gravação em lote (uma instância por processo)."""
+
+    def __init__(self, app: Flask, max_pending: int, batch_size: int, flush_interval: float,
+                 submit_timeout: float, journal_path: str | None = None, fsync: bool = False):
+        self.app = app
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.submit_timeout = submit_timeout
+        self.journal_path = f"{journal_path}.{os.getpid()}" if journal_path else None
+        self.fsync = fsync
+        self._buffer: list[tuple[str, dict]] = []
+        self._cond = threading.Condition()
+        self._journal = None
+        self._stopping = False
+        self._in_flight = 0
+        self._metrics = {
+            "accepted": 0, "rejected": 0, "flushed": 0, "flushes": 0,
+            "flush_errors": 0, "replayed": 0, "last_flush_ms": None,
+        }
+        if journal_path:
+            claimed = _claim_journals(journal_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            for path in claimed:
+                self._replay_journal(path)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    # --- API pública -----------------------------------------------------
+
+    def submit(self, table: str, row: dict) -> None:
+        """Enfileira uma linha de `table`.
+
+        Raises:
+            QueueFullError: se a fila continuar cheia após WRITE_BEHIND_SUBMIT_TIMEOUT
+        """
+        with self._cond:
+            deadline = time.monotonic() + self.submit_timeout
+            # Registros sendo gravados ainda ocupam memória: contam para o limite
+            while len(self._buffer) + self._in_flight >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping:
+                    self._metrics["rejected"] += 1
+                    raise QueueFullError("Fila de gravação cheia")
+                self._cond.wait(remaining)
+            self._write_journal([(table, row)])
+            self._buffer.append((table, row))
+            self._metrics["accepted"] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                **self._metrics,
+                "pending": len(self._buffer),
+                "in_flight": self._in_flight,
+                "max_pending": self.max_pending,
+            }
+
+    def drain(self, timeout: float = 10.0) -> None:
+        """Para a thread e grava o que estiver pendente."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+            with self._cond:
+                if not self._buffer:
+                    os.remove(self.journal_path)
+
+    # --- Gravação --------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            if not self._flush():
+                time.sleep(min(self.flush_interval, 1.0))  # espera antes de tentar de novo
+
+    def _flush(self) -> bool:
+        """Grava todos os registros pendentes, em transações de até batch_size linhas."""
+        with self._cond:
+            pending, self._buffer = self._buffer, []
+            self._in_flight = len(pending)
+        if not pending:
+            return True
+        started = time.perf_counter()
+        done = 0
+        try:
+            with self.app.app_context():
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending[start:start + self.batch_size]
+                    self._insert(batch)
+                    done = start + len(batch)
+                    with self._cond:
+                        # Lote commitado: libera espaço e tira as linhas do journal
+                        self._in_flight -= len(batch)
+                        self._metrics["flushed"] += len(batch)
+                        self._rewrite_journal(pending[done:])
+                        self._cond.notify_all()
+        except Exception:
+            logger.exception("Falha ao gravar a fila write-behind")
+            with self._cond:
+                self._buffer[:0] = pending[done:]  # mantém a ordem e tenta de novo
+                self._in_flight = 0
+                self._metrics["flush_errors"] += 1
+                self._cond.notify_all()
+            return False
+        with self._cond:
+            self._metrics["flushes"] += 1
+            self._metrics["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return True
+
+    @staticmethod
+    def _insert(rows: list[tuple[str, dict]]) -> None:
+        """Uma transação com um executemany por tabela."""
+        by_table: dict[str, list] = {}
+        for table, row in rows:
+            by_table.setdefault(table, []).append(row)
+        with db.engine.begin() as conn:
+            for table, table_rows in by_table.items():
+                conn.execute(MODELS[table].__table__.insert(), table_rows)
+
+    # --- Journal ---------------------------------------------------------
+
+    def _write_journal(self, rows: list[tuple[str, dict]]) -> None:
+        if self._journal is None:
+            return
+        for table, row in rows:
+            self._journal.write(json.dumps({"table": table, "row": {k: _encode(v) for k, v in row.items()}}) + "\n")
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _rewrite_journal(self, in_flight: list[tuple[str, dict]] = ()) -> None:
+        """Reescreve o journal com o que ainda não foi gravado (chamado com o lock)."""
+        if self._journal is None:
+            return
+        self._journal.seek(0)
+        self._journal.truncate()
+        self._write_journal(list(in_flight) + self._buffer)
+
+    def _replay_journal(self, path: str) -> None:
+        """Regrava um journal assumido em uma única transação.
+
+        Se a gravação falhar, nada foi gravado: as linhas passam para a fila (e o
+        journal) deste processo e são gravadas com as demais.
+        """
+        rows = _read_journal(path)
+        try:
+            with self.app.app_context():
+                self._insert(rows)
+        except Exception:
+            logger.exception(f"Falha ao regravar o journal {path}; registros movidos para a fila")
+            with self._cond:
+                self._write_journal(rows)
+                self._buffer.extend(rows)
+        else:
+            self._metrics["replayed"] += len(rows)
+            logger.info(f"{len(rows)} registros do journal {path} regravados")
+        os.remove(path)
+
+
+def _claim_journals(journal_path: str) -> list[str]:
+    """Assume os journals de processos encerrados, renomeando-os para este processo.
+
+    O rename é atômico: com vários processos iniciando juntos, cada journal é
+    assumido (e regravado) por um só. Journal assumido por um processo que
+    morreu antes de terminar a regravação volta a ser disputado.
+    """
+    claimed = []
+    for path in glob.glob(f"{journal_path}.*"):
+        parts = path[len(journal_path) + 1:].split(".")
+        if parts[0].isdigit() and len(parts) == 1:
+            owner = int(parts[0])
+        elif len(parts) == 3 and parts[0].isdigit() and parts[1] == "replay" and parts[2].isdigit():
+            owner = int(parts[2])
+        else:
+            continue
+        if owner != os.getpid() and _pid_alive(owner):
+            continue
+        target = f"{journal_path}.{parts[0]}.replay.{os.getpid()}"
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue  # outro processo assumiu primeiro
+        claimed.append(target)
+    return claimed
+
+
+def _read_journal(path: str) -> list[tuple[str, dict]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [(entry["table"], _decode_row(entry["row"])) for entry in map(json.loads, filter(str.strip, f))]
+    return [(table, row) for table, row in rows if table in MODELS]
+
+
+def replay_journals(app: Flask) -> int:
+    """Regrava, cada um em uma transação, os journals de processos encerrados.
+
+    Um journal que falhar volta ao nome original e fica para a fila de um worker.
+
+    Returns:
+        número de registros regravados
+    """
+    replayed = 0
+    for path in _claim_journals(app.config["WRITE_BEHIND_JOURNAL"]):
+        rows = _read_journal(path)
+        try:
+            with app.app_context():
+                WriteBehindQueue._insert(rows)
+        except Exception:
+            logger.exception(f"Falha ao regravar o journal {path}")
+            os.rename(path, path.rsplit(".replay.", 1)[0])
+            continue
+        os.remove(path)
+        replayed += len(rows)
+        logger.info(f"{len(rows)} registros do journal {path} regravados")
+    return replayed
+
+
+def init_write_behind(app: Flask) -> None:
+    """Regrava na inicialização os journals deixados por processos encerrados (ex.: após um crash).
+
+    Com o app pré-carregado (wsgi.py, gunicorn --preload) isso roda uma vez no
+    processo mestre, antes do fork. A fila de cada worker continua sendo criada
+    no primeiro uso e assume os journals de workers que morreram depois disso.
+    """
+    if app.config.get("WRITE_BEHIND_ENABLED", False) and app.config.get("WRITE_BEHIND_JOURNAL"):
+        replay_journals(app)
+
+
+_queue: WriteBehindQueue | None = None
+_queue_pid: int | None = None
+_queue_lock = threading.Lock()
+
+
+def _get_queue() -> WriteBehindQueue:
+    """Fila do processo atual, criada no primeiro uso (e recriada após fork)."""
+    global _queue, _queue_pid
+    if _queue is None or _queue_pid != os.getpid():
+        with _queue_lock:
+            if _queue is None or _queue_pid != os.getpid():
+                config = current_app.config
+                _queue = WriteBehindQueue(
+                    current_app._get_current_object(),
+                    max_pending=config.get("WRITE_BEHIND_MAX_PENDING", 10000),
+                    batch_size=config.get("WRITE_BEHIND_BATCH_SIZE", 500),
+                    flush_interval=config.get("WRITE_BEHIND_FLUSH_INTERVAL", 1.0),
+                    submit_timeout=config.get("WRITE_BEHIND_SUBMIT_TIMEOUT", 1.0),
+                    journal_path=config.get("WRITE_BEHIND_JOURNAL") or None,
+                    fsync=config.get("WRITE_BEHIND_JOURNAL_FSYNC", False),
+                )
+                _queue_pid = os.getpid()
+    return _queue
+
+
+def submit(model, values: dict) -> tuple[dict, bool]:
+    """Grava uma linha de Contact/Feedback pela fila (ou direto, se desativada).
+
+    Returns:
+        (dados serializados, enfileirado). Quando enfileirado o registro ainda não tem id.
+
+    Raises:
+        QueueFullError: se a fila estiver cheia
+    """
+    values = {**values, "created_at": datetime.utcnow()}
+    if not current_app.config.get("WRITE_BEHIND_ENABLED", False):
+        record = model(**values)
+        db.session.add(record)
+        db.session.commit()
+        return record.to_dict(), False
+    _get_queue().submit(model.__tablename__, values)
+    return {k: _encode(v) for k, v in values.items()}, True
+
+
+def queue_stats() -> dict:
+    """Métricas da fila deste processo (zeros se ainda não foi usada)."""
+    if _queue is None or _queue_pid != os.getpid():
+        return {"enabled": current_app.config.get("WRITE_BEHIND_ENABLED", False), "pending": 0}
+    return {"enabled": True, **_queue.stats()}
+
+
+@register_collector(counters={
+    f"write_behind_{name}" for name in ("accepted", "rejected", "flushed", "flushes", "flush_errors", "replayed")
+})
+def _queue_metrics_for_prometheus() -> dict:
+    return {
+        f"write_behind_{name}": int(value)
+        for name, value in queue_stats().items() if isinstance(value, (int, bool))
+    }
+
+
+@atexit.register
+def _drain_at_exit() -> None:
+    if _queue is not None and _queue_pid == os.getpid():
+        _queue.drain()
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """App de testes com banco SQLite em memória já migrado."""
+    app = create_app("testing")
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def ong_headers(client):
+    """Cabeçalho de autorização de uma ONG recém-cadastrada."""
+    response = client.post("/auth/register", json={
+        "name": "ONG Teste", "email": "ong@teste.com", "password": "segredo123", "role": "ong",
+    })
+    token = response.get_json()["data"]["token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def create_animal(client, ong_headers):
+    """Cria um animal pela API e devolve o JSON gravado."""
+    def create(**fields):
+        data = {
+            "name": "Rex", "species": "Cachorro", "age": "2 anos", "size": "Médio",
+            "temperament": "Dócil", "city": "São Paulo", "description": "Muito carinhoso",
+            "history": "Resgatado na rua",
+        }
+        data.update(fields)
+        response = client.post("/animals", json=data, headers=ong_headers)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["data"]
+    return create
@@ -0,0 +1,34 @@
+import base64
+import os
+
+from database.models import db, Job
+from services.animal_import import validate_record
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _record(**fields):
+    record = {
+        "name": "Rex", "species": "Cachorro", "age": "2 anos", "size": "Médio",
+        "temperament": "Dócil", "city": "São Paulo", "description": "Carinhoso", "history": "Resgatado",
+        "image": "data:image/png;base64," + base64.b64encode(PNG + os.urandom(64)).decode(),
+    }
+    record.update(fields)
+    return record
+
+
+def test_invalid_record_does_not_store_its_image(app, tmp_path):
+    app.config["IMAGE_STORE_PATH"] = str(tmp_path)
+    values, errors = validate_record(_record(status="Sumido", name="x" * 500))
+    assert values is None and len(errors) == 2
+    assert os.listdir(tmp_path) == []
+    assert Job.query.count() == 0
+
+
+def test_valid_record_stores_its_image(app, tmp_path):
+    app.config["IMAGE_STORE_PATH"] = str(tmp_path)
+    values, errors = validate_record(_record())
+    assert errors == []
+    assert values["image"].startswith("/images/")
+    db.session.commit()
+    assert Job.query.filter_by(name="images.variants").count() == 1
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("asgiref")
+
+from asgi import AsyncAddressApp  # noqa: E402
+from utils.metrics import REQUEST_LATENCY  # noqa: E402
+from utils.rate_limit import init_rate_limiting  # noqa: E402
+
+
+def _get_many(asgi_app, path, count):
+    async def run():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get(path) for _ in range(count)]
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def limited_app(app):
+    app.config.update(
+        RATE_LIMIT_ENABLED=True,
+        RATE_LIMIT_POLICIES={"address": {"methods": ("GET",), "rate": "2/minute"}},
+    )
+    init_rate_limiting(app)
+    return app
+
+
+def test_address_fast_path_applies_rate_limit(limited_app):
+    # CEP inválido: respondido pelo asgi.py sem banco nem ViaCEP
+    responses = _get_many(AsyncAddressApp(limited_app), "/address/123", 3)
+    assert [r.status_code for r in responses] == [400, 400, 429]
+    assert responses[0].headers["X-RateLimit-Limit"] == "2/minute"
+    assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+    assert int(responses[2].headers["Retry-After"]) >= 1
+
+
+def test_address_fast_path_records_metrics(app):
+    def observed():
+        return sum(sum(series[:-1]) for labels, series in REQUEST_LATENCY._series.items()
+                   if labels[1] == "/address/<cep>")
+    before = observed()
+    response, = _get_many(AsyncAddressApp(app), "/address/123", 1)
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+    assert observed() == before + 1
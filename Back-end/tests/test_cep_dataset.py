@@ -0,0 +1,20 @@
+from services.cep_dataset import normalize_record
+
+
+def test_normalize_record_coerces_values():
+    row = normalize_record({"cep": "01001-000", "logradouro": None, "bairro": None,
+                            "localidade": " São Paulo ", "uf": "sp"})
+    assert row == {"cep": "01001000", "street": "", "neighborhood": "", "region": "",
+                   "city": "São Paulo", "state": "SP"}
+
+
+def test_normalize_record_non_string_values():
+    row = normalize_record({"cep": 1001000, "localidade": "São Paulo", "uf": 35, "logradouro": 123})
+    assert row["cep"] == "01001000"
+    assert row["state"] == "35"
+    assert row["street"] == "123"
+
+
+def test_normalize_record_rejects_incomplete():
+    assert normalize_record({"cep": "123", "localidade": "X", "uf": "SP"}) is None
+    assert normalize_record({"cep": "01001000", "localidade": None, "uf": "SP"}) is None
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from database.models import db, AnimalChange
+from services.change_feed import compact_changes, parse_cursor
+
+import pytest
+
+
+def _feed(client, **params):
+    response = client.get("/animals/changes", query_string=params)
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+def _age_changes(days):
+    db.session.query(AnimalChange).update({"changed_at": datetime.utcnow() - timedelta(days=days)})
+    db.session.commit()
+
+
+def test_parse_cursor():
+    assert parse_cursor(None) == 0
+    assert parse_cursor("") == 0
+    assert parse_cursor("42") == 42
+    for value in ("-1", "abc", "1.5"):
+        with pytest.raises(ValueError):
+            parse_cursor(value)
+
+
+def test_cursor_returns_only_later_changes(client, ong_headers, create_animal):
+    first, second = create_animal(name="A"), create_animal(name="B")
+    feed = _feed(client)
+    assert [change["id"] for change in feed["changes"]] == [first["id"], second["id"]]
+    assert not feed["has_more"] and not feed["reset"]
+
+    client.put(f"/animals/{first['id']}", json={"city": "Natal"}, headers=ong_headers)
+    client.put(f"/animals/{first['id']}", json={"city": "Recife"}, headers=ong_headers)
+    client.delete(f"/animals/{second['id']}", headers=ong_headers)
+
+    feed = _feed(client, since=feed["cursor"])
+    # Uma entrada por animal, com o estado mais recente
+    assert [(change["op"], change["id"]) for change in feed["changes"]] == [
+        ("upsert", first["id"]), ("delete", second["id"]),
+    ]
+    assert feed["changes"][0]["animal"]["city"] == "Recife"
+    assert _feed(client, since=feed["cursor"])["changes"] == []
+
+
+def test_pagination_follows_cursor(client, create_animal):
+    ids = [create_animal(name=f"Pet {i}")["id"] for i in range(5)]
+    seen, cursor = [], "0"
+    while True:
+        feed = _feed(client, since=cursor, limit=2)
+        seen += [change["id"] for change in feed["changes"]]
+        cursor = feed["cursor"]
+        if not feed["has_more"]:
+            break
+    assert seen == ids
+
+
+def test_cursor_before_horizon_resets(client, create_animal):
+    for i in range(3):
+        create_animal(name=f"Pet {i}")
+    _age_changes(40)
+    assert compact_changes(30) == 2  # a alteração mais recente é mantida
+    assert _feed(client, since=0)["reset"]
+    assert not _feed(client, since=2)["reset"]
+
+
+def test_full_compaction_does_not_reuse_seq(client, ong_headers, create_animal):
+    ids = [create_animal(name=f"Pet {i}")["id"] for i in range(5)]
+    _age_changes(40)
+    compact_changes(-1)  # tudo é mais antigo que o corte
+    client.delete(f"/animals/{ids[0]}", headers=ong_headers)
+
+    # Um cliente que já estava no fim antes da compactação recebe a exclusão, sem reset
+    feed = _feed(client, since=5)
+    assert not feed["reset"]
+    assert [(change["op"], change["id"]) for change in feed["changes"]] == [("delete", ids[0])]
+    assert int(feed["cursor"]) == 6
@@ -0,0 +1,22 @@
+import zlib
+
+from utils.compression import _compress_stream
+
+
+def test_streamed_gzip_flushes_each_chunk_past_the_threshold(app):
+    app.config.update(COMPRESS_STREAM_FLUSH_BYTES=1, COMPRESS_STREAM_FLUSH_INTERVAL=60)
+    decompressor = zlib.decompressobj(31)
+    stream = _compress_stream(iter(["linha 1\n", b"linha 2\n"]), "gzip", app)
+
+    # Cada linha pode ser lida pelo cliente antes do fim da resposta
+    assert decompressor.decompress(next(stream)) == b"linha 1\n"
+    assert decompressor.decompress(next(stream)) == b"linha 2\n"
+    assert decompressor.decompress(b"".join(stream)) == b""
+    assert decompressor.eof
+
+
+def test_streamed_gzip_buffers_below_the_threshold(app):
+    app.config.update(COMPRESS_STREAM_FLUSH_BYTES=1 << 20, COMPRESS_STREAM_FLUSH_INTERVAL=60)
+    pieces = list(_compress_stream(iter(["a" * 100] * 10), "gzip", app))
+    assert len(pieces) == 2  # cabeçalho gzip e o restante em finish()
+    assert zlib.decompress(b"".join(pieces), 31) == b"a" * 1000
@@ -0,0 +1,55 @@
+from database.models import Animal
+from services.geocoding import Gazetteer, Place, get_gazetteer, nearby, resolve_near, split_city
+
+
+def test_split_city():
+    assert split_city("Campinas - SP") == ("Campinas", "SP")
+    assert split_city("Campinas/sp") == ("Campinas", "SP")
+    assert split_city("São Paulo") == ("São Paulo", None)
+
+
+def test_gazetteer_homonyms_need_state_unless_capital():
+    gazetteer = Gazetteer([
+        (Place("Bom Jesus", "PI", -9.07, -44.36), False),
+        (Place("Bom Jesus", "RS", -28.67, -50.43), False),
+        (Place("Palmas", "TO", -10.18, -48.33), True),
+        (Place("Palmas", "PR", -26.48, -51.99), False),
+    ])
+    assert gazetteer.find("Bom Jesus") is None
+    assert gazetteer.find("bom jesus", "rs").state == "RS"
+    assert gazetteer.find("Palmas").state == "TO"
+    assert gazetteer.find("Palmas - PR").state == "PR"
+
+
+def test_resolve_near_city(app):
+    assert resolve_near("sao paulo").name == "São Paulo"
+    assert resolve_near("Cidade Inexistente") is None
+    assert resolve_near("123") is None
+
+
+def test_nearby_filters_by_radius(app, create_animal):
+    for city in ("São Paulo", "Guarulhos", "Campinas", "Santos", "Rio de Janeiro", "Cidade Inexistente"):
+        create_animal(name=city, city=city)
+    names = {animal.id: animal.name for animal in Animal.query}
+    center = get_gazetteer().find("São Paulo")
+
+    def found(radius_km):
+        return [(names[animal_id], distance) for animal_id, distance in nearby(Animal.query, center, radius_km)]
+
+    within_25 = found(25)
+    assert [name for name, _ in within_25] == ["São Paulo", "Guarulhos"]
+    assert within_25[0][1] == 0
+    # Santos (~55 km) entra antes de Campinas (~84 km); o Rio (~361 km) fica de fora
+    assert [name for name, _ in found(100)] == ["São Paulo", "Guarulhos", "Santos", "Campinas"]
+    assert "Rio de Janeiro" in [name for name, _ in found(400)]
+
+
+def test_nearby_endpoint(client, create_animal):
+    create_animal(name="Perto", city="Osasco")
+    create_animal(name="Longe", city="Rio de Janeiro")
+    response = client.get("/animals", query_string={"near": "São Paulo - SP", "radius_km": 50})
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert [item["name"] for item in data["items"]] == ["Perto"]
+    assert data["items"][0]["distance_km"] > 0
+    assert client.get("/animals", query_string={"near": "Atlântida"}).status_code == 404
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from utils.geohash import (
+    BASE32, RANGE_END, adjacent, covering_ranges, distance_km, encode, neighborhood, precision_for_radius,
+)
+
+
+def _bounds(cell):
+    """(lat_min, lat_max, lon_min, lon_max) da célula."""
+    lat, lon = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = BASE32.index(char)
+        for bit in range(4, -1, -1):
+            interval = lon if even else lat
+            middle = (interval[0] + interval[1]) / 2
+            interval[0 if value >> bit & 1 else 1] = middle
+            even = not even
+    return lat[0], lat[1], lon[0], lon[1]
+
+
+def test_encode_known_value():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_adjacent_known_cells():
+    assert [adjacent("dqcjq", d) for d in "nsew"] == ["dqcjw", "dqcjn", "dqcjr", "dqcjm"]
+    assert set(neighborhood("dqcjq")) == {"dqcjq", "dqcjw", "dqcjn", "dqcjr", "dqcjm",
+                                          "dqcjx", "dqcjt", "dqcjp", "dqcjj"}
+
+
+def test_adjacent_crosses_parent_cell():
+    # "6gyf" está na borda leste do pai "6gy": o vizinho tem outro prefixo
+    east = adjacent("6gyf", "e")
+    assert not east.startswith("6gy")
+    lat_min, lat_max, lon_min, _ = _bounds(east)
+    assert lon_min == pytest.approx(_bounds("6gyf")[3])
+    assert (lat_min, lat_max) == pytest.approx(_bounds("6gyf")[:2])
+
+
+def test_adjacent_wraps_at_antimeridian():
+    west_edge, east_edge = encode(-10.0, -179.99, 5), encode(-10.0, 179.99, 5)
+    assert adjacent(west_edge, "w") == east_edge
+    assert adjacent(east_edge, "e") == west_edge
+
+
+def test_adjacent_matches_geometry():
+    rng = random.Random(7)
+    for _ in range(500):
+        precision = rng.randint(1, 8)
+        cell = encode(rng.uniform(-80, 80), rng.uniform(-180, 180), precision)
+        lat_min, lat_max, lon_min, lon_max = _bounds(cell)
+        height, width = lat_max - lat_min, lon_max - lon_min
+        center_lat, center_lon = (lat_min + lat_max) / 2, (lon_min + lon_max) / 2
+        if center_lat + height > 90 or center_lat - height < -90:
+            continue  # sem vizinho além dos polos
+        wrap = lambda lon: (lon + 180) % 360 - 180  # noqa: E731
+        assert adjacent(cell, "n") == encode(center_lat + height, center_lon, precision)
+        assert adjacent(cell, "s") == encode(center_lat - height, center_lon, precision)
+        assert adjacent(cell, "e") == encode(center_lat, wrap(center_lon + width), precision)
+        assert adjacent(cell, "w") == encode(center_lat, wrap(center_lon - width), precision)
+
+
+def test_covering_ranges_merge_consecutive_prefixes():
+    ranges = covering_ranges(-23.5505, -46.6333, 25, 6)
+    cells = sorted(neighborhood(encode(-23.5505, -46.6333, precision_for_radius(-23.5505, 25, 6))))
+    assert len(ranges) < len(cells)
+    for start, end in ranges:
+        assert start < end and end.endswith(RANGE_END)
+    # Cada célula da vizinhança cai em algum intervalo
+    for cell in cells:
+        assert any(start <= cell < end for start, end in ranges)
+    # Intervalos disjuntos e ordenados
+    assert all(a[1] <= b[0] for a, b in zip(ranges, ranges[1:]))
+
+
+def test_covering_ranges_contain_the_circle():
+    rng = random.Random(11)
+    for _ in range(200):
+        lat, lon = rng.uniform(-60, 60), rng.uniform(-179, 179)
+        radius = rng.choice([1, 5, 25, 100])
+        ranges = covering_ranges(lat, lon, radius, 6)
+        for _ in range(20):
+            # Ponto a até `radius` km do centro (aproximação local em graus)
+            point_lat = lat + rng.uniform(-1, 1) * radius / 111.32
+            point_lon = lon + rng.uniform(-1, 1) * radius / 111.32
+            if distance_km(lat, lon, point_lat, point_lon) > radius:
+                continue
+            cell = encode(point_lat, point_lon, 6)
+            assert any(start <= cell < end for start, end in ranges), (lat, lon, radius, point_lat, point_lon)
+
+
+def test_covering_ranges_across_antimeridian():
+    ranges = covering_ranges(-17.0, 179.99, 20, 6)
+    cell = encode(-17.0, -179.95, 6)
+    assert any(start <= cell < end for start, end in ranges)
+
+
+def test_distance_km():
+    assert distance_km(-23.5505, -46.6333, -23.5505, -46.6333) == 0
+    # São Paulo -> Rio de Janeiro
+    assert distance_km(-23.5505, -46.6333, -22.9068, -43.1729) == pytest.approx(361, abs=1)
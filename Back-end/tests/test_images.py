@@ -0,0 +1,34 @@
+import io
+import json
+import os
+
+from database.models import db, Job
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+def _upload(client, headers, data):
+    return client.post("/images", data={"file": (io.BytesIO(data), "foto.png")},
+                       headers=headers, content_type="multipart/form-data")
+
+
+def test_upload_queues_variants_job(app, client, ong_headers, tmp_path):
+    app.config["IMAGE_STORE_PATH"] = str(tmp_path)
+    data = PNG + os.urandom(64)
+    response = _upload(client, ong_headers, data)
+    assert response.status_code == 201
+    url = response.get_json()["data"]["url"]
+
+    db.session.rollback()  # o teste compartilha a sessão do app: só vale o que foi commitado
+    jobs = Job.query.filter_by(name="images.variants").all()
+    assert [json.loads(job.payload)["hash"] for job in jobs] == [url.rsplit("/", 1)[1]]
+
+    # Reenvio do mesmo arquivo: mesma URL, sem tarefa duplicada
+    assert _upload(client, ong_headers, data).get_json()["data"]["url"] == url
+    assert Job.query.filter_by(name="images.variants").count() == 1
+
+
+def test_upload_rejects_non_image(app, client, ong_headers, tmp_path):
+    app.config["IMAGE_STORE_PATH"] = str(tmp_path)
+    assert _upload(client, ong_headers, b"not an image").status_code == 400
+    assert Job.query.count() == 0
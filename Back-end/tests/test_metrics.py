@@ -0,0 +1,26 @@
+from utils.metrics import metric_type, metrics_text, register_collector, _collectors
+
+
+def test_metric_type():
+    assert metric_type("jobs_done_total") == "counter"
+    assert metric_type("cep_cache_memory_hits", frozenset({"cep_cache_memory_hits"})) == "counter"
+    assert metric_type("sse_subscribers") == "gauge"
+
+
+def test_collector_types_and_labels(app):
+    @register_collector(counters={"test_hits"})
+    def collector():
+        return {
+            "test_hits": 3,
+            "test_size": 7,
+            'test_rejected_total{reason="rate"}': 1,
+            'test_rejected_total{reason="concurrency"}': 2,
+        }
+    try:
+        lines = metrics_text().splitlines()
+    finally:
+        _collectors.pop()
+    assert "# TYPE test_hits counter" in lines
+    assert "# TYPE test_size gauge" in lines
+    assert lines.count("# TYPE test_rejected_total counter") == 1
+    assert 'test_rejected_total{reason="concurrency"} 2' in lines
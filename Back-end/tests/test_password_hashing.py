@@ -0,0 +1,45 @@
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from utils import password_hashing
+from utils.password_hashing import HashingBusyError, needs_rehash
+
+
+def _sleep_worker(seconds):
+    time.sleep(seconds)
+    return "ok"
+
+
+def test_needs_rehash_compares_method_and_salt_length(app):
+    app.config.update(PASSWORD_HASH_METHOD="pbkdf2:sha256:1000", PASSWORD_SALT_LENGTH=16)
+    assert not needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:1000", salt_length=16))
+    assert needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:1000", salt_length=8))
+    assert needs_rehash(generate_password_hash("x", method="pbkdf2:sha256:2000", salt_length=16))
+
+
+def test_pool_timeout_raises_busy(app):
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_TIMEOUT=0.05)
+    try:
+        with pytest.raises(HashingBusyError):
+            password_hashing._run(_sleep_worker, 0.5)
+    finally:
+        password_hashing._pool.shutdown(cancel_futures=True)
+        password_hashing._pool = None
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes(app):
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_TIMEOUT=0.05)
+    try:
+        with pytest.raises(HashingBusyError, match="Tempo esgotado"):
+            password_hashing._run(_sleep_worker, 1)
+        # O hash anterior continua rodando no pool: a vaga não foi devolvida
+        with pytest.raises(HashingBusyError, match="Muitas requisições"):
+            password_hashing._run(_sleep_worker, 0)
+        app.config["PASSWORD_HASH_TIMEOUT"] = 10
+        time.sleep(1.5)
+        assert password_hashing._run(_sleep_worker, 0) == "ok"
+    finally:
+        password_hashing._pool.shutdown(cancel_futures=True)
+        password_hashing._pool = None
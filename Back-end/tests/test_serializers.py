@@ -0,0 +1,37 @@
+from database.models import db, Adoption, Animal
+from utils.serializers import projection
+
+
+def _adoption(animal_id):
+    adoption = Adoption(
+        animal_id=animal_id, adopter_name="Ana", adopter_email="ana@teste.com", address_cep="01001-000",
+        address_street="Praça da Sé", address_number="1", address_city="São Paulo", address_state="SP",
+    )
+    db.session.add(adoption)
+    db.session.commit()
+    return adoption
+
+
+def _rows(adoption_projection):
+    return (Adoption.query.outerjoin(Animal, Adoption.animal_id == Animal.id)
+            .with_entities(*adoption_projection.columns).order_by(Adoption.id).all())
+
+
+def test_projection_matches_to_dict_with_embedded_relation(app, create_animal):
+    animal = create_animal()
+    with_animal, orphan = _adoption(animal["id"]), _adoption(999999)
+    adoption_projection = projection(Adoption, None, ("animal", Animal, ("id", "name")))
+
+    items = app.json.loads(app.json.dumps(adoption_projection.serialize_all(_rows(adoption_projection))))
+    assert items == [
+        with_animal.to_dict(animal_fields=("id", "name")),
+        orphan.to_dict(animal_fields=("id", "name")),
+    ]
+    assert items[1]["animal"] is None
+
+
+def test_projection_leaves_out_keyset_columns(app, create_animal):
+    create_animal(name="Mia")
+    animal_projection = projection(Animal, ("name",))
+    rows = Animal.query.with_entities(*animal_projection.columns).all()
+    assert animal_projection.serialize_all(rows) == [{"name": "Mia"}]
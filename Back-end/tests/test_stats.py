@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from database.models import db
+from services.stats import read_stats, rebuild_counters
+
+ADOPTION = {
+    "adopter_name": "Ana", "adopter_email": "ana@teste.com", "address_cep": "01001000",
+    "address_street": "Praça da Sé", "address_number": "1", "address_city": "São Paulo", "address_state": "SP",
+}
+
+
+def _stats(client, path="/stats", headers=None):
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()["data"]
+
+
+def test_animal_writes_update_counters(client, ong_headers, create_animal):
+    dog = create_animal(species="Cachorro", city="Santos")
+    create_animal(species="Gato", city="Santos")
+    stats = _stats(client)["animals"]
+    assert stats["total"] == 2
+    assert stats["species"] == {"Cachorro": 1, "Gato": 1}
+    assert stats["city"] == {"Santos": 2}
+
+    client.put(f"/animals/{dog['id']}", json={"city": "Campinas", "status": "Adotado"}, headers=ong_headers)
+    stats = _stats(client)["animals"]
+    assert stats["city"] == {"Santos": 1, "Campinas": 1}
+    assert stats["status"] == {"Disponível": 1, "Adotado": 1}
+
+    client.delete(f"/animals/{dog['id']}", headers=ong_headers)
+    stats = _stats(client)["animals"]
+    assert stats["total"] == 1
+    assert stats["species"] == {"Gato": 1}
+    assert stats["city"] == {"Santos": 1}
+
+
+def test_adoption_funnel(client, ong_headers, create_animal):
+    animal = create_animal()
+    response = client.post("/adoptions", json={**ADOPTION, "animal_id": animal["id"]})
+    assert response.status_code == 201
+    adoption_id = response.get_json()["data"]["id"]
+    today = datetime.utcnow().date().isoformat()
+
+    adoptions = _stats(client)["adoptions"]
+    assert adoptions["total"] == 1
+    assert adoptions["status"] == {"Pending": 1, "Approved": 0, "Rejected": 0}
+    assert adoptions["daily"] == [{"date": today, "created": 1, "approved": 0, "rejected": 0}]
+
+    client.put(f"/adoptions/{adoption_id}/status", json={"status": "Approved"}, headers=ong_headers)
+    adoptions = _stats(client, "/stats/mine", ong_headers)["adoptions"]
+    assert adoptions["status"] == {"Pending": 0, "Approved": 1, "Rejected": 0}
+    assert adoptions["daily"] == [{"date": today, "created": 1, "approved": 1, "rejected": 0}]
+
+
+def test_incremental_counters_match_rebuild(client, ong_headers, create_animal):
+    animals = [create_animal(species=species) for species in ("Cachorro", "Gato", "Gato")]
+    client.put(f"/animals/{animals[1]['id']}", json={"size": "Grande"}, headers=ong_headers)
+    client.post("/adoptions", json={**ADOPTION, "animal_id": animals[0]["id"]})
+    client.delete(f"/animals/{animals[2]['id']}", headers=ong_headers)
+    incremental = read_stats()
+
+    with db.engine.begin() as conn:
+        rebuild_counters(conn)
+    assert read_stats() == incremental
+
+
+def test_invalid_window_parameters_are_rejected(client):
+    response = client.get("/stats?cities=0")
+    assert response.status_code == 400
+    assert "cities" in response.get_json()["message"]
+    assert client.get("/stats?cities=1000").status_code == 400
+    assert "days" in client.get("/stats?days=0").get_json()["message"]
+    assert client.get("/stats?days=7&cities=5").status_code == 200
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+
+import pytest
+
+from database.models import db, Feedback
+from services.write_behind import QueueFullError, WriteBehindQueue, init_write_behind
+
+
+def _journal_line(text):
+    return json.dumps({"table": "feedback", "row": {"mensagem": text, "created_at": "2026-01-01T00:00:00"}}) + "\n"
+
+
+def _queue(app, **options):
+    defaults = dict(max_pending=10, batch_size=2, flush_interval=60, submit_timeout=0)
+    return WriteBehindQueue(app, **{**defaults, **options})
+
+
+def test_dead_process_journals_are_claimed_and_replayed(app, tmp_path):
+    base = str(tmp_path / "wb.journal")
+    dead_pid = 999999  # acima do pid_max padrão: nenhum processo com esse pid
+    files = {
+        f"{base}.{dead_pid}": "morto",
+        f"{base}.999998.replay.{dead_pid}": "regravação interrompida",
+        f"{base}.999997.replay.{os.getppid()}": "assumido por outro worker",
+    }
+    for path, text in files.items():
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_journal_line(text))
+
+    _queue(app, journal_path=base).drain()
+    assert sorted(f.mensagem for f in Feedback.query) == ["morto", "regravação interrompida"]
+    assert os.listdir(tmp_path) == [f"wb.journal.999997.replay.{os.getppid()}"]
+
+
+def test_init_write_behind_replays_journals_at_startup(app, tmp_path, monkeypatch):
+    base = str(tmp_path / "wb.journal")
+    with open(f"{base}.999999", "w", encoding="utf-8") as f:
+        f.writelines(_journal_line(f"msg {i}") for i in range(2))
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_ENABLED", True)
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_JOURNAL", base)
+
+    init_write_behind(app)
+    assert sorted(f.mensagem for f in Feedback.query) == ["msg 0", "msg 1"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_startup_replay_keeps_the_journal(app, tmp_path, monkeypatch):
+    base = str(tmp_path / "wb.journal")
+    with open(f"{base}.999999", "w", encoding="utf-8") as f:
+        f.write(_journal_line("msg"))
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_ENABLED", True)
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_JOURNAL", base)
+
+    def fail(rows):
+        raise RuntimeError("banco indisponível")
+
+    monkeypatch.setattr(WriteBehindQueue, "_insert", staticmethod(fail))
+    init_write_behind(app)
+    assert os.listdir(tmp_path) == ["wb.journal.999999"]
+    assert Feedback.query.count() == 0
+
+
+def test_failed_replay_moves_rows_to_the_queue(app, tmp_path, monkeypatch):
+    base = str(tmp_path / "wb.journal")
+    with open(f"{base}.999999", "w", encoding="utf-8") as f:
+        f.writelines(_journal_line(f"msg {i}") for i in range(3))
+    original = WriteBehindQueue._insert
+    calls = []
+
+    def fail_first(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise RuntimeError("banco indisponível")
+        original(rows)
+
+    monkeypatch.setattr(WriteBehindQueue, "_insert", staticmethod(fail_first))
+    queue = _queue(app, journal_path=base, batch_size=10)
+    assert Feedback.query.count() == 0
+    assert queue.stats()["pending"] == 3
+    queue.drain()
+    assert Feedback.query.count() == 3  # sem duplicar o que a transação desfez
+    assert calls[0] == 3
+
+
+def test_in_flight_rows_count_towards_max_pending(app, monkeypatch):
+    release = threading.Event()
+    original = WriteBehindQueue._insert
+
+    def slow_insert(rows):
+        release.wait(5)
+        original(rows)
+
+    monkeypatch.setattr(WriteBehindQueue, "_insert", staticmethod(slow_insert))
+    queue = _queue(app, max_pending=2, batch_size=10)
+    queue.submit("feedback", {"mensagem": "a"})
+    queue.submit("feedback", {"mensagem": "b"})
+    flusher = threading.Thread(target=queue._flush)
+    flusher.start()
+    try:
+        with pytest.raises(QueueFullError):
+            queue.submit("feedback", {"mensagem": "c"})
+    finally:
+        release.set()
+        flusher.join()
+    queue.submit("feedback", {"mensagem": "c"})
+    queue.drain()
+    assert db.session.query(Feedback).count() == 3
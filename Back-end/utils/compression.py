@@ -0,0 +1,101 @@
+"""
+Compressão das respostas (gzip e brotli)
+Aplicada em after_request conforme o Accept-Encoding do cliente, a partir de
+COMPRESS_MIN_SIZE bytes. Respostas em streaming (ex.: exportações) são
+comprimidas em fluxo, sem juntar o corpo em memória, com um sync flush a cada
+COMPRESS_STREAM_FLUSH_BYTES de entrada ou COMPRESS_STREAM_FLUSH_INTERVAL segundos
+para que o cliente receba as linhas já geradas.
+"""
+
+import gzip
+import time
+import zlib
+from typing import Iterable, Iterator
+
+from flask import Flask, Response, request
+
+try:
+    import brotli
+except ImportError:  # dependência opcional
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = (
+    "application/json", "application/x-ndjson", "application/msgpack",
+    "application/x-msgpack", "text/csv", "text/html", "text/plain",
+)
+
+
+def _available_encodings(app: Flask) -> list:
+    encodings = app.config.get("COMPRESS_ALGORITHMS", ("br", "gzip"))
+    return [e for e in encodings if e == "gzip" or (e == "br" and brotli is not None)]
+
+
+def _stream_compressor(encoding: str, app: Flask) -> tuple:
+    """Funções (comprimir pedaço, sync flush, finalizar) para o encoding escolhido."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=app.config.get("COMPRESS_BR_QUALITY", 5))
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits=31: formato gzip (cabeçalho + CRC), como gzip.compress
+    compressor = zlib.compressobj(app.config.get("COMPRESS_LEVEL", 6), zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _compress(encoding: str, data: bytes, app: Flask) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=app.config.get("COMPRESS_BR_QUALITY", 5))
+    return gzip.compress(data, compresslevel=app.config.get("COMPRESS_LEVEL", 6), mtime=0)
+
+
+def _compress_stream(chunks: Iterable, encoding: str, app: Flask) -> Iterator[bytes]:
+    compress, flush, finish = _stream_compressor(encoding, app)
+    flush_bytes = app.config.get("COMPRESS_STREAM_FLUSH_BYTES", 16384)
+    flush_interval = app.config.get("COMPRESS_STREAM_FLUSH_INTERVAL", 1.0)
+    pending, last_flush = 0, time.monotonic()
+    for chunk in chunks:
+        chunk = chunk.encode() if isinstance(chunk, str) else chunk
+        data = compress(chunk)
+        pending += len(chunk)
+        # Sem o flush o compressor retém a saída até juntar um bloco inteiro
+        if pending >= flush_bytes or time.monotonic() - last_flush >= flush_interval:
+            data += flush()
+            pending, last_flush = 0, time.monotonic()
+        if data:
+            yield data
+    yield finish()
+
+
+def _should_compress(response: Response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.direct_passthrough
+        and "Content-Encoding" not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+
+def init_compression(app: Flask) -> None:
+    """Registra a compressão das respostas (desligada com COMPRESS_ENABLED=False)."""
+
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if not app.config.get("COMPRESS_ENABLED", True) or not _should_compress(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = request.accept_encodings.best_match(_available_encodings(app))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, app)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < app.config.get("COMPRESS_MIN_SIZE", 1024):
+                return response
+            response.set_data(_compress(encoding, data, app))
+        response.headers["Content-Encoding"] = encoding
+        # O ETag forte identifica o corpo sem compressão; a versão comprimida é equivalente
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,118 @@
+"""
+Geohash: índice espacial em grade para buscas por raio
+Cada ponto vira uma string base32 em que cada caractere subdivide a célula
+anterior; pontos próximos compartilham o prefixo. Uma busca por raio escolhe a
+precisão cuja célula é pelo menos do tamanho do raio e consulta a célula do
+centro mais as 8 vizinhas: 9 prefixos, ou seja, poucos intervalos em um índice
+B-tree comum (`geohash >= prefixo AND geohash < prefixo + "{"`).
+"""
+
+import math
+from functools import lru_cache
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: i for i, char in enumerate(BASE32)}
+# Maior que qualquer caractere do alfabeto: limite superior dos intervalos por prefixo
+RANGE_END = "{"
+
+EARTH_RADIUS_KM = 6371.0
+_KM_PER_DEGREE = 111.32
+
+# Tabelas de vizinhança por direção, para células de comprimento par/ímpar
+_NEIGHBORS = {
+    "n": ("p0r21436x8zb9dcf5h7kjnmqesgutwvy", "bc01fg45238967deuvhjyznpkmstqrwx"),
+    "s": ("14365h7k9dcfesgujnmqp0r2twvyx8zb", "238967debc01fg45kmstqrwxuvhjyznp"),
+    "e": ("bc01fg45238967deuvhjyznpkmstqrwx", "p0r21436x8zb9dcf5h7kjnmqesgutwvy"),
+    "w": ("238967debc01fg45kmstqrwxuvhjyznp", "14365h7k9dcfesgujnmqp0r2twvyx8zb"),
+}
+_BORDERS = {
+    "n": ("prxz", "bcfguvyz"),
+    "s": ("028b", "0145hjnp"),
+    "e": ("bcfguvyz", "prxz"),
+    "w": ("0145hjnp", "028b"),
+}
+
+
+def encode(latitude: float, longitude: float, precision: int) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bit, value, even = 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[value])
+            bit, value = 0, 0
+    return "".join(chars)
+
+
+def adjacent(cell: str, direction: str) -> str:
+    """Célula vizinha na direção n, s, e ou w (mesma precisão)."""
+    last, parent = cell[-1], cell[:-1]
+    kind = len(cell) % 2
+    if last in _BORDERS[direction][kind] and parent:
+        parent = adjacent(parent, direction)
+    return parent + BASE32[_NEIGHBORS[direction][kind].index(last)]
+
+
+@lru_cache(maxsize=4096)
+def neighborhood(cell: str) -> tuple[str, ...]:
+    """A célula e suas 8 vizinhas (calculadas uma vez por célula)."""
+    north, south = adjacent(cell, "n"), adjacent(cell, "s")
+    return (
+        cell, north, south, adjacent(cell, "e"), adjacent(cell, "w"),
+        adjacent(north, "e"), adjacent(north, "w"), adjacent(south, "e"), adjacent(south, "w"),
+    )
+
+
+def cell_size_km(precision: int, latitude: float = 0.0) -> tuple[float, float]:
+    """(altura, largura) em km de uma célula na latitude dada."""
+    bits = 5 * precision
+    lat_bits, lon_bits = bits // 2, bits - bits // 2
+    height = 180 / 2 ** lat_bits * _KM_PER_DEGREE
+    width = 360 / 2 ** lon_bits * _KM_PER_DEGREE * math.cos(math.radians(latitude))
+    return height, width
+
+
+def precision_for_radius(latitude: float, radius_km: float, max_precision: int) -> int:
+    """Maior precisão cuja célula cobre o raio, para que a vizinhança 3x3 contenha o círculo."""
+    # A largura das células diminui com a latitude: usa o ponto do círculo mais longe do equador
+    farthest = min(89.0, abs(latitude) + radius_km / _KM_PER_DEGREE)
+    for precision in range(max_precision, 0, -1):
+        if min(cell_size_km(precision, farthest)) >= radius_km:
+            return precision
+    return 1
+
+
+def covering_ranges(latitude: float, longitude: float, radius_km: float, max_precision: int) -> list[tuple[str, str]]:
+    """Intervalos [início, fim) de geohash que contêm todos os pontos a até `radius_km` km.
+
+    Prefixos consecutivos no alfabeto (ex.: "6gyf" e "6gyg") viram um intervalo só.
+    """
+    precision = precision_for_radius(latitude, radius_km, max_precision)
+    cells = sorted(set(neighborhood(encode(latitude, longitude, precision))))
+    ranges: list[list[str]] = []
+    for cell in cells:
+        if ranges:
+            last = ranges[-1][1]
+            if last[:-1] == cell[:-1] and _DECODE[cell[-1]] == _DECODE[last[-1]] + 1:
+                ranges[-1][1] = cell
+                continue
+        ranges.append([cell, cell])
+    return [(first, last + RANGE_END) for first, last in ranges]
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distância em km pela fórmula de haversine."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
@@ -0,0 +1,88 @@
+"""
+Cache HTTP das leituras do catálogo
+ETag forte (hash do corpo), Last-Modified a partir da versão do recurso,
+respostas 304 para If-None-Match/If-Modified-Since e um cache de respostas em
+memória, validado pela versão gravada no banco a cada requisição.
+"""
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+from typing import NamedTuple
+
+from flask import Response, current_app, request
+from sqlalchemy import select
+
+from database.models import db, ResourceVersion
+from utils.cache import TTLCache
+from utils.json_provider import msgpack_enabled, negotiated_mimetype
+
+_response_cache = TTLCache(maxsize=512, ttl=300)
+
+
+class CachedResponse(NamedTuple):
+    version: int
+    body: bytes
+    mimetype: str
+    etag: str
+    last_modified: datetime | None
+
+
+def get_resource_version(name: str) -> tuple[int, datetime | None]:
+    """Versão atual do recurso e o instante da última escrita."""
+    row = db.session.execute(
+        select(ResourceVersion.version, ResourceVersion.updated_at).where(ResourceVersion.name == name)
+    ).first()
+    return (row.version, row.updated_at) if row else (0, None)
+
+
+def invalidate_responses(resource: str) -> None:
+    """Descarta as respostas em cache de um recurso neste processo."""
+    _response_cache.delete_where(lambda key: key[0] == resource)
+
+
+def _apply_cache_headers(response: Response, entry: CachedResponse) -> Response:
+    response.set_etag(entry.etag)
+    if entry.last_modified is not None:
+        response.last_modified = entry.last_modified
+    max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 0)
+    response.cache_control.public = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        # Pode guardar, mas precisa revalidar (barato: 304 sem corpo)
+        response.cache_control.no_cache = True
+    return response
+
+
+def cached_response(resource: str):
+    """Decorator para GETs cujo conteúdo depende apenas do recurso e da URL.
+
+    A chave do cache é (recurso, caminho + query string, formato negociado); uma entrada vale
+    enquanto a versão do recurso no banco não mudar. Só respostas 200 são cacheadas.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, modified_at = get_resource_version(resource)
+            key = (resource, request.full_path, negotiated_mimetype())
+            entry = _response_cache.get(key)
+            if entry is None or entry.version != version:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                body = response.get_data()
+                entry = CachedResponse(
+                    version=version,
+                    body=body,
+                    mimetype=response.mimetype,
+                    etag=hashlib.sha256(body).hexdigest()[:32],
+                    last_modified=modified_at
+                )
+                _response_cache.set(key, entry, ttl=current_app.config.get("HTTP_RESPONSE_CACHE_TTL"))
+            response = Response(entry.body, mimetype=entry.mimetype)
+            if msgpack_enabled():
+                response.vary.add("Accept")
+            return _apply_cache_headers(response, entry).make_conditional(request)
+        return wrapper
+    return decorator
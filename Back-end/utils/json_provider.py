@@ -0,0 +1,96 @@
+"""
+Provedor JSON da aplicação
+Usa orjson quando disponível (datetime nativo, saída em bytes) e cai para a
+biblioteca padrão caso contrário. Em ambos, datetimes viram ISO 8601, como nos
+`to_dict()` dos modelos, e a ordem das chaves é preservada.
+
+As respostas montadas a partir de dicts (build_response) também podem sair em
+MessagePack quando o cliente pede no cabeçalho Accept.
+"""
+
+from datetime import date
+from typing import Any
+
+from flask import Flask, current_app, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # dependência opcional
+    msgpack = None
+
+JSON_PROVIDERS = ("orjson", "stdlib")
+JSON_MIMETYPE = "application/json"
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+
+def msgpack_enabled() -> bool:
+    return msgpack is not None and current_app.config.get("RESPONSE_MSGPACK", True)
+
+
+def negotiated_mimetype() -> str:
+    """Formato de resposta pedido no Accept: JSON (padrão) ou MessagePack."""
+    if not has_request_context() or not msgpack_enabled():
+        return JSON_MIMETYPE
+    return request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, default=JSON_MIMETYPE)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """json da biblioteca padrão, com datetimes em ISO 8601."""
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        mimetype = negotiated_mimetype()
+        if mimetype == JSON_MIMETYPE:
+            body = self._dump_bytes(obj)
+        else:
+            body = msgpack.packb(obj, default=_default)
+        response = self._app.response_class(body, mimetype=mimetype)
+        if msgpack_enabled():
+            response.vary.add("Accept")
+        return response
+
+    def _dump_bytes(self, obj: Any) -> bytes:
+        if self._app.debug:
+            return self.dumps(obj, indent=2).encode()
+        return self.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """Serialização com orjson; `loads` também usa orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._dump_bytes(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def _dump_bytes(self, obj: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self._app.debug:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+
+def init_json_provider(app: Flask) -> None:
+    """Instala o provedor escolhido em JSON_PROVIDER (orjson sem a lib -> stdlib)."""
+    name = app.config.get("JSON_PROVIDER", "orjson")
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"JSON_PROVIDER inválido: {name}")
+    if name == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = StdlibJSONProvider(app)
@@ -5,6 +5,7 @@ from functools import wraps
 from flask import request, current_app, g
 from database.models import User
 from utils.response_builder import build_response
+from utils.user_cache import load_user
 
 TOKEN_EXP_MINUTES = 60  # 1 hora
 
@@ -24,8 +25,23 @@ def decode_token(token: str) -> dict:
     secret = current_app.config.get("SECRET_KEY")
     return jwt.decode(token, secret, algorithms=["HS256"])
 
+def get_current_user() -> User | None:
+    """Carrega (sob demanda) o usuário do token da requisição atual.
+
+    O token_required só valida as claims; views que precisam do User completo
+    chamam esta função, que usa o cache de usuários e memoriza o resultado em `g`.
+    """
+    if "current_user" not in g:
+        claims = g.get("jwt_claims")
+        g.current_user = load_user(claims.get("sub")) if claims else None
+    return g.current_user
+
 def token_required(role: str | None = None):
-    """Decorator para exigir JWT válido. Opcionalmente exigir role específica."""
+    """Decorator para exigir JWT válido. Opcionalmente exigir role específica.
+
+    A autorização usa apenas as claims assinadas do token (`sub` e `role`), sem
+    consultar o banco. Use `get_current_user()` na view quando precisar do usuário.
+    """
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
@@ -35,13 +51,12 @@ def token_required(role: str | None = None):
             token = auth_header.split(" ", 1)[1].strip()
             try:
                 payload = decode_token(token)
-                user = User.query.get(payload.get("sub"))
-                if not user:
-                    return build_response(False, "Usuário não encontrado"), 401
-                if role and user.role != role:
+                if payload.get("sub") is None:
+                    return build_response(False, "Token inválido"), 401
+                if role and payload.get("role") != role:
                     return build_response(False, "Permissão insuficiente"), 403
-                # Disponibiliza usuário no contexto
-                g.current_user = user
+                # Disponibiliza as claims no contexto; o usuário é carregado sob demanda
+                g.jwt_claims = payload
             except ExpiredSignatureError:
                 return build_response(False, "Token expirado"), 401
             except InvalidTokenError:
@@ -0,0 +1,220 @@
+"""
+Instrumentação das requisições e endpoint /metrics (formato Prometheus)
+Registra, por endpoint, latência, tamanho da resposta e número/tempo de
+consultas SQL (eventos do engine), além das chamadas externas (ViaCEP). Cada
+resposta leva um cabeçalho Server-Timing com o tempo total, de banco e externo.
+Consultas acima de SLOW_QUERY_MS vão para o log `slow_query`.
+
+As métricas são do processo: com vários workers, cada um expõe as suas.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+from flask import Flask, Response, current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+slow_query_logger = logging.getLogger("slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos, no modelo do Prometheus (thread-safe)."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple, label_names: tuple):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series: dict[tuple, list] = {}  # rótulos -> [contagens por bucket..., +Inf, soma]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def expose(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                yield f'{self.name}_bucket{{{base}{"," if base else ""}le="{bound}"}} {cumulative}'
+            yield f"{self.name}_sum{{{base}}} {series[-1]:.6f}"
+            yield f"{self.name}_count{{{base}}} {cumulative}"
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for v in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições", LATENCY_BUCKETS, ("method", "endpoint", "status")
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Tamanho do corpo das respostas (após compressão)", SIZE_BUCKETS, ("endpoint",)
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Consultas SQL por requisição", COUNT_BUCKETS, ("endpoint",)
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Tempo em SQL por requisição", LATENCY_BUCKETS, ("endpoint",)
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Latência de cada consulta SQL", LATENCY_BUCKETS, ("context",)
+)
+EXTERNAL_LATENCY = Histogram(
+    "external_call_duration_seconds", "Chamadas a serviços externos", LATENCY_BUCKETS, ("service", "outcome")
+)
+HISTOGRAMS = [REQUEST_LATENCY, RESPONSE_SIZE, REQUEST_QUERIES, REQUEST_DB_TIME, QUERY_LATENCY, EXTERNAL_LATENCY]
+
+# Funções que devolvem {nome_da_métrica: valor} extras para /metrics, com os nomes
+# declarados como contadores. O nome pode trazer rótulos: 'nome{rotulo="valor"}'.
+_collectors: list[tuple[Callable[[], dict], frozenset]] = []
+
+
+def register_collector(fn: Callable[[], dict] | None = None, *, counters: Iterable[str] = ()):
+    """Registra um coletor de métricas extras (uso: `@register_collector` ou `@register_collector(counters=...)`).
+
+    Métricas terminadas em `_total` e as listadas em `counters` são expostas como
+    `counter`; as demais como `gauge`.
+    """
+    def register(collector: Callable[[], dict]) -> Callable[[], dict]:
+        _collectors.append((collector, frozenset(counters)))
+        return collector
+    return register(fn) if fn is not None else register
+
+
+def metric_type(name: str, counters: frozenset = frozenset()) -> str:
+    return "counter" if name.endswith("_total") or name in counters else "gauge"
+
+
+# Tempos de chamadas externas das requisições atendidas direto pelo asgi.py (sem o `g` do Flask)
+external_timings: ContextVar[dict | None] = ContextVar("external_timings", default=None)
+
+
+def record_external_call(service: str, seconds: float, outcome: str = "ok") -> None:
+    """Registra uma chamada externa (ex.: ViaCEP) no histograma e no Server-Timing."""
+    EXTERNAL_LATENCY.observe(seconds, service, outcome)
+    if has_request_context() and "timings" in g:
+        timings = g.timings
+    else:
+        timings = external_timings.get()
+    if timings is not None:
+        timings[service] = timings.get(service, 0.0) + seconds
+
+
+def observe_request(method: str, endpoint: str, status: int, seconds: float, size: int | None,
+                    sql_count: int = 0, sql_time: float = 0.0) -> None:
+    """Registra uma requisição concluída nos histogramas por endpoint."""
+    REQUEST_LATENCY.observe(seconds, method, endpoint, status)
+    REQUEST_QUERIES.observe(sql_count, endpoint)
+    REQUEST_DB_TIME.observe(sql_time, endpoint)
+    if size is not None:
+        RESPONSE_SIZE.observe(size, endpoint)
+
+
+# --- Eventos do engine ------------------------------------------------------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    in_request = has_request_context() and "sql_count" in g
+    QUERY_LATENCY.observe(elapsed, "request" if in_request else "background")
+    if in_request:
+        g.sql_count += 1
+        g.sql_time += elapsed
+    threshold_ms = current_app.config.get("SLOW_QUERY_MS", 0) if has_app_context() else 0
+    if threshold_ms and elapsed * 1000 >= threshold_ms:
+        where = f"{request.method} {request.path}" if has_request_context() else "-"
+        slow_query_logger.warning(
+            "%.1f ms [%s] %s", elapsed * 1000, where, " ".join(statement.split())[:1000]
+        )
+
+
+# --- Middleware -------------------------------------------------------------
+
+def _endpoint_label() -> str:
+    # A regra da rota (ex.: /animals/<int:animal_id>) mantém a cardinalidade baixa
+    return request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+
+
+def server_timing(total: float, timings: dict, sql_time: float | None = None, sql_count: int = 0) -> str:
+    parts = [f"app;dur={total * 1000:.1f}"]
+    if sql_time is not None:
+        parts.append(f'db;dur={sql_time * 1000:.1f};desc="{sql_count} queries"')
+    parts += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    return ", ".join(parts)
+
+
+def metrics_text() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.expose())
+    for collector, counters in _collectors:
+        try:
+            values = collector()
+        except Exception:
+            logging.getLogger(__name__).exception("Falha em coletor de métricas")
+            continue
+        typed = set()
+        for name, value in values.items():
+            family = name.split("{", 1)[0]
+            if family not in typed:
+                typed.add(family)
+                lines.append(f"# TYPE {family} {metric_type(family, counters)}")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app: Flask) -> None:
+    """Registra a instrumentação e o endpoint /metrics (desligável com METRICS_ENABLED=False)."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    @app.before_request
+    def _start_request_metrics():
+        g.request_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+        g.timings = {}
+
+    @app.after_request
+    def _finish_request_metrics(response: Response) -> Response:
+        if "request_started" not in g:
+            return response
+        total = time.perf_counter() - g.request_started
+        observe_request(request.method, _endpoint_label(), response.status_code, total,
+                        response.content_length, g.sql_count, g.sql_time)
+        response.headers["Server-Timing"] = server_timing(total, g.timings, g.sql_time, g.sql_count)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(metrics_text(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import datetime
+from typing import Hashable, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import tuple_
+
+from utils.cache import TTLCache
+
+DEFAULT_PER_PAGE = 10
+MAX_PER_PAGE = 100
+
+
+def parse_per_page(value, default: int = DEFAULT_PER_PAGE) -> int:
+    """Converte `per_page` para inteiro limitado a [1, MAX_PER_PAGE]."""
+    per_page = int(value) if value not in (None, "") else default
+    return max(1, min(per_page, MAX_PER_PAGE))
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Codifica a posição (created_at, id) de uma linha em um cursor opaco."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decodifica um cursor gerado por `encode_cursor`.
+
+    Raises:
+        ValueError: se o cursor estiver malformado
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError("Cursor inválido") from e
+
+
+# Modos de contagem total aceitos pelas listagens (parâmetro `count`)
+COUNT_MODES = ("cached", "exact", "none")
+
+# Contagens por (tabela, filtros). Invalidado pelas rotas de escrita via `invalidate_counts`.
+_count_cache = TTLCache(maxsize=512, ttl=30.0)
+
+
+def count_rows(query, namespace: str, cache_key: Hashable, mode: str = "cached") -> Optional[int]:
+    """Conta as linhas de `query` conforme o modo pedido.
+
+    - "exact": executa COUNT(*) sempre
+    - "cached": reaproveita a última contagem dos mesmos filtros por alguns segundos
+    - "none": não conta (retorna None)
+    """
+    if mode == "none":
+        return None
+    key = (namespace, cache_key)
+    if mode == "cached":
+        total = _count_cache.get(key)
+        if total is not None:
+            return total
+    total = query.order_by(None).count()
+    _count_cache.set(key, total, ttl=current_app.config.get("LIST_COUNT_CACHE_TTL"))
+    return total
+
+
+def invalidate_counts(namespace: str) -> None:
+    """Descarta as contagens em cache de uma tabela (chamado após escritas)."""
+    _count_cache.delete_where(lambda key: key[0] == namespace)
+
+
+def _newest_first(model) -> tuple:
+    return (model.created_at.desc(), model.id.desc())
+
+
+def keyset_page(query, model, cursor: str, per_page: int) -> Tuple[list, dict]:
+    """Página por cursor em (created_at, id) decrescente.
+
+    O custo independe da profundidade: o cursor vira um WHERE sobre o índice
+    composto (created_at, id) em vez de um OFFSET.
+
+    Raises:
+        ValueError: se o cursor for inválido
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < (created_at, last_id))
+    rows = query.order_by(*_newest_first(model)).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    meta = {
+        "per_page": per_page,
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+        "has_more": has_more
+    }
+    return rows, meta
+
+
+def offset_page(query, model, page: int, per_page: int, namespace: str,
+                cache_key: Hashable, count_mode: str = "cached") -> Tuple[list, dict]:
+    """Página por offset em (created_at, id) decrescente, sem o COUNT(*) implícito do paginate()."""
+    rows = query.order_by(*_newest_first(model)).offset((page - 1) * per_page).limit(per_page).all()
+    total = count_rows(query, namespace, cache_key, count_mode)
+    meta = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": -(-total // per_page) if total is not None else None
+    }
+    return rows, meta
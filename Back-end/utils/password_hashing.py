@@ -0,0 +1,103 @@
+"""
+Hash de senhas fora da thread da requisição
+O cálculo (scrypt/pbkdf2) roda em um pool de processos limitado. Quando a fila
+de hashes pendentes está cheia, `HashingBusyError` é lançada para que a rota
+responda 503 rapidamente em vez de ocupar todas as threads com CPU.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt"
+
+
+class HashingBusyError(Exception):
+    """Fila de hash de senha cheia; o cliente deve tentar novamente"""
+    pass
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_pid: int | None = None
+_pending: threading.BoundedSemaphore | None = None
+_pool_lock = threading.Lock()
+
+
+def _hash_worker(password: str, method: str, salt_length: int) -> str:
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _verify_worker(pwhash: str, password: str) -> bool:
+    return check_password_hash(pwhash, password)
+
+
+def _get_pool():
+    """Pool de processos (recriado após fork) e semáforo de pendências."""
+    global _pool, _pool_pid, _pending
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                workers = current_app.config.get("PASSWORD_HASH_WORKERS", 0)
+                max_pending = current_app.config.get("PASSWORD_HASH_MAX_PENDING", workers * 4)
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+                _pending = threading.BoundedSemaphore(max(max_pending, workers))
+                _pool_pid = os.getpid()
+    return _pool, _pending
+
+
+def _run(fn, *args):
+    """Executa `fn` no pool (ou inline se PASSWORD_HASH_WORKERS = 0)."""
+    if not current_app.config.get("PASSWORD_HASH_WORKERS", 0):
+        return fn(*args)
+    pool, pending = _get_pool()
+    if not pending.acquire(blocking=False):
+        raise HashingBusyError("Muitas requisições de autenticação em andamento")
+    try:
+        future = pool.submit(fn, *args)
+    except Exception:
+        pending.release()
+        raise
+    # A vaga só é liberada quando o hash termina (ou é cancelado antes de começar):
+    # um hash que estourou o tempo continua ocupando uma thread do pool
+    future.add_done_callback(lambda _: pending.release())
+    try:
+        return future.result(timeout=current_app.config.get("PASSWORD_HASH_TIMEOUT", 10))
+    except FutureTimeoutError:
+        future.cancel()  # ainda na fila do pool: não chega a ser calculado
+        raise HashingBusyError("Tempo esgotado aguardando o hash da senha")
+
+
+def _configured_method() -> tuple[str, int]:
+    return (
+        current_app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+        current_app.config.get("PASSWORD_SALT_LENGTH", 16),
+    )
+
+
+def hash_password(password: str) -> str:
+    """Gera o hash com o algoritmo/custo de PASSWORD_HASH_METHOD."""
+    method, salt_length = _configured_method()
+    return _run(_hash_worker, password, method, salt_length)
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    return _run(_verify_worker, pwhash, password)
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method: str) -> str:
+    # Normaliza "scrypt" -> "scrypt:32768:8:1" etc. usando o próprio werkzeug
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """Indica se o hash foi gerado com parâmetros (algoritmo, custo ou salt) diferentes dos configurados."""
+    method, salt_length = _configured_method()
+    prefix, _, rest = pwhash.partition("$")
+    salt = rest.partition("$")[0]
+    return prefix != _method_prefix(method) or len(salt) != salt_length
@@ -0,0 +1,45 @@
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(raw: Optional[str], allowed: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """Interpreta o parâmetro `fields=a,b,c` de uma listagem.
+
+    Retorna None quando o parâmetro não foi informado (todos os campos).
+    O campo `id` é sempre incluído.
+
+    Raises:
+        ValueError: se algum campo não for permitido
+    """
+    if not raw:
+        return None
+    allowed = tuple(allowed)
+    requested = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Campos inválidos: {', '.join(unknown)}")
+    fields = ["id"] + [f for f in requested if f != "id"]
+    return tuple(dict.fromkeys(fields))
+
+
+def parse_include(raw: Optional[str], allowed: Iterable[str]) -> Tuple[str, ...]:
+    """Interpreta o parâmetro `include=rel1,rel2` (relações a embutir).
+
+    Raises:
+        ValueError: se alguma relação não for permitida
+    """
+    if not raw:
+        return ()
+    requested = tuple(f.strip() for f in raw.split(",") if f.strip())
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise ValueError(f"Relações inválidas: {', '.join(unknown)}")
+    return requested
+
+
+def load_only_fields(model, fields: Optional[Tuple[str, ...]]):
+    """Opção de query que carrega apenas as colunas pedidas (None = todas)."""
+    if fields is None:
+        return None
+    return load_only(*(getattr(model, f) for f in fields))
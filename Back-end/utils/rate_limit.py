@@ -0,0 +1,277 @@
+"""
+Limite de taxa por cliente e controle de admissão
+Cada blueprint listado em RATE_LIMIT_POLICIES tem, para os métodos indicados:
+
+- um token bucket por cliente (usuário do JWT, se houver, senão IP): excedido,
+  a requisição recebe 429 com Retry-After;
+- uma classe de concorrência (ex.: "auth", "write", "external") com limite de
+  requisições simultâneas por processo (CONCURRENCY_LIMITS): sem vaga, a
+  resposta é 503 imediato em vez de a requisição esperar numa fila.
+
+Os buckets ficam em memória (por processo) ou num backend compartilhado
+(RATE_LIMIT_STORAGE_URL=redis://..., requer a lib redis). As rotas que o asgi.py
+atende sem passar pelo Flask (/address, /events) usam o mesmo RateLimiter.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple
+
+from flask import Flask, current_app, g, request
+from jwt.exceptions import InvalidTokenError
+
+from utils.jwt_utils import decode_token
+from utils.metrics import register_collector
+from utils.response_builder import build_response
+
+try:
+    import redis
+except ImportError:  # dependência opcional
+    redis = None
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Respostas recusadas neste processo: (blueprint, motivo) -> total
+_rejections: dict[tuple[str, str], int] = {}
+_rejections_lock = threading.Lock()
+
+
+class RateLimit(NamedTuple):
+    rate: float  # tokens por segundo
+    burst: int  # capacidade do bucket
+    text: str  # forma original, ex.: "10/minute"
+
+
+def parse_rate(text: str, burst: int | None = None) -> RateLimit:
+    """Converte "10/minute" (ou "10/2minute") em RateLimit; burst padrão = o número de requisições."""
+    try:
+        count, period = text.split("/")
+        digits = "".join(ch for ch in period if ch.isdigit())
+        unit = period[len(digits):].strip().rstrip("s")
+        seconds = _UNITS[unit] * (int(digits) if digits else 1)
+        return RateLimit(int(count) / seconds, burst or int(count), text)
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"Limite inválido: {text}") from e
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: int  # segundos até haver um token (0 se permitido)
+
+
+def _retry_after(tokens: float, limit: RateLimit) -> int:
+    return max(1, math.ceil((1 - tokens) / limit.rate))
+
+
+class MemoryBackend:
+    """Buckets em memória do processo (LRU limitado a `maxsize` clientes)."""
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, limit: RateLimit) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - updated) * limit.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return Decision(allowed, int(tokens), 0 if allowed else _retry_after(tokens, limit))
+
+
+class RedisBackend:
+    """Buckets compartilhados entre processos/instâncias (atualização atômica via Lua)."""
+
+    _SCRIPT = """
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(data[1]) or burst
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL=redis://... requer a biblioteca redis")
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def consume(self, key: str, limit: RateLimit) -> Decision:
+        allowed, tokens = self._script(keys=[f"ratelimit:{key}"], args=[limit.rate, limit.burst, time.time()])
+        tokens = float(tokens)
+        return Decision(bool(allowed), int(tokens), 0 if allowed else _retry_after(tokens, limit))
+
+
+def create_backend(url: str):
+    if not url or url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"RATE_LIMIT_STORAGE_URL não suportada: {url}")
+
+
+def client_key_from(authorization: str, remote_addr: str | None) -> str:
+    """Usuário do JWT do cabeçalho Authorization (se válido) ou o IP informado."""
+    if authorization.startswith("Bearer "):
+        try:
+            sub = decode_token(authorization.split(" ", 1)[1].strip()).get("sub")
+            if sub is not None:
+                return f"user:{sub}"
+        except InvalidTokenError:
+            pass
+    return f"ip:{remote_addr}"
+
+
+def client_key() -> str:
+    """Chave do cliente da requisição Flask atual."""
+    if current_app.config.get("RATE_LIMIT_TRUST_PROXY", False) and request.access_route:
+        remote_addr = request.access_route[0]
+    else:
+        remote_addr = request.remote_addr
+    return client_key_from(request.headers.get("Authorization", ""), remote_addr)
+
+
+class AdmissionControl:
+    """Semáforos por classe de endpoint (limites por processo; 0 = sem limite)."""
+
+    def __init__(self, limits: dict):
+        self._semaphores = {name: threading.BoundedSemaphore(n) for name, n in limits.items() if n}
+
+    def try_acquire(self, name: str) -> bool:
+        semaphore = self._semaphores.get(name)
+        return semaphore is None or semaphore.acquire(blocking=False)
+
+    def release(self, name: str) -> None:
+        semaphore = self._semaphores.get(name)
+        if semaphore is not None:
+            semaphore.release()
+
+
+class Admission(NamedTuple):
+    status: int  # 0 = admitida; 429 (limite de taxa) ou 503 (sem vaga na classe)
+    retry_after: int
+    limit: RateLimit | None
+    decision: Decision | None
+    concurrency: str | None  # classe ocupada, a liberar com RateLimiter.release ao fim da requisição
+
+
+_ADMITTED = Admission(0, 0, None, None, None)
+
+
+class RateLimiter:
+    """Políticas por blueprint aplicadas pelo Flask (before_request) e pelo asgi.py."""
+
+    def __init__(self, backend, admission: AdmissionControl, policies: dict):
+        self.backend = backend
+        self.admission = admission
+        self.policies = {}
+        for blueprint, policy in policies.items():
+            limit = parse_rate(policy["rate"], policy.get("burst")) if policy.get("rate") else None
+            self.policies[blueprint] = (set(policy.get("methods", ("POST",))), limit, policy.get("concurrency"))
+
+    def admit(self, blueprint: str | None, method: str, key: Callable[[], str]) -> Admission:
+        """Consome um token do cliente (`key()`, calculada só se houver limite) e ocupa a classe."""
+        policy = self.policies.get(blueprint)
+        if policy is None or method not in policy[0]:
+            return _ADMITTED
+        _, limit, concurrency = policy
+        decision = None
+        if limit is not None:
+            decision = self.backend.consume(f"{blueprint}:{key()}", limit)
+            if not decision.allowed:
+                _reject(blueprint, "rate")
+                return Admission(429, decision.retry_after, limit, decision, None)
+        if concurrency is not None and not self.admission.try_acquire(concurrency):
+            _reject(blueprint, "concurrency")
+            return Admission(503, 1, limit, decision, None)
+        return Admission(0, 0, limit, decision, concurrency)
+
+    def release(self, admission: Admission) -> None:
+        if admission.concurrency is not None:
+            self.admission.release(admission.concurrency)
+
+
+def rejection_response(admission: Admission) -> tuple[dict, int, dict]:
+    """Corpo, status e cabeçalhos de uma requisição recusada."""
+    if admission.status == 429:
+        message = "Muitas requisições, tente novamente mais tarde"
+    else:
+        message = "Servidor ocupado, tente novamente em instantes"
+    return build_response(False, message), admission.status, {"Retry-After": str(admission.retry_after)}
+
+
+def rate_limit_headers(admission: Admission) -> dict:
+    if admission.limit is None or admission.decision is None:
+        return {}
+    return {"X-RateLimit-Limit": admission.limit.text, "X-RateLimit-Remaining": str(admission.decision.remaining)}
+
+
+def _reject(blueprint: str, reason: str) -> None:
+    key = (blueprint, reason)
+    with _rejections_lock:
+        _rejections[key] = _rejections.get(key, 0) + 1
+
+
+@register_collector
+def _rate_limit_metrics_for_prometheus() -> dict:
+    with _rejections_lock:
+        items = sorted(_rejections.items())
+    return {
+        f'rate_limit_rejected_total{{blueprint="{blueprint}",reason="{reason}"}}': value
+        for (blueprint, reason), value in items
+    }
+
+
+def get_rate_limiter(app: Flask) -> RateLimiter | None:
+    """Limitador do app (None com RATE_LIMIT_ENABLED=False)."""
+    return app.extensions.get("rate_limit")
+
+
+def init_rate_limiting(app: Flask) -> None:
+    """Registra os limites de RATE_LIMIT_POLICIES (desligados com RATE_LIMIT_ENABLED=False)."""
+    if not app.config.get("RATE_LIMIT_ENABLED", True):
+        return
+    limiter = RateLimiter(
+        create_backend(app.config.get("RATE_LIMIT_STORAGE_URL", "memory://")),
+        AdmissionControl(app.config.get("CONCURRENCY_LIMITS", {})),
+        app.config.get("RATE_LIMIT_POLICIES", {}),
+    )
+    app.extensions["rate_limit"] = limiter
+
+    @app.before_request
+    def _admit_request():
+        admission = limiter.admit(request.blueprint, request.method, client_key)
+        if admission.status:
+            return rejection_response(admission)
+        g.admission = admission
+        return None
+
+    @app.after_request
+    def _rate_limit_headers(response):
+        if "admission" in g:
+            response.headers.update(rate_limit_headers(g.admission))
+        return response
+
+    @app.teardown_request
+    def _release_admission(exc):
+        admission = g.pop("admission", None)
+        if admission is not None:
+            limiter.release(admission)
@@ -0,0 +1,62 @@
+"""
+Serializadores por projeção de colunas
+Leem linhas de um SELECT do Core (tuplas) direto para dicts, sem hidratar objetos
+do ORM nem chamar `to_dict()`. A função de cada (modelo, campos) é montada uma
+única vez; datetimes ficam como objetos e são convertidos pelo provedor JSON.
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterable, Optional, Tuple
+
+# Colunas sempre selecionadas: necessárias para montar o cursor de paginação
+_KEYSET_COLUMNS = ("created_at", "id")
+
+
+class Projection:
+    """Colunas de um SELECT e a função que converte cada linha em dict.
+
+    `embed=(chave, modelo, campos)` embute uma relação muitos-para-um (via JOIN);
+    o id da relação nulo resulta em `chave: None`, como no `to_dict()`.
+    """
+
+    def __init__(self, model, fields: Tuple[str, ...], embed: Optional[tuple] = None):
+        keys = tuple(fields)
+        columns = [getattr(model, f) for f in fields]
+        if embed is None:
+            # zip para nas chaves: as colunas extras do cursor ficam de fora
+            self.serialize = lambda row: dict(zip(keys, row))
+        else:
+            key, embed_model, embed_fields = embed
+            offset = len(columns)
+            embed_keys = tuple(embed_fields)
+            embed_slice = itemgetter(slice(offset, offset + len(embed_keys)))
+            id_index = offset + embed_keys.index("id")
+
+            def serialize(row):
+                data = dict(zip(keys, row))
+                data[key] = dict(zip(embed_keys, embed_slice(row))) if row[id_index] is not None else None
+                return data
+
+            self.serialize = serialize
+            # Rótulos próprios para não colidir com as colunas do modelo principal (ex.: id)
+            columns += [getattr(embed_model, f).label(f"{key}_{f}") for f in embed_fields]
+        columns += [getattr(model, c) for c in _KEYSET_COLUMNS if c not in fields]
+        self.columns = tuple(columns)
+
+    def serialize_all(self, rows: Iterable) -> list:
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+
+@lru_cache(maxsize=128)
+def projection(model, fields: Optional[Tuple[str, ...]] = None,
+               embed: Optional[tuple] = None) -> Projection:
+    """Projeção (em cache) de `model`; `fields=None` usa `model.SERIALIZED_FIELDS`.
+
+    `embed` segue o formato de `Projection`, com `campos=None` para todos os campos.
+    """
+    if embed is not None:
+        key, embed_model, embed_fields = embed
+        embed = (key, embed_model, embed_fields or embed_model.SERIALIZED_FIELDS)
+    return Projection(model, fields or model.SERIALIZED_FIELDS, embed)
@@ -0,0 +1,64 @@
+import threading
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
+
+from database.models import db, User
+from utils.cache import TTLCache
+
+# id -> cópia destacada (detached) do User; invalidada quando o usuário muda
+_user_cache: TTLCache | None = None
+_user_cache_lock = threading.Lock()
+
+
+def _get_cache() -> TTLCache:
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                _user_cache = TTLCache(
+                    maxsize=current_app.config.get("USER_CACHE_SIZE", 1024),
+                    ttl=current_app.config.get("USER_CACHE_TTL", 60)
+                )
+    return _user_cache
+
+
+def _detached_copy(user: User) -> User:
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def load_user(user_id) -> User | None:
+    """Retorna o User anexado à sessão atual, usando o cache quando possível.
+
+    Num acerto, `merge(load=False)` anexa a cópia em cache sem consultar o banco.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    cache = _get_cache()
+    cached = cache.get(user_id)
+    if cached is not None:
+        return db.session.merge(cached, load=False)
+    user = db.session.get(User, user_id)
+    if user is not None:
+        cache.set(user_id, _detached_copy(user))
+    return user
+
+
+def invalidate_user(user_id) -> None:
+    if _user_cache is not None:
+        _user_cache.delete(user_id)
+
+
+def cache_stats() -> dict:
+    return _user_cache.stats() if _user_cache is not None else {"size": 0, "hits": 0, "misses": 0}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_user(target.id)
@@ -0,0 +1,154 @@
+"""
+Servidor WSGI de produção embutido (pré-fork + threads)
+O processo principal carrega o app uma única vez, abre o socket e cria
+`workers` processos por fork; cada um atende com um pool fixo de `threads`.
+Workers que morrem são recriados, e SIGTERM/SIGINT encerram todos de forma
+graciosa (cada worker termina as requisições em andamento e drena as filas).
+
+É o fallback do `flask serve` quando o gunicorn não está instalado. Sem fork
+(Windows) roda um único processo com threads.
+"""
+
+import atexit
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+
+from flask import Flask
+from sqlalchemy.orm import configure_mappers
+from werkzeug.serving import BaseWSGIServer
+
+from database.models import db, Adoption, Animal
+from utils.serializers import projection
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app: Flask) -> None:
+    """Faz no processo principal o trabalho que cada worker repetiria no primeiro acesso.
+
+    Com fork, mapeamentos do ORM e projeções compiladas são herdados prontos.
+    """
+    configure_mappers()
+    projection(Animal)
+    projection(Adoption)
+    projection(Adoption, None, ("animal", Animal, None))
+    with app.app_context():
+        # As conexões abertas na inicialização não devem ser compartilhadas com os workers
+        db.engine.dispose()
+
+
+class ThreadPoolWSGIServer(ThreadingMixIn, BaseWSGIServer):
+    """Servidor WSGI com número fixo de threads sobre um socket já aberto."""
+
+    daemon_threads = True
+
+    def __init__(self, app: Flask, host: str, port: int, fd: int, threads: int):
+        super().__init__(host, port, app, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="wsgi")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+
+
+class PreforkServer:
+    """Processo principal que mantém `workers` filhos atendendo no mesmo socket."""
+
+    def __init__(self, app: Flask, host: str, port: int, workers: int, threads: int,
+                 backlog: int = 2048, graceful_timeout: float = 30.0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.threads = max(1, threads)
+        self.backlog = backlog
+        self.graceful_timeout = graceful_timeout
+        self._children: dict[int, float] = {}  # pid -> instante em que foi criado
+        self._stopping = False
+        self._kill_timer: threading.Timer | None = None
+
+    def serve_forever(self) -> None:
+        sock = socket.create_server((self.host, self.port), backlog=self.backlog)
+        sock.set_inheritable(True)
+        logger.info(f"Servindo em http://{self.host}:{self.port} "
+                    f"({self.workers} processo(s) x {self.threads} thread(s))")
+        if not hasattr(os, "fork") or self.workers == 1:
+            self._run_worker(sock)
+            return
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for _ in range(self.workers):
+            self._spawn(sock)
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            started = self._children.pop(pid, None)
+            if not self._stopping:
+                logger.warning(f"Worker {pid} saiu (status {status}); iniciando outro")
+                if started is not None and time.monotonic() - started < 1:
+                    time.sleep(1)  # evita um ciclo de fork se o worker falha ao iniciar
+                self._spawn(sock)
+        if self._kill_timer is not None:
+            self._kill_timer.cancel()
+        sock.close()
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)  # o pai coordena o Ctrl+C
+            self._run_worker(sock)
+        except BaseException:
+            logger.exception("Erro no worker")
+            code = 1
+        finally:
+            # Roda os atexit do worker (ex.: drenar a fila write-behind) e nunca
+            # volta para o código do processo pai
+            atexit._run_exitfuncs()
+            os._exit(code)
+
+    def _run_worker(self, sock: socket.socket) -> None:
+        server = ThreadPoolWSGIServer(self.app, self.host, self.port, sock.fileno(), self.threads)
+
+        def shutdown(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            server.serve_forever()
+        finally:
+            server.pool.shutdown(wait=True)  # termina as requisições em andamento
+            server.server_close()
+
+    def _stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+        self._kill_timer = threading.Timer(self.graceful_timeout, self._kill_remaining)
+        self._kill_timer.daemon = True
+        self._kill_timer.start()
+
+    def _kill_remaining(self) -> None:
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
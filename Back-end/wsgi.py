@@ -0,0 +1,18 @@
+"""
+WSGI entry point de produção
+O app é criado uma única vez no import; servidores que pré-carregam o app
+(gunicorn --preload, `flask serve`) criam os workers por fork a partir dele, e
+cada worker abre suas próprias conexões com o banco (ver database/engine.py).
+
+Uso:
+    flask --app wsgi serve --workers 4 --threads 8
+    gunicorn -c gunicorn.conf.py wsgi:app      # pip install -r requirements-server.txt
+"""
+
+import os
+
+from app import create_app
+from utils.wsgi_server import warm_up
+
+app = create_app(os.getenv("FLASK_ENV", "production"))
+warm_up(app)
@@ -7,6 +7,7 @@ import { Textarea } from "../ui/textarea";
 import { Label } from "../ui/label";
 import type { Page, Animal, Adoption } from "../../src/types";
 import { ImageWithFallback } from "../figma/ImageWithFallback";
+import { resolveImageUrl } from "../../src/services/api";
 import { useState } from "react";
 import { toast } from "sonner";
 import { adoptionAPI } from "../../src/services/api";
@@ -134,7 +135,7 @@ export function AnimalDetails({ animal, onNavigate, onAdoptionSuccess }: AnimalD
           <Card className="overflow-hidden">
             <div className="relative h-96 lg:h-[500px]">
               <ImageWithFallback
-                src={animal.image}
+                src={resolveImageUrl(animal.image)}
                 alt={animal.name}
                 className="w-full h-full object-cover"
               />
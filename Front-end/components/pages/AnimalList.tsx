@@ -1,11 +1,12 @@
-import { useState } from "react";
+import { useState, useEffect } from "react";
 import { Search, SlidersHorizontal } from "lucide-react";
 import { Button } from "../ui/button";
 import { Input } from "../ui/input";
 import { Card } from "../ui/card";
 import { Badge } from "../ui/badge";
-import type { Page, Animal } from "../../src/types";
+import type { Page, Animal, AnimalFilters } from "../../src/types";
 import { ImageWithFallback } from "../figma/ImageWithFallback";
+import { resolveImageUrl } from "../../src/services/api";
 import {
   Select,
   SelectContent,
@@ -20,24 +21,31 @@ interface AnimalListProps {
   page: number;
   totalPages: number;
   onPageChange: (p: number) => void;
+  onFiltersChange: (filters: AnimalFilters) => void;
 }
 
-export function AnimalList({ animals, onNavigate, page, totalPages, onPageChange }: AnimalListProps) {
+export function AnimalList({ animals, onNavigate, page, totalPages, onPageChange, onFiltersChange }: AnimalListProps) {
   const [searchTerm, setSearchTerm] = useState("");
   const [speciesFilter, setSpeciesFilter] = useState<string>("all");
   const [sizeFilter, setSizeFilter] = useState<string>("all");
   const [statusFilter, setStatusFilter] = useState<string>("all");
   const [showFilters, setShowFilters] = useState(false);
 
-  const filteredAnimals = animals.filter((animal) => {
-    const matchesSearch = animal.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         animal.description.toLowerCase().includes(searchTerm.toLowerCase());
-    const matchesSpecies = speciesFilter === "all" || animal.species === speciesFilter;
-    const matchesSize = sizeFilter === "all" || animal.size === sizeFilter;
-    const matchesStatus = statusFilter === "all" || animal.status === statusFilter;
-
-    return matchesSearch && matchesSpecies && matchesSize && matchesStatus;
-  });
+  // Filtros e busca são aplicados no servidor; a busca por texto aguarda a digitação parar
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      onFiltersChange({
+        q: searchTerm.trim(),
+        species: speciesFilter,
+        size: sizeFilter,
+        status: statusFilter,
+      });
+    }, 300);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [searchTerm, speciesFilter, sizeFilter, statusFilter]);
+
+  const filteredAnimals = animals;
 
   return (
     <div className="max-w-7xl mx-auto px-4 py-8">
@@ -154,7 +162,7 @@ export function AnimalList({ animals, onNavigate, page, totalPages, onPageChange
           <Card key={animal.id} className="overflow-hidden hover:shadow-xl transition-all duration-300 hover:-translate-y-1">
             <div className="relative h-64">
               <ImageWithFallback
-                src={animal.image}
+                src={resolveImageUrl(animal.image)}
                 alt={animal.name}
                 className="w-full h-full object-cover"
               />
@@ -1,16 +1,49 @@
+import { useEffect, useState } from "react";
 import { ArrowRight, Heart, Home as HomeIcon, Shield } from "lucide-react";
 import { Button } from "../ui/button";
 import { Card } from "../ui/card";
 import type { Page, Animal } from "../../src/types";
 import { ImageWithFallback } from "../figma/ImageWithFallback";
+import { animalAPI, resolveImageUrl, statsAPI } from "../../src/services/api";
 
 interface HomeProps {
-  animals: Animal[];
   onNavigate: (page: Page, animal?: Animal) => void;
 }
 
-export function Home({ animals, onNavigate }: HomeProps) {
-  const adoptedAnimals = animals.filter(a => a.status === "Adotado");
+interface CatalogTotals {
+  available: number;
+  adopted: number;
+  adoptionRequests: number;
+}
+
+export function Home({ onNavigate }: HomeProps) {
+  const [adoptedAnimals, setAdoptedAnimals] = useState<Animal[]>([]);
+  const [totals, setTotals] = useState<CatalogTotals | null>(null);
+
+  // Contagens vêm dos contadores do servidor (/stats), não da página de animais carregada
+  useEffect(() => {
+    (async () => {
+      try {
+        const [stats, adopted] = await Promise.all([
+          statsAPI.getStats(),
+          animalAPI.getAllAnimals(1, 6, { status: "Adotado" }),
+        ]);
+        if (stats.success && stats.data) {
+          const byStatus = stats.data.animals.status || {};
+          setTotals({
+            available: byStatus["Disponível"] || 0,
+            adopted: byStatus["Adotado"] || 0,
+            adoptionRequests: stats.data.adoptions.total || 0,
+          });
+        }
+        if (adopted.success && adopted.data) {
+          setAdoptedAnimals(adopted.data.items);
+        }
+      } catch (err) {
+        console.error("Erro ao carregar estatísticas:", err);
+      }
+    })();
+  }, []);
 
   return (
     <div>
@@ -69,6 +102,26 @@ export function Home({ animals, onNavigate }: HomeProps) {
         </div>
       </section>
 
+      {/* Números */}
+      {totals && (
+        <section className="max-w-7xl mx-auto px-4">
+          <div className="grid grid-cols-1 md:grid-cols-3 gap-8 text-center">
+            <div>
+              <p className="text-4xl text-orange-500">{totals.available}</p>
+              <p className="text-gray-600">animais esperando um lar</p>
+            </div>
+            <div>
+              <p className="text-4xl text-pink-500">{totals.adopted}</p>
+              <p className="text-gray-600">animais adotados</p>
+            </div>
+            <div>
+              <p className="text-4xl text-purple-500">{totals.adoptionRequests}</p>
+              <p className="text-gray-600">pedidos de adoção</p>
+            </div>
+          </div>
+        </section>
+      )}
+
       {/* Success Stories */}
       <section className="max-w-7xl mx-auto px-4 py-16">
         <div className="text-center mb-12">
@@ -85,7 +138,7 @@ export function Home({ animals, onNavigate }: HomeProps) {
             <Card key={animal.id} className="overflow-hidden hover:shadow-xl transition-shadow">
               <div className="relative h-64">
                 <ImageWithFallback
-                  src={animal.image}
+                  src={resolveImageUrl(animal.image)}
                   alt={animal.name}
                   className="w-full h-full object-cover"
                 />
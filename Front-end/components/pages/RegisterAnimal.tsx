@@ -14,7 +14,7 @@ import {
 } from "../ui/select";
 import type { Page } from "../../src/types";
 import { toast } from "sonner";
-import { animalAPI } from "../../src/services/api";
+import { animalAPI, imageAPI, resolveImageUrl } from "../../src/services/api";
 
 interface RegisterAnimalProps {
   onNavigate: (page: Page) => void;
@@ -36,7 +36,9 @@ export function RegisterAnimal({ onNavigate, isLoggedIn, userType, onAnimalCreat
     status: "Disponível"
   });
 
+  // URL curta (/images/<hash>) devolvida pelo POST /images
   const [uploadedImage, setUploadedImage] = useState<string | null>(null);
+  const [uploading, setUploading] = useState(false);
   const [loading, setLoading] = useState(false);
 
   // Redirect if not ONG
@@ -69,20 +71,34 @@ export function RegisterAnimal({ onNavigate, isLoggedIn, userType, onAnimalCreat
     setFormData({ ...formData, [name]: value });
   };
 
-  const handleImageUpload = (e: React.ChangeEvent<HTMLInputElement>) => {
+  const handleImageUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
-    if (file) {
-      const reader = new FileReader();
-      reader.onloadend = () => {
-        setUploadedImage(reader.result as string);
-      };
-      reader.readAsDataURL(file);
+    if (!file) return;
+    try {
+      setUploading(true);
+      const response = await imageAPI.upload(file);
+      if (response.success && response.data) {
+        setUploadedImage(response.data.url);
+      } else {
+        toast.error(response.message || "Erro ao enviar imagem");
+      }
+    } catch (err) {
+      const message = err instanceof Error ? err.message : "Erro ao enviar imagem";
+      toast.error(message);
+      console.error("Erro ao enviar imagem:", err);
+    } finally {
+      setUploading(false);
     }
   };
 
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     
+    if (uploading) {
+      toast.error("Aguarde o envio da imagem");
+      return;
+    }
+
     if (!formData.name || !formData.species || !formData.age || !formData.size || !formData.description) {
       toast.error("Por favor, preencha todos os campos obrigatórios");
       return;
@@ -155,7 +171,7 @@ export function RegisterAnimal({ onNavigate, isLoggedIn, userType, onAnimalCreat
               {uploadedImage ? (
                 <div className="relative w-full h-64 rounded-lg overflow-hidden">
                   <img
-                    src={uploadedImage}
+                    src={resolveImageUrl(uploadedImage)}
                     alt="Preview"
                     className="w-full h-full object-cover"
                   />
@@ -171,13 +187,18 @@ export function RegisterAnimal({ onNavigate, isLoggedIn, userType, onAnimalCreat
                 </div>
               ) : (
                 <label className="flex flex-col items-center justify-center w-full h-64 border-2 border-dashed border-gray-300 rounded-lg cursor-pointer hover:border-orange-500 transition-colors">
-                  <Upload className="w-12 h-12 text-gray-400 mb-2" />
-                  <p className="text-gray-600">Clique para fazer upload</p>
+                  {uploading ? (
+                    <Loader className="w-12 h-12 text-gray-400 mb-2 animate-spin" />
+                  ) : (
+                    <Upload className="w-12 h-12 text-gray-400 mb-2" />
+                  )}
+                  <p className="text-gray-600">{uploading ? "Enviando imagem..." : "Clique para fazer upload"}</p>
                   <p className="text-sm text-gray-400">PNG, JPG até 5MB</p>
                   <input
                     type="file"
                     className="hidden"
-                    accept="image/*"
+                    accept="image/jpeg,image/png,image/gif,image/webp"
+                    disabled={uploading}
                     onChange={handleImageUpload}
                   />
                 </label>
@@ -8,7 +8,7 @@ import { HowToHelp } from "../components/pages/HowToHelp.tsx";
 import { About } from "../components/pages/About.tsx";
 import { AdoptionSuccess } from "../components/pages/AdoptionSuccess.tsx";
 import { ManageAnimals } from "../components/pages/ManageAnimals.tsx";
-import type { Page, Animal, Adoption } from "./types";
+import type { Page, Animal, Adoption, AnimalFilters } from "./types";
 import { MainHeader } from "../components/MainHeader.tsx";
 import { animalAPI, loadStoredToken } from "./services/api";
 import { toast } from "sonner";
@@ -26,6 +26,7 @@ export default function App() {
   const [page, setPage] = useState(1);
   const [perPage] = useState(6);
   const [totalPages, setTotalPages] = useState<number>(1);
+  const [filters, setFilters] = useState<AnimalFilters>({ q: "", species: "all", size: "all", status: "all" });
 
   // Busca animais da API ao carregar o componente
   useEffect(() => {
@@ -35,7 +36,7 @@ export default function App() {
   useEffect(() => {
     (async () => {
       try {
-        const response = await animalAPI.getAllAnimals(page, perPage);
+        const response = await animalAPI.getAllAnimals(page, perPage, filters);
         if (response.success && response.data) {
           setAnimals(response.data.items);
           setTotalPages(response.data.meta.pages);
@@ -48,7 +49,7 @@ export default function App() {
         toast.error(message);
       }
     })();
-  }, [page, perPage]);
+  }, [page, perPage, filters]);
 
   const navigateTo = (page: Page, animal?: Animal) => {
     setCurrentPage(page);
@@ -66,7 +67,7 @@ export default function App() {
 
   const refreshAnimals = async () => {
     try {
-      const response = await animalAPI.getAllAnimals(page, perPage);
+      const response = await animalAPI.getAllAnimals(page, perPage, filters);
       if (response.success && response.data) {
         setAnimals(response.data.items);
         setTotalPages(response.data.meta.pages);
@@ -76,6 +77,12 @@ export default function App() {
     }
   };
 
+  const handleFiltersChange = (next: AnimalFilters) => {
+    if (JSON.stringify(next) === JSON.stringify(filters)) return;
+    setFilters(next);
+    setPage(1);
+  };
+
   const handleLogout = () => {
     setIsLoggedIn(false);
     setUserType(null);
@@ -102,7 +109,7 @@ export default function App() {
       
       <main>
         {currentPage === "home" && (
-          <Home animals={animals} onNavigate={navigateTo} />
+          <Home onNavigate={navigateTo} />
         )}
         {currentPage === "animals" && (
           <AnimalList 
@@ -111,6 +118,7 @@ export default function App() {
             page={page} 
             totalPages={totalPages} 
             onPageChange={setPage}
+            onFiltersChange={handleFiltersChange}
           />
         )}
         {currentPage === "animal-details" && selectedAnimal && (
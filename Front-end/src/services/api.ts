@@ -3,6 +3,8 @@
  * Configuração centralizada para todas as requisições HTTP
  */
 
+import type { AnimalFilters } from '../types';
+
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:3001';
 
 let authToken: string | null = null;
@@ -22,6 +24,15 @@ export function loadStoredToken() {
   return authToken;
 }
 
+/**
+ * URL para exibir uma imagem de animal: caminhos do armazenamento da API
+ * (`/images/<hash>`) são servidos pela API, não pelo servidor do front-end
+ */
+export function resolveImageUrl(image?: string | null): string {
+  if (!image) return '';
+  return image.startsWith('/') ? `${API_BASE_URL}${image}` : image;
+}
+
 interface RequestConfig {
   method?: 'GET' | 'POST' | 'PUT' | 'DELETE';
   headers?: Record<string, string>;
@@ -82,10 +93,25 @@ async function fetchAPI<T = unknown>(
  */
 export const animalAPI = {
   /**
-   * Lista todos os animais
+   * Lista animais com paginação e filtros aplicados no servidor
    */
-  getAllAnimals: async (page: number = 1, perPage: number = 10) => {
-    return fetchAPI<{ items: any[]; meta: any }>(`/animals?page=${page}&per_page=${perPage}`);
+  getAllAnimals: async (page: number = 1, perPage: number = 10, filters: AnimalFilters = {}) => {
+    const params = new URLSearchParams({ page: String(page), per_page: String(perPage) });
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value && value !== 'all') params.set(key, value);
+    });
+    return fetchAPI<{ items: any[]; meta: any }>(`/animals?${params.toString()}`);
+  },
+
+  /**
+   * Animais a até `radiusKm` km de um CEP ou cidade, do mais próximo ao mais distante
+   */
+  getNearbyAnimals: async (near: string, radiusKm: number = 25, page: number = 1, perPage: number = 10, filters: AnimalFilters = {}) => {
+    const params = new URLSearchParams({ near, radius_km: String(radiusKm), page: String(page), per_page: String(perPage) });
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value && value !== 'all') params.set(key, value);
+    });
+    return fetchAPI<{ items: any[]; meta: any }>(`/animals?${params.toString()}`);
   },
 
   /**
@@ -95,6 +121,19 @@ export const animalAPI = {
     return fetchAPI<any>(`/animals/${id}`);
   },
 
+  /**
+   * Alterações no catálogo desde o cursor (vazio = desde o início)
+   */
+  getChanges: async (since: string = '', limit: number = 100) => {
+    const params = new URLSearchParams({ since, limit: String(limit) });
+    return fetchAPI<{
+      changes: { seq: number; op: 'upsert' | 'delete'; id: number; animal?: any }[];
+      cursor: string;
+      has_more: boolean;
+      reset: boolean;
+    }>(`/animals/changes?${params.toString()}`);
+  },
+
   /**
    * Cria um novo animal
    */
@@ -164,10 +203,10 @@ export const adoptionAPI = {
   },
 
   /**
-   * Lista todas as adoções
+   * Lista adoções (paginada)
    */
-  getAllAdoptions: async () => {
-    return fetchAPI<any[]>('/adoptions');
+  getAllAdoptions: async (page: number = 1, perPage: number = 10) => {
+    return fetchAPI<{ items: any[]; meta: any }>(`/adoptions?page=${page}&per_page=${perPage}&include=animal`);
   },
 
   /**
@@ -223,6 +262,25 @@ export const feedbackAPI = {
   },
 };
 
+/**
+ * API de Estatísticas (contadores mantidos pelo back-end)
+ */
+export const statsAPI = {
+  /**
+   * Totais do catálogo por status/espécie/porte/cidade e funil de adoções por dia
+   */
+  getStats: async (days: number = 30) => {
+    return fetchAPI<any>(`/stats?days=${days}`);
+  },
+
+  /**
+   * As mesmas estatísticas, só dos animais da ONG logada
+   */
+  getMyStats: async (days: number = 30) => {
+    return fetchAPI<any>(`/stats/mine?days=${days}`);
+  },
+};
+
 /**
  * Health check
  */
@@ -232,6 +290,56 @@ export const healthAPI = {
   },
 };
 
+/**
+ * API de Imagens
+ */
+export const imageAPI = {
+  /**
+   * Envia uma foto (multipart, campo `file`) e retorna a URL curta `/images/<hash>`
+   */
+  upload: async (file: File) => {
+    const body = new FormData();
+    body.append('file', file);
+    const headers: Record<string, string> = {};
+    if (authToken) headers['Authorization'] = `Bearer ${authToken}`;
+    const response = await fetch(`${API_BASE_URL}/images`, { method: 'POST', headers, body });
+    const data = await response.json().catch(() => ({}));
+    if (!response.ok) {
+      throw new Error(data.message || `Erro HTTP ${response.status}: ${response.statusText}`);
+    }
+    return data as ApiResponse<{ url: string; variants: Record<string, string> }>;
+  },
+};
+
+/**
+ * Eventos em tempo real (Server-Sent Events; requer o back-end no modo ASGI)
+ */
+export const eventsAPI = {
+  /**
+   * Abre o stream de eventos do catálogo e, se logado, da ONG/adotante.
+   * O navegador reconecta sozinho e retoma pelo último id recebido.
+   */
+  subscribe: (handlers: {
+    animals?: (data: { op: string; ids: number[] | null; count: number }) => void;
+    adoption?: (data: { op: string; id: number; animal_id: number; status: string }) => void;
+    reset?: () => void;
+  }) => {
+    const params = new URLSearchParams();
+    if (authToken) params.set('token', authToken);
+    const source = new EventSource(`${API_BASE_URL}/events?${params.toString()}`);
+    if (handlers.animals) {
+      const onAnimals = handlers.animals;
+      source.addEventListener('animals', (e) => onAnimals(JSON.parse((e as MessageEvent).data)));
+    }
+    if (handlers.adoption) {
+      const onAdoption = handlers.adoption;
+      source.addEventListener('adoption', (e) => onAdoption(JSON.parse((e as MessageEvent).data)));
+    }
+    if (handlers.reset) source.addEventListener('reset', handlers.reset);
+    return source;
+  },
+};
+
 /**
  * API de Autenticação
  */
@@ -260,6 +368,9 @@ export default {
   adoptionAPI,
   contactAPI,
   feedbackAPI,
+  statsAPI,
   healthAPI,
+  imageAPI,
+  eventsAPI,
   authAPI,
 };
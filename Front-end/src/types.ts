@@ -18,12 +18,23 @@ export interface Animal {
   size: "Pequeno" | "Médio" | "Grande";
   temperament: string;
   city: string;
+  latitude?: number | null;
+  longitude?: number | null;
+  distance_km?: number;
   status: "Disponível" | "Adotado";
   image: string;
   description: string;
   history: string;
 }
 
+export interface AnimalFilters {
+  q?: string;
+  species?: string;
+  size?: string;
+  status?: string;
+  city?: string;
+}
+
 export interface Adoption {
   id: number;
   animal_id: number;